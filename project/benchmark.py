@@ -0,0 +1,308 @@
+# project/benchmark.py
+
+"""
+Benchmark harness for the 6j backends.
+
+Measures, with ``time.perf_counter_ns``:
+
+* per-call latency distributions of every ``closed_form_3nj`` mode, of
+  the symmetry cache and of the independent recursion reference
+  (``project.su2_3nj_reference``), over spins scaled from 1/2 to several hundred;
+* cold latency, i.e. the first call in a freshly spawned interpreter with
+  empty factorial tables and caches;
+* batch throughput of ``closed_form_3nj_batch`` (symbols per second);
+* peak Python heap use per call (``tracemalloc``).
+
+``run_suite`` returns a JSON-serialisable dict with the measurements and
+the environment they were taken in (commit, Python, NumPy, CPU), and
+``compare`` flags slowdowns against a stored baseline so regressions can be
+tracked across commits (see ``scripts/benchmark_suite.py``).
+"""
+
+import gc
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from multiprocessing import get_context
+
+import numpy as np
+
+DEFAULT_SIZES = (1, 2, 5, 10, 20, 50, 100, 200, 400, 800)
+BACKENDS = ("symbolic", "exact", "prime", "float", "mpmath", "table", "cached", "reference")
+
+# largest doubled spin of the table built for the "table" backend
+TABLE_MAX_TWO_J = 20
+
+
+def benchmark_tuple(two_j):
+    """
+    Doubled spins of a generic 6j of size ``two_j``: {j j k; j j k} with
+    k = j for integer j and j + 1/2 otherwise (about j/2 Racah terms).
+    """
+    k = two_j if two_j % 2 == 0 else two_j + 1
+    return (two_j, two_j, k, two_j, two_j, k)
+
+
+def _caller(backend, dps=15):
+    """A function of six spins evaluating one symbol with ``backend``."""
+    if backend == "cached":
+        from project.sixj_cache import SixJCache
+        cache = SixJCache(mode="float")
+        return cache
+    if backend == "reference":
+        from project.su2_3nj_reference import _reference_family_doubled, reference_3nj
+
+        def call(*spins):
+            # time the whole family recursion, not the family cache
+            _reference_family_doubled.cache_clear()
+            return reference_3nj(*spins, mode="exact")
+        return call
+    from project.su2_3nj_closed_form import closed_form_3nj
+
+    def call(*spins):
+        return closed_form_3nj(*spins, mode=backend, dps=dps)
+    return call
+
+
+def _spins(two_js):
+    """Spins as callers pass them: ints, and Fractions for half-integers."""
+    return tuple(t // 2 if t % 2 == 0 else Fraction(t, 2) for t in two_js)
+
+
+def summarize(samples_ns):
+    """Distribution summary of nanosecond timings, in nanoseconds."""
+    s = sorted(samples_ns)
+    n = len(s)
+
+    def pct(q):
+        return s[min(n - 1, int(q * n))]
+    return {
+        "n": n,
+        "min": s[0],
+        "median": statistics.median(s),
+        "mean": statistics.fmean(s),
+        "p90": pct(0.90),
+        "p99": pct(0.99),
+        "max": s[-1],
+        "stdev": statistics.pstdev(s) if n > 1 else 0.0,
+    }
+
+
+def time_calls(fn, args, repeat):
+    """Per-call wall times of ``fn(*args)`` in nanoseconds."""
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            fn(*args)
+            samples.append(time.perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def _repeat_for(backend, two_j, repeat):
+    """Fewer repetitions for the slow backends at large spins."""
+    if backend in ("symbolic", "exact", "prime", "mpmath", "reference") and two_j >= 200:
+        return max(3, repeat // 10)
+    return repeat
+
+
+def measure_warm(backend, two_j, repeat=100):
+    """Latency distribution of repeated calls after one warm-up call."""
+    fn = _caller(backend)
+    args = _spins(benchmark_tuple(two_j))
+    fn(*args)
+    return summarize(time_calls(fn, args, _repeat_for(backend, two_j, repeat)))
+
+
+def measure_cache_cold(two_j, repeat=100):
+    """Latency of the symmetry cache when every call misses."""
+    from project.sixj_cache import SixJCache
+    cache = SixJCache(mode="float")
+    args = _spins(benchmark_tuple(two_j))
+    samples = []
+    for _ in range(repeat):
+        cache.cache_clear()
+        samples += time_calls(cache, args, 1)
+    return summarize(samples)
+
+
+def _cold_call(backend, two_j, table_path):
+    """Runs in a fresh interpreter: time the first call of a backend."""
+    if table_path:
+        from project.sixj_table import TABLE_ENV
+        os.environ[TABLE_ENV] = table_path
+    fn = _caller(backend)
+    args = _spins(benchmark_tuple(two_j))
+    start = time.perf_counter_ns()
+    fn(*args)
+    return time.perf_counter_ns() - start
+
+
+def measure_cold(backend, two_j, repeat=3, table_path=None):
+    """First-call latency in freshly spawned interpreters (imports excluded)."""
+    samples = []
+    context = get_context("spawn")
+    for _ in range(repeat):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            samples.append(pool.submit(_cold_call, backend, two_j, table_path).result())
+    return summarize(samples)
+
+
+def measure_memory(backend, two_j):
+    """Peak traced Python heap (bytes) during one warm call."""
+    fn = _caller(backend)
+    args = _spins(benchmark_tuple(two_j))
+    fn(*args)
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def measure_batch(max_two_j, repeat=5):
+    """Throughput of the batch evaluator over all admissible tuples."""
+    from project.su2_3nj_batch import closed_form_3nj_batch
+    from project.sweep import admissible_6j
+    two = np.array(list(admissible_6j(max_two_j)), dtype=np.int64)
+    closed_form_3nj_batch(two[:100])
+    samples = time_calls(closed_form_3nj_batch, (two,), repeat)
+    tracemalloc.start()
+    try:
+        closed_form_3nj_batch(two)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    summary = summarize(samples)
+    return {
+        "max_two_j": max_two_j,
+        "symbols": len(two),
+        "time_ns": summary,
+        "symbols_per_s": len(two) / (summary["median"] * 1e-9),
+        "peak_bytes": peak,
+    }
+
+
+def environment():
+    """Where the measurements were taken."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(sizes=DEFAULT_SIZES, backends=BACKENDS, repeat=100, cold_repeat=3,
+              cold_sizes=None, batch_sizes=(10, 20), log=None):
+    """
+    Run the benchmarks and return the results as a JSON-serialisable dict.
+
+    ``cold_sizes`` (default: smallest, middle and largest of ``sizes``)
+    limits the spawned-interpreter measurements, which are slow.  ``log``
+    is called with a progress line per measurement.
+    """
+    log = log or (lambda line: None)
+    if cold_sizes is None:
+        cold_sizes = sorted({sizes[0], sizes[len(sizes) // 2], sizes[-1]})
+    results = {"environment": environment(), "latency": [], "batch": []}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        table_path = None
+        if "table" in backends:
+            from project import sixj_table
+            table_path = os.path.join(tmp, "sixj.bin")
+            sixj_table.build_table(table_path, TABLE_MAX_TWO_J)
+            saved = os.environ.get(sixj_table.TABLE_ENV)
+            os.environ[sixj_table.TABLE_ENV] = table_path
+            sixj_table._default_table = None
+        try:
+            for backend in backends:
+                for two_j in sizes:
+                    if backend == "table" and two_j > TABLE_MAX_TWO_J:
+                        continue
+                    record = {
+                        "backend": backend,
+                        "two_j": two_j,
+                        "spins": list(benchmark_tuple(two_j)),
+                        "warm_ns": measure_warm(backend, two_j, repeat),
+                        "peak_bytes": measure_memory(backend, two_j),
+                    }
+                    if backend == "cached":
+                        record["cold_ns"] = measure_cache_cold(two_j, repeat)
+                    elif two_j in cold_sizes:
+                        record["cold_ns"] = measure_cold(backend, two_j, cold_repeat, table_path)
+                    results["latency"].append(record)
+                    log(f"{backend:>8} 2j={two_j:<4} median "
+                        f"{record['warm_ns']['median'] / 1e3:10.1f} us")
+        finally:
+            if table_path:
+                # the temporary table goes away with this directory
+                sixj_table._default_table = None
+                if saved is None:
+                    del os.environ[sixj_table.TABLE_ENV]
+                else:
+                    os.environ[sixj_table.TABLE_ENV] = saved
+
+    for max_two_j in batch_sizes:
+        record = measure_batch(max_two_j)
+        results["batch"].append(record)
+        log(f"   batch 2j<={max_two_j:<3} {record['symbols_per_s']:12.0f} symbols/s")
+    return results
+
+
+def flatten(results):
+    """One row per latency measurement, for CSV output."""
+    rows = []
+    for r in results["latency"]:
+        row = {"backend": r["backend"], "two_j": r["two_j"], "peak_bytes": r["peak_bytes"]}
+        for kind in ("warm_ns", "cold_ns"):
+            for stat in ("median", "p90", "p99"):
+                row[f"{kind[:-3]}_{stat}_ns"] = r[kind][stat] if kind in r else ""
+        rows.append(row)
+    for b in results["batch"]:
+        rows.append({
+            "backend": "batch", "two_j": b["max_two_j"], "peak_bytes": b["peak_bytes"],
+            "warm_median_ns": b["time_ns"]["median"] / b["symbols"],
+        })
+    return rows
+
+
+def compare(current, baseline, threshold=1.25):
+    """
+    Measurements whose median warm latency grew by more than ``threshold``
+    times relative to ``baseline``, as ``(backend, two_j, ratio)`` tuples.
+    """
+    before = {(r["backend"], r["two_j"]): r["warm_ns"]["median"] for r in baseline["latency"]}
+    regressions = []
+    for r in current["latency"]:
+        old = before.get((r["backend"], r["two_j"]))
+        if old:
+            ratio = r["warm_ns"]["median"] / old
+            if ratio > threshold:
+                regressions.append((r["backend"], r["two_j"], ratio))
+    return regressions
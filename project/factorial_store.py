@@ -0,0 +1,181 @@
+# project/factorial_store.py
+
+"""
+Shared, lazily grown factorial tables for all 6j backends.
+
+One module-level ``store`` keeps three tables, each extended on demand to
+the largest argument seen so far and never recomputed:
+
+* exact factorials n! as Python ints (exact integer engine),
+* log-factorials log(n!) as floats (float and batch paths),
+* prime-exponent vectors of n! (prime-factorization backend).
+
+Growth happens under a lock and only appends, so concurrent readers can
+index any entry below the size they have ensured.  The float and prime
+tables grow geometrically; the exact table grows by at most
+``EXACT_SLACK`` entries past the requested argument, as the memory of its
+big integers is quadratic in n.  ``prewarm(max_two_j)`` fills the tables
+for a spin range up front, e.g. at worker start-up.
+"""
+
+import math
+import threading
+from itertools import zip_longest
+
+# most exact factorials computed beyond the one asked for
+EXACT_SLACK = 256
+
+
+def max_factorial_argument(max_two_j):
+    """Largest n for which n! appears in a 6j with doubled spins <= max_two_j."""
+    return 2 * max_two_j + 1
+
+
+class PrimeFactorialTable:
+    """
+    Prime-exponent vectors of n! for 0 <= n <= n_max.
+
+    Sized for 6j symbols with doubled spins up to ``max_two_j``; the largest
+    factorial in their Racah sum is (2 * max_two_j + 1)!.  ``extend`` appends
+    rows for a larger range without touching existing ones.
+    """
+
+    def __init__(self, max_two_j):
+        if max_two_j < 0:
+            raise ValueError("max_two_j must be non-negative")
+        self.max_two_j = -1
+        self.n_max = 1
+        self.primes = []
+        self._index = {}
+        # row n only spans the primes <= n, all later exponents being zero
+        self.exponents = [(), ()]
+        self.extend(max_two_j)
+
+    def extend(self, max_two_j):
+        """Grow the table to cover doubled spins up to ``max_two_j``."""
+        if max_two_j <= self.max_two_j:
+            return
+        n_max = max_factorial_argument(max_two_j)
+        primes = self.primes
+        current = list(self.exponents[-1])
+        for n in range(self.n_max + 1, n_max + 1):
+            # factorize n by trial division over the primes found so far
+            m = n
+            for i, p in enumerate(primes):
+                if p * p > m:
+                    break
+                while m % p == 0:
+                    current[i] += 1
+                    m //= p
+            if m > 1:
+                if m == n:
+                    self._index[n] = len(primes)
+                    primes.append(n)
+                    current.append(0)
+                current[self._index[m]] += 1
+            self.exponents.append(tuple(current))
+        self.n_max = n_max
+        self.max_two_j = max_two_j
+
+    def covers(self, two_js):
+        """True if every doubled spin is within the table's range."""
+        return max(two_js) <= self.max_two_j
+
+    def combine(self, plus, minus, width=None):
+        """
+        Exponent vector of prod(n! for n in plus) / prod(n! for n in minus),
+        zero-padded to ``width`` primes (default: all primes in the table).
+        """
+        rows = self.exponents
+        up = map(sum, zip_longest(*(rows[n] for n in plus), fillvalue=0))
+        down = map(sum, zip_longest(*(rows[n] for n in minus), fillvalue=0))
+        vec = [a - b for a, b in zip_longest(up, down, fillvalue=0)]
+        if width is None:
+            width = len(self.primes)
+        vec.extend([0] * (width - len(vec)))
+        return vec
+
+    def to_int(self, vec):
+        """Materialize a non-negative exponent vector as an integer."""
+        return math.prod(p ** e for p, e in zip(self.primes, vec) if e)
+
+
+class FactorialStore:
+    """Thread-safe, append-only factorial tables grown on demand."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factorials = [1]
+        self._log_factorials = [0.0]
+        self._primes = PrimeFactorialTable(0)
+
+    def _grow(self, table, n, slack=None):
+        """
+        Target size when ``table`` has to cover index ``n``: doubled, but at
+        most ``slack`` entries beyond n.
+        """
+        size = max(n + 1, 2 * len(table))
+        return size if slack is None else min(size, n + 1 + slack)
+
+    def factorial(self, n):
+        """n! as a Python int."""
+        table = self._factorials
+        if n >= len(table):
+            with self._lock:
+                # another thread may have grown it while we waited
+                if n >= len(table):
+                    value = table[-1]
+                    for i in range(len(table), self._grow(table, n, EXACT_SLACK)):
+                        value *= i
+                        table.append(value)
+        return table[n]
+
+    def log_factorial(self, n):
+        """log(n!) as a float."""
+        table = self._log_factorials
+        if n >= len(table):
+            with self._lock:
+                if n >= len(table):
+                    for i in range(len(table), self._grow(table, n)):
+                        table.append(math.lgamma(i + 1))
+        return table[n]
+
+    def log_factorials(self, n):
+        """The log-factorial list, covering at least 0..n (do not mutate)."""
+        self.log_factorial(n)
+        return self._log_factorials
+
+    def prime_table(self, max_two_j):
+        """The shared ``PrimeFactorialTable``, covering at least ``max_two_j``."""
+        table = self._primes
+        if max_two_j > table.max_two_j:
+            with self._lock:
+                if max_two_j > table.max_two_j:
+                    table.extend(max(max_two_j, 2 * table.max_two_j))
+        return table
+
+    def prewarm(self, max_two_j, exact=True, log=True, prime=True):
+        """Fill the selected tables for all 6j with doubled spins <= max_two_j."""
+        n = max_factorial_argument(max_two_j)
+        if exact:
+            self.factorial(n)
+        if log:
+            self.log_factorial(n)
+        if prime:
+            self.prime_table(max_two_j)
+
+    def sizes(self):
+        """Current table sizes, as a dict (for diagnostics)."""
+        return {
+            "factorial": len(self._factorials),
+            "log_factorial": len(self._log_factorials),
+            "prime_max_two_j": self._primes.max_two_j,
+        }
+
+
+store = FactorialStore()
+
+
+def prewarm(max_two_j, exact=True, log=True, prime=True):
+    """Pre-fill the shared store for doubled spins up to ``max_two_j``."""
+    store.prewarm(max_two_j, exact=exact, log=log, prime=prime)
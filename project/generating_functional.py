@@ -0,0 +1,340 @@
+# project/generating_functional.py
+
+"""
+Exact series expansion of generating functionals G = (1 - P)^(-s).
+
+P is a polynomial without constant term, stored sparsely as a dict
+``{exponent tuple: coefficient}``, and s a positive rational.  Two
+functionals are provided:
+
+* ``tetrahedral_6j()``: the Schwinger-Westbury generating function of the
+  tetrahedral spin network,
+
+      G = (1 + sum_v V_v + sum_q Q_q)^(-2),
+
+  with one variable per edge, V_v the product of the three edges at vertex
+  v and Q_q the product of the four edges of the 4-cycle q.  The
+  coefficient of y1^(2 j1) ... y6^(2 j6) is the Racah sum of
+  {j1 j2 j3; j4 j5 j6}, so the 6j symbol is that coefficient times the four
+  triangle coefficients (``sixj_from_coefficient``, ``sixj_values``).
+* ``graph_functional(edges)``: the paper's G = det(I - K)^(-1/2), with K the
+  antisymmetric matrix carrying one variable per edge of a graph.
+
+``components`` streams the expansion one total degree at a time from the
+recurrence obtained by applying the Euler operator to G,
+
+    n G_n = sum_{k=1}^{deg P} (n - k + s k) P_k G_{n-k},
+
+(P_k, G_n the homogeneous parts) and so holds only deg P + 1 components
+at once.  Optional per-variable ``bounds`` drop monomials that exceed them,
+which is exact because every monomial of P has non-negative exponents.
+``coefficient`` extracts a single coefficient without expanding anything
+else, as a sum over the ways of writing the exponent vector as a
+combination of the monomials of P:
+
+    [x^a] G = sum_{sum k_i m_i = a} (s)_n / prod k_i!  prod c_i^(k_i),
+    n = sum k_i.
+"""
+
+import math
+from collections import deque
+from fractions import Fraction
+
+from project.su2_3nj_closed_form import _ZERO
+from project.su2_3nj_reference import _primes_upto, _surd_from_square
+
+# variables y1..y6 of ``tetrahedral_6j`` belong to the edges j1..j6; the
+# vertices are the complements of the four triads, the 4-cycles the three
+# quadrilaterals of the Racah formula
+_TRIADS = ((0, 1, 2), (0, 4, 5), (3, 1, 5), (3, 4, 2))
+_QUADS = ((0, 1, 3, 4), (1, 2, 4, 5), (2, 0, 5, 3))
+
+
+def _monomial(nvars, variables):
+    exponents = [0] * nvars
+    for v in variables:
+        exponents[v] += 1
+    return tuple(exponents)
+
+
+def _degree(exponents):
+    return sum(exponents)
+
+
+def poly_mul(a, b, bounds=None):
+    """Product of two sparse polynomials, dropping monomials beyond ``bounds``."""
+    product = {}
+    for ea, ca in a.items():
+        for eb, cb in b.items():
+            e = tuple(x + y for x, y in zip(ea, eb))
+            if bounds is not None and any(x > m for x, m in zip(e, bounds)):
+                continue
+            c = product.get(e, 0) + ca * cb
+            if c:
+                product[e] = c
+            else:
+                product.pop(e, None)
+    return product
+
+
+class GeneratingFunctional:
+    """
+    The series of ``(1 - P)^(-s)`` for a sparse polynomial ``P`` (a dict
+    ``{exponent tuple: coefficient}`` without constant term).
+    """
+
+    def __init__(self, polynomial, s, names=None):
+        polynomial = {tuple(e): c for e, c in polynomial.items() if c}
+        if not polynomial:
+            raise ValueError("P must have at least one monomial")
+        self.nvars = len(next(iter(polynomial)))
+        if any(len(e) != self.nvars or min(e) < 0 or _degree(e) == 0 for e in polynomial):
+            raise ValueError("P needs non-negative exponents and no constant term")
+        self.polynomial = polynomial
+        self.s = Fraction(s)
+        if self.s <= 0:
+            raise ValueError("s must be positive")
+        self.names = tuple(names) if names else tuple(f"x{i + 1}" for i in range(self.nvars))
+        self.parts = {}
+        for e, c in polynomial.items():
+            self.parts.setdefault(_degree(e), {})[e] = c
+        self.degree = max(self.parts)
+        # integer s and coefficients give integer coefficients throughout
+        self.integral = self.s.denominator == 1 and all(
+            isinstance(c, int) for c in polynomial.values()
+        )
+        self._s = int(self.s) if self.integral else self.s
+
+    def components(self, max_degree, bounds=None):
+        """
+        Yield ``(n, G_n)`` for n = 0..max_degree, G_n being the homogeneous
+        part of total degree n as a sparse dict.
+        """
+        window = deque(maxlen=self.degree)
+        current = {(0,) * self.nvars: 1}
+        yield 0, current
+        window.appendleft(current)   # window[k-1] = G_{n-k}
+        for n in range(1, max_degree + 1):
+            total = {}
+            for k in range(1, min(self.degree, n) + 1):
+                part = self.parts.get(k)
+                if not part:
+                    continue
+                weight = (n - k) + self._s * k
+                for e, c in poly_mul(part, window[k - 1], bounds).items():
+                    total[e] = total.get(e, 0) + weight * c
+            current = {}
+            for e, c in total.items():
+                if c:
+                    if self.integral:
+                        c, left = divmod(c, n)
+                        assert not left
+                    else:
+                        c = Fraction(c) / n
+                    current[e] = c
+            yield n, current
+            window.appendleft(current)
+
+    def coefficients(self, max_degree, bounds=None):
+        """Yield ``(exponents, coefficient)`` pairs, degree by degree."""
+        for _, part in self.components(max_degree, bounds):
+            yield from sorted(part.items())
+
+    def coefficient(self, exponents):
+        """The coefficient of ``x^exponents``, without expanding the series."""
+        exponents = tuple(exponents)
+        if len(exponents) != self.nvars or min(exponents) < 0:
+            raise ValueError(f"expected {self.nvars} non-negative exponents")
+        monomials = list(self.polynomial.items())
+        total = Fraction(0)
+        for counts in _decompositions(exponents, [m for m, _ in monomials]):
+            n = sum(counts)
+            term = Fraction(1)
+            for i in range(n):
+                term *= self.s + i
+            for k, (_, c) in zip(counts, monomials):
+                term *= Fraction(c) ** k / math.factorial(k)
+            total += term
+        return int(total) if self.integral else total
+
+
+def _solve(remainder, monomials, free):
+    """
+    The counts of the ``free`` monomials summing exactly to ``remainder``,
+    if those monomials are linearly independent: a tuple (or None when the
+    solution is not a non-negative integer vector).  Returns False when
+    they are dependent.
+    """
+    rows = [[Fraction(monomials[i][v]) for i in free] + [Fraction(r)]
+            for v, r in enumerate(remainder)]
+    width = len(free)
+    pivot_row = 0
+    for col in range(width):
+        pivot = next((r for r in range(pivot_row, len(rows)) if rows[r][col]), None)
+        if pivot is None:
+            return False
+        rows[pivot_row], rows[pivot] = rows[pivot], rows[pivot_row]
+        lead = rows[pivot_row][col]
+        rows[pivot_row] = [x / lead for x in rows[pivot_row]]
+        for r in range(len(rows)):
+            if r != pivot_row and rows[r][col]:
+                factor = rows[r][col]
+                rows[r] = [x - factor * y for x, y in zip(rows[r], rows[pivot_row])]
+        pivot_row += 1
+    if any(row[-1] for row in rows[width:]):
+        return None
+    solution = [rows[r][-1] for r in range(width)]
+    if any(x < 0 or x.denominator != 1 for x in solution):
+        return None
+    return tuple(int(x) for x in solution)
+
+
+def _decompositions(target, monomials):
+    """
+    Yield every tuple of counts k with sum k_i monomials[i] == target.
+
+    Branches on the count of one monomial covering the variable covered by
+    the fewest remaining monomials, until the remaining ones are linearly
+    independent and their counts follow by elimination (for
+    ``tetrahedral_6j`` after a single branch, one per Racah term).
+    """
+    counts = [0] * len(monomials)
+
+    def search(remainder, free):
+        if not any(remainder):
+            yield tuple(counts)
+            return
+        if not free:
+            return
+        solved = _solve(remainder, monomials, free)
+        if solved is None:
+            return
+        if solved is not False:
+            for i, k in zip(free, solved):
+                counts[i] = k
+            yield tuple(counts)
+            for i in free:
+                counts[i] = 0
+            return
+        covering = None
+        for v, r in enumerate(remainder):
+            if r:
+                cover = [i for i in free if monomials[i][v]]
+                if covering is None or len(cover) < len(covering):
+                    covering = cover
+        if not covering:
+            return
+        i = covering[0]
+        rest = [j for j in free if j != i]
+        m = monomials[i]
+        most = min(remainder[v] // m[v] for v in range(len(m)) if m[v])
+        for k in range(most + 1):
+            counts[i] = k
+            yield from search([r - k * x for r, x in zip(remainder, m)], rest)
+        counts[i] = 0
+
+    yield from search(list(target), list(range(len(monomials))))
+
+
+def tetrahedral_6j():
+    """
+    Generating function of the Racah sums of 6j symbols: the coefficient of
+    y1^(2 j1) ... y6^(2 j6) is {j1 j2 j3; j4 j5 j6} divided by its four
+    triangle coefficients.
+    """
+    polynomial = {}
+    for triad in _TRIADS:
+        vertex = [v for v in range(6) if v not in triad]
+        polynomial[_monomial(6, vertex)] = -1
+    for quad in _QUADS:
+        polynomial[_monomial(6, quad)] = -1
+    return GeneratingFunctional(polynomial, 2, names=[f"y{i}" for i in range(1, 7)])
+
+
+def _determinant(matrix):
+    """Determinant of a square matrix of sparse polynomials (Laplace, memoized)."""
+    size = len(matrix)
+    nvars = len(next(e for row in matrix for entry in row for e in entry))
+    memo = {}
+
+    def minor(row, columns):
+        if row == size:
+            return {(0,) * nvars: 1}
+        key = (row, columns)
+        if key not in memo:
+            result = {}
+            for position, col in enumerate(columns):
+                entry = matrix[row][col]
+                if not entry:
+                    continue
+                rest = columns[:position] + columns[position + 1:]
+                sign = -1 if position % 2 else 1
+                for e, c in poly_mul(entry, minor(row + 1, rest)).items():
+                    value = result.get(e, 0) + sign * c
+                    if value:
+                        result[e] = value
+                    else:
+                        result.pop(e, None)
+            memo[key] = result
+        return memo[key]
+
+    return minor(0, tuple(range(size)))
+
+
+def graph_functional(edges, nvertices=None):
+    """
+    The functional det(I - K)^(-1/2) of a graph given by ``edges`` (pairs
+    of vertex indices), K being antisymmetric with K[i][j] = x_e for the
+    edge e = (i, j), i < j.  Variable x_e belongs to ``edges[e]``.
+    """
+    edges = [tuple(e) for e in edges]
+    nvertices = nvertices or max(max(e) for e in edges) + 1
+    nvars = len(edges)
+    unit = {(0,) * nvars: 1}
+    matrix = [[{} for _ in range(nvertices)] for _ in range(nvertices)]
+    for i in range(nvertices):
+        matrix[i][i] = dict(unit)
+    for index, (i, j) in enumerate(edges):
+        if i == j:
+            raise ValueError(f"edge {index} is a loop")
+        i, j = min(i, j), max(i, j)
+        x = _monomial(nvars, [index])
+        matrix[i][j] = {x: -1}     # (I - K)[i][j] = -x_e
+        matrix[j][i] = {x: 1}
+    det = _determinant(matrix)
+    polynomial = {e: -c for e, c in det.items() if _degree(e) > 0}
+    return GeneratingFunctional(
+        polynomial, Fraction(1, 2), names=[f"x{i}{j}" for i, j in edges]
+    )
+
+
+def _triangle_square(a, b, c):
+    """Squared triangle coefficient of doubled spins, as a Fraction."""
+    return Fraction(
+        math.factorial((a + b - c) // 2) * math.factorial((a - b + c) // 2)
+        * math.factorial((-a + b + c) // 2),
+        math.factorial((a + b + c) // 2 + 1),
+    )
+
+
+def sixj_from_coefficient(two_js, coefficient):
+    """The 6j symbol (a ``Surd``) of doubled spins from its Racah sum."""
+    if coefficient == 0:
+        return _ZERO
+    square = Fraction(coefficient) ** 2
+    for triad in _TRIADS:
+        square *= _triangle_square(*(two_js[v] for v in triad))
+    primes = _primes_upto(max(sum(two_js[v] for v in t) for t in _TRIADS) // 2 + 1)
+    return _surd_from_square(1 if coefficient > 0 else -1, square, primes)
+
+
+def sixj_values(max_two_j):
+    """
+    Yield ``(two_js, Surd)`` for every nonzero 6j symbol with all
+    2j <= ``max_two_j``, read off the expansion of ``tetrahedral_6j``
+    degree by degree.
+    """
+    functional = tetrahedral_6j()
+    for two_js, coefficient in functional.coefficients(6 * max_two_j, bounds=(max_two_j,) * 6):
+        if coefficient:
+            yield two_js, sixj_from_coefficient(two_js, coefficient)
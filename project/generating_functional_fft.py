@@ -0,0 +1,396 @@
+# project/generating_functional_fft.py
+
+"""
+Numerical coefficient extraction from generating functionals by FFT.
+
+Sampling G = (1 - P)^(-s) (a ``GeneratingFunctional``) on the torus
+x_i = r exp(2 pi i k_i / N_i), k_i = 0..N_i-1, and taking one ``fftn``
+recovers a whole block of Taylor coefficients at once (Cauchy's integral
+formula, discretized by the trapezoidal rule):
+
+    fftn(G)[a] / prod N_i = sum_{b = a mod N} c_b r^|b|.
+
+Dividing by r^|a| leaves c_a with two errors:
+
+* aliasing from the b != a of the sum.  Only b in the lattice spanned by
+  the exponents of P have nonzero coefficients, so for nonzero c_a the
+  nearest aliased b is a plus the shortest shift sum m_i N_i e_i in that
+  lattice (for ``tetrahedral_6j``, whose coefficients need even triads,
+  2 N_i e_i when N_i is odd); the vanishing c_a off the lattice pick up
+  aliasing from as near as min N_i;
+* round-off, of the same size in every bin of the FFT before the division
+  by r^|a|.
+
+A priori, the majorant g(t) = (1 - |P|(t, ..., t))^(-s) (|P| has the
+absolute values of the coefficients of P), whose coefficients grow like
+rho^-n with rho its radius of convergence, bounds the aliasing shifted by L
+in total degree by (r/rho)^L / (1 - r/rho) rho^-|a| and the round-off by
+eps (log2 prod N_i + number of monomials) g(r) / r^|a|.  These bounds pick
+the grid: the smallest ``padding`` (points per variable beyond the block,
+within ``max_points``) where aliasing falls below round-off at the best
+radius for the block's highest degree.  They ignore the cancellations in G
+and overestimate the actual errors by orders of magnitude.
+
+The returned errors are a-posteriori instead.  The block is extracted at
+r, 2^(1/L) r and 4^(1/L) r (c0, c1, c2): the nearest aliasing doubles from
+one radius to the next, so |c1 - c0| estimates it at r, while
+c2 - 3 c1 + 2 c0 cancels it and leaves round-off, whose spread over the
+lattice (scaled back by r^|a|) gives a bound for every coefficient.
+``choose_grid`` then steps the radius from the a-priori choice to minimize
+these estimates for the highest degree, or a weighted maximum of them.
+
+``sixj_block`` applies this to ``tetrahedral_6j``: its coefficients are the
+Racah sums, and multiplied by the triangle coefficients they give every 6j
+symbol with 2j <= ``max_two_j`` from a single FFT.
+"""
+
+import itertools
+import math
+import sys
+from typing import NamedTuple
+
+import numpy as np
+
+from project.generating_functional import tetrahedral_6j
+from project.su2_3nj_batch import _log_factorial_table, _triangle_mask
+
+_EPS = sys.float_info.epsilon
+MAX_POINTS = 1 << 22
+
+# a-posteriori estimates: safety factor on the observed differences, bound on
+# the round-off in standard deviations, and the radius search's step and
+# largest number of steps from the a-priori choice
+_SAFETY = 2
+_NOISE_SIGMAS = 5
+_HALF_NORMAL_MEDIAN = 0.6745
+_RADIUS_STEP = 1.2
+_MAX_STEPS = 8
+
+
+class FFTBlock(NamedTuple):
+    """
+    Coefficients c_a for 0 <= a_i <= max_exponents[i] as a dense float
+    array, an error estimate per coefficient, and the radius and grid
+    shape they were sampled with.
+    """
+    coefficients: np.ndarray
+    errors: np.ndarray
+    radius: float
+    shape: tuple
+
+
+def _majorant(functional, t):
+    """g(t) = (1 - |P|(t, ..., t))^(-s), infinite where |P| >= 1."""
+    t = np.asarray(t, dtype=float)
+    p = sum(abs(float(c)) * t ** sum(e) for e, c in functional.polynomial.items())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(p < 1, (1 - p) ** -float(functional.s), np.inf)
+
+
+def _convergence_radius(functional):
+    """The t > 0 with |P|(t, ..., t) = 1."""
+    lo, hi = 0.0, 1.0
+    while np.isfinite(_majorant(functional, hi)):
+        hi *= 2
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        lo, hi = (mid, hi) if np.isfinite(_majorant(functional, mid)) else (lo, mid)
+    return lo
+
+
+def _echelon(rows, n):
+    """Integer row echelon basis (positive pivots) of the lattice spanned by ``rows``."""
+    rows = [list(r) for r in rows if any(r)]
+    basis = []
+    for col in range(n):
+        active = [r for r in rows if r[col]]
+        rows = [r for r in rows if not r[col]]
+        while len(active) > 1:
+            active.sort(key=lambda r: abs(r[col]))
+            pivot = active[0]
+            reduced = [pivot]
+            for r in active[1:]:
+                q = r[col] // pivot[col]
+                r = [x - q * y for x, y in zip(r, pivot)]
+                if r[col]:
+                    reduced.append(r)
+                elif any(r):
+                    rows.append(r)
+            active = reduced
+        if active:
+            pivot = active[0]
+            basis.append([-x for x in pivot] if pivot[col] < 0 else pivot)
+    return basis
+
+
+def _in_lattice(vector, basis):
+    vector = list(vector)
+    for row in basis:
+        col = next(c for c, x in enumerate(row) if x)
+        q, left = divmod(vector[col], row[col])
+        if left:
+            return False
+        vector = [x - q * y for x, y in zip(vector, row)]
+    return not any(vector)
+
+
+def _axis_periods(basis, n):
+    """
+    For each variable the smallest k > 0 with k e_i in the lattice of
+    ``basis``, or None.  Every coefficient off the lattice spanned by the
+    exponents of P vanishes, so the shift N_i e_i only aliases when k_i
+    divides N_i.
+    """
+    pivots = {}
+    for row in basis:
+        col = next(c for c, x in enumerate(row) if x)
+        pivots[col] = row[col]
+    index = math.prod(pivots.values())
+    periods = []
+    for i in range(n):
+        multiples = ([k if c == i else 0 for c in range(n)] for k in range(1, index + 1))
+        periods.append(next(
+            (v[i] for v in multiples if _in_lattice(v, basis)), None,
+        ) if i in pivots else None)
+    return periods
+
+
+def _lattice_mask(basis, shape):
+    """Boolean array over ``np.indices(shape)``: exponents in the lattice of ``basis``."""
+    vector = list(np.indices(shape))
+    for row in basis:
+        col = next(c for c, x in enumerate(row) if x)
+        q = vector[col] // row[col]
+        vector = [x - q * y for x, y in zip(vector, row)]
+    return ~np.any(vector, axis=0)
+
+
+def _rounding(functional, radii, shape):
+    """Round-off in units of r^|a| for a grid of ``shape`` points."""
+    return _EPS * (math.log2(math.prod(shape)) + len(functional.polynomial)) \
+        * _majorant(functional, radii)
+
+
+def _transform(functional, radius, shape):
+    """c_b r^|b| (plus aliasing) for 0 <= b_i < N_i: the scaled FFT of the samples."""
+    axes = []
+    for d, n in enumerate(shape):
+        view = [1] * len(shape)
+        view[d] = n
+        axes.append((radius * np.exp(2j * np.pi * np.arange(n) / n)).reshape(view))
+    p = np.zeros(shape, dtype=complex)
+    for exponents, c in functional.polynomial.items():
+        term = complex(c)
+        for axis, k in zip(axes, exponents):
+            if k:
+                term = term * axis ** k
+        p += term
+    return np.fft.fftn((1 - p) ** -float(functional.s)) / math.prod(shape)
+
+
+def _shortest_shift(shape, basis):
+    """
+    The smallest total degree of a nonzero shift sum_i m_i N_i e_i, m_i >= 0,
+    in the lattice of ``basis``: the aliasing nearest to a nonzero
+    coefficient.  Each m_i is at most k_i (2 where there is no period), and
+    at most three variables are shifted together.
+    """
+    n = len(shape)
+    bounds = [k or 2 for k in _axis_periods(basis, n)]
+    best = math.inf
+    for size in range(1, min(n, 3) + 1):
+        for axes in itertools.combinations(range(n), size):
+            for values in itertools.product(*(range(1, bounds[i] + 1) for i in axes)):
+                shift = [0] * n
+                for i, m in zip(axes, values):
+                    shift[i] = m * shape[i]
+                if sum(shift) < best and _in_lattice(shift, basis):
+                    best = sum(shift)
+    return best
+
+
+def _error_estimates(functional, radii, shape, degrees, shift):
+    """
+    (aliasing, round-off) estimates of the coefficients of total degree
+    ``degrees`` (columns) for each of ``radii`` (rows) on a grid of ``shape``,
+    the nearest aliasing being ``shift`` degrees away.
+    """
+    radii = np.asarray(radii, dtype=float).reshape(-1, 1)
+    degrees = np.asarray(degrees, dtype=float).reshape(1, -1)
+    limit = _convergence_radius(functional)
+    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+        aliasing = (radii / limit) ** shift / (1 - radii / limit) * limit ** -degrees
+        rounding = _rounding(functional, radii, shape) * radii ** -degrees
+    return (np.nan_to_num(aliasing, nan=np.inf, posinf=np.inf),
+            np.nan_to_num(rounding, nan=np.inf, posinf=np.inf))
+
+
+def _a_priori_grid(functional, max_exponents, max_points):
+    """
+    ``(radius, padding)`` minimizing the a-priori estimate for the block's
+    highest degree, on the smallest grid where its aliasing falls below its
+    round-off.
+    """
+    radii = np.geomspace(1e-2, 0.99, 200) * _convergence_radius(functional)
+    basis = _echelon(functional.polynomial, functional.nvars)
+    degree = sum(max_exponents)
+    best = None
+    padding = 1
+    while math.prod(m + 1 + padding for m in max_exponents) <= max_points:
+        shape = tuple(m + 1 + padding for m in max_exponents)
+        aliasing, rounding = _error_estimates(
+            functional, radii, shape, [degree], _shortest_shift(shape, basis),
+        )
+        errors = (aliasing + rounding)[:, 0]
+        i = int(np.argmin(errors))
+        if best is None or errors[i] < best[2]:
+            best = (float(radii[i]), padding, float(errors[i]))
+        if aliasing[i, 0] <= rounding[i, 0]:
+            break
+        padding += 1
+    return best[:2]
+
+
+def _class_max(values, classes):
+    out = np.zeros(int(classes.max()) + 1)
+    np.maximum.at(out, classes.ravel(), values.ravel())
+    return out
+
+
+def _a_posteriori(functional, max_exponents, radius, shape, basis):
+    """
+    ``(coefficients, errors)`` of the block sampled at ``radius`` on
+    ``shape``, the errors from two more samplings at 2^(1/L) r and 4^(1/L) r
+    (see the module docstring).
+    """
+    shift = _shortest_shift(shape, basis)
+    block = tuple(slice(0, m + 1) for m in max_exponents)
+    degrees = sum(np.indices(tuple(m + 1 for m in max_exponents)))
+    ratio = 2 ** (1 / shift)
+    c0, c1, c2 = (
+        _transform(functional, radius * ratio ** k, shape)[block].real
+        * (radius * ratio ** k) ** -degrees.astype(float)
+        for k in range(3)
+    )
+    scale = radius ** -degrees.astype(float)
+    lattice = _lattice_mask(basis, degrees.shape)
+    # the nearest aliasing doubles from one radius to the next, and grows by
+    # ratio^min(N) for the vanishing coefficients off the lattice
+    growth = np.where(lattice, 1.0, ratio ** min(shape) - 1)
+    aliasing = np.maximum(np.abs(c1 - c0), np.abs(c2 - c1) / (growth + 1)) / growth
+    # c2 - 3 c1 + 2 c0 cancels that aliasing, leaving round-off, which has
+    # the same size in every bin before the division by r^|a|
+    noise = np.abs(c2 - 3 * c1 + 2 * c0)[lattice] / scale[lattice]
+    sigma = np.median(noise) / (_HALF_NORMAL_MEDIAN * math.sqrt(14)) if noise.size else 0.0
+    # and no coefficient is better than its own rounding
+    rounding = _EPS * math.log2(math.prod(shape)) * np.abs(c0)
+    return c0, _SAFETY * aliasing + _NOISE_SIGMAS * sigma * scale + rounding
+
+
+def _objective(errors, weights):
+    """
+    Largest weighted error, or without ``weights`` the largest error among
+    the block's highest-degree coefficients.
+    """
+    if weights is None:
+        degrees = sum(np.indices(errors.shape))
+        return float(errors[degrees == degrees.max()].max())
+    return float((errors * weights).max())
+
+
+def _search(functional, max_exponents, max_points, weights=None):
+    """``(radius, padding, error, coefficients, errors)`` of ``choose_grid``."""
+    max_exponents = tuple(max_exponents)
+    if math.prod(m + 2 for m in max_exponents) > max_points:
+        raise ValueError(f"a block of {max_exponents} needs more than {max_points} points")
+    radius, padding = _a_priori_grid(functional, max_exponents, max_points)
+    shape = tuple(m + 1 + padding for m in max_exponents)
+    basis = _echelon(functional.polynomial, functional.nvars)
+    # keep the last sampling radius inside the region of convergence
+    top = 0.99 * _convergence_radius(functional) * 4 ** (-1 / _shortest_shift(shape, basis))
+    tried = {}
+
+    def evaluate(k):
+        if k not in tried:
+            r = min(radius * _RADIUS_STEP ** k, top)
+            coefficients, errors = _a_posteriori(functional, max_exponents, r, shape, basis)
+            tried[k] = (_objective(errors, weights), r, coefficients, errors)
+        return tried[k][0]
+
+    k = 0
+    step = 1 if evaluate(1) < evaluate(0) else -1
+    while abs(k) < _MAX_STEPS and evaluate(k + step) < evaluate(k) \
+            and radius * _RADIUS_STEP ** k < top:
+        k += step
+    error, r, coefficients, errors = tried[k]
+    return r, padding, error, coefficients, errors
+
+
+def choose_grid(functional, max_exponents, max_points=MAX_POINTS, weights=None):
+    """
+    ``(radius, padding, error)`` for a block of coefficients with exponents
+    up to ``max_exponents`` (see the module docstring).  ``error`` is the
+    largest a-posteriori estimate among the highest-degree coefficients, or
+    of ``errors * weights`` when an array of ``weights`` is given.
+    """
+    return _search(functional, max_exponents, max_points, weights)[:3]
+
+
+def fft_coefficients(functional, max_exponents, radius=None, padding=None,
+                     max_points=MAX_POINTS, weights=None):
+    """
+    Coefficients of ``functional`` for 0 <= a_i <= max_exponents[i] as an
+    ``FFTBlock``, with a-posteriori error estimates from two more FFTs at
+    larger radii.  ``radius`` and ``padding`` (extra grid points per
+    variable, at least 1) are chosen by ``choose_grid`` with ``weights``
+    unless given.
+    """
+    max_exponents = tuple(max_exponents)
+    if len(max_exponents) != functional.nvars or min(max_exponents) < 0:
+        raise ValueError(f"expected {functional.nvars} non-negative exponents")
+    if radius is None and padding is None:
+        radius, padding, _, coefficients, errors = _search(
+            functional, max_exponents, max_points, weights,
+        )
+        shape = tuple(m + 1 + padding for m in max_exponents)
+        return FFTBlock(coefficients, errors, radius, shape)
+    if radius is None or padding is None:
+        chosen_radius, chosen_padding = _a_priori_grid(functional, max_exponents, max_points)
+        radius = chosen_radius if radius is None else radius
+        padding = chosen_padding if padding is None else padding
+    if padding < 1:
+        raise ValueError("padding must be at least 1")
+    shape = tuple(m + 1 + padding for m in max_exponents)
+    if math.prod(shape) > max_points:
+        raise ValueError(f"grid {shape} exceeds {max_points} points")
+    basis = _echelon(functional.polynomial, functional.nvars)
+    coefficients, errors = _a_posteriori(functional, max_exponents, radius, shape, basis)
+    return FFTBlock(coefficients, errors, radius, shape)
+
+
+def sixj_block(max_two_j, **options):
+    """
+    All 6j symbols with 2j <= ``max_two_j`` from the FFT of
+    ``tetrahedral_6j``: ``(values, errors)`` arrays indexed by the six
+    doubled spins, zero (with zero error) for inadmissible tuples.
+    ``options`` are passed to ``fft_coefficients``; by default the radius
+    minimizes the largest error of the 6j symbols themselves.
+    """
+    shape = (max_two_j + 1,) * 6
+    t1, t2, t3, t4, t5, t6 = np.indices(shape)
+    triads = ((t1, t2, t3), (t1, t5, t6), (t4, t2, t6), (t4, t5, t3))
+    mask = np.ones(shape, dtype=bool)
+    for a, b, c in triads:
+        mask &= _triangle_mask(a, b, c)
+    lf = _log_factorial_table(3 * max_two_j // 2 + 1)
+    log_delta = np.zeros(shape)
+    for a, b, c in triads:
+        a, b, c = a[mask], b[mask], c[mask]
+        log_delta[mask] += 0.5 * (
+            lf[(a + b - c) // 2] + lf[(a - b + c) // 2] + lf[(-a + b + c) // 2]
+            - lf[(a + b + c) // 2 + 1]
+        )
+    delta = np.where(mask, np.exp(log_delta), 0.0)
+    options.setdefault("weights", delta)
+    block = fft_coefficients(tetrahedral_6j(), (max_two_j,) * 6, **options)
+    return block.coefficients * delta, block.errors * delta
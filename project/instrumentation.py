@@ -0,0 +1,319 @@
+# project/instrumentation.py
+
+"""
+Opt-in instrumentation of the 6j hot paths.
+
+``enable()`` imports every ``project`` module, then wraps the stage
+functions of every backend (listed in ``_HOOKS``) with timing wrappers,
+replacing each function wherever a ``project`` module refers to it;
+``disable()`` puts the originals back.  Importing first means no module can
+bind a wrapper by importing it while instrumentation is on and keep it
+after ``disable()``.  Nothing is wrapped while instrumentation is off, so
+it costs nothing then.
+
+For each stage the wrappers record the number of calls, total and maximum
+time (``perf_counter_ns``, inclusive of nested stages) and stage-specific
+counters:
+
+* ``triangle`` (``_racah_bounds``): inadmissible tuples;
+* ``factorials`` (radicand splitting) and ``racah_exact`` (the exact Racah
+  loop): Racah terms and the largest integer bit-length;
+* ``float``: results whose error estimate is not below their magnitude
+  (those that would need escalation to the exact engine);
+* ``mpmath``: series passes at increasing precision (``mpmath_series``
+  records the largest working precision) and escalations to the exact
+  engine;
+* ``family``: members computed and exact-engine sign fallbacks;
+* ``cache``: hits and misses; ``batch``: rows; ``sympy``: conversions.
+
+``counters()`` returns the aggregate as a JSON-serialisable dict, and
+``merge`` folds in counters from worker processes (``project.sweep`` does
+so automatically).  ``Profile`` collects cProfile statistics, also across
+processes, and writes them in the ``pstats`` format.
+"""
+
+import cProfile
+import importlib
+import json
+import pkgutil
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_lock = threading.Lock()
+_stats = {}
+_patched = []   # (owner, name, original) to restore
+
+
+def _add(stage, elapsed, **counts):
+    """Record one call of ``stage``; ``max_*`` counters keep their maximum."""
+    with _lock:
+        entry = _stats.setdefault(stage, {"calls": 0, "total_ns": 0, "max_ns": 0})
+        entry["calls"] += 1
+        entry["total_ns"] += elapsed
+        entry["max_ns"] = max(entry["max_ns"], elapsed)
+        for key, value in counts.items():
+            if key.startswith("max_"):
+                entry[key] = max(entry.get(key, 0), value)
+            else:
+                entry[key] = entry.get(key, 0) + value
+
+
+def _calls(stage):
+    entry = _stats.get(stage)
+    return entry["calls"] if entry else 0
+
+
+def _terms(alphas, betas):
+    return max(min(betas) - max(alphas) + 1, 0)
+
+
+def _timed(stage, observe=None, nested=()):
+    """
+    Wrapper factory: time calls, add ``observe(args, result)`` counts and,
+    for each ``(inner, key)`` in ``nested``, the number of calls of stage
+    ``inner`` made during the call.
+    """
+    def wrap(fn):
+        def wrapper(*args, **kwargs):
+            before = [_calls(inner) for inner, _ in nested]
+            start = time.perf_counter_ns()
+            result = fn(*args, **kwargs)
+            elapsed = time.perf_counter_ns() - start
+            counts = observe(args, result) if observe else {}
+            for (inner, key), calls in zip(nested, before):
+                counts[key] = _calls(inner) - calls
+            _add(stage, elapsed, **counts)
+            return result
+        wrapper.__wrapped__ = fn
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+    return wrap
+
+
+def _observe_bounds(args, result):
+    return {"inadmissible": int(result is None)}
+
+
+def _observe_radicand(args, result):
+    outside = result[0]
+    return {"max_bits": max(outside.numerator.bit_length(), outside.denominator.bit_length())}
+
+
+def _observe_racah_exact(args, result):
+    return {
+        "terms": _terms(*args[:2]),
+        "max_bits": max(result.numerator.bit_length(), result.denominator.bit_length()),
+    }
+
+
+def _observe_float(args, result):
+    value, error = result
+    return {"unreliable": int(not abs(value) > error)}
+
+
+def _observe_series(args, result):
+    from mpmath import mp
+    return {"max_dps": mp.dps, "terms": _terms(*args[1:3])}
+
+
+def _observe_family(args, result):
+    return {"members": len(result[0])}
+
+
+def _observe_batch(args, result):
+    values = result[0] if isinstance(result, tuple) else result
+    return {"rows": len(values)}
+
+
+def _cache_lookup(fn):
+    def wrapper(self, two_js):
+        hits, misses = self.hits, self.misses
+        start = time.perf_counter_ns()
+        result = fn(self, two_js)
+        elapsed = time.perf_counter_ns() - start
+        _add("cache", elapsed, hits=self.hits - hits, misses=self.misses - misses)
+        return result
+    wrapper.__wrapped__ = fn
+    return wrapper
+
+
+# (module, attribute, wrapper factory); "Class.method" patches the class
+_HOOKS = [
+    ("project.su2_3nj_closed_form", "_racah_bounds", _timed("triangle", _observe_bounds)),
+    ("project.su2_3nj_closed_form", "_split_radicand", _timed("factorials", _observe_radicand)),
+    ("project.su2_3nj_closed_form", "_racah_sum_exact",
+     _timed("racah_exact", _observe_racah_exact)),
+    ("project.su2_3nj_closed_form", "_sixj_exact_doubled", _timed("exact")),
+    ("project.su2_3nj_closed_form", "_sixj_float_doubled", _timed("float", _observe_float)),
+    ("project.su2_3nj_closed_form", "Surd.to_sympy", _timed("sympy")),
+    ("project.prime_factorial", "_sixj_prime_doubled", _timed("prime")),
+    ("project.su2_3nj_batch", "closed_form_3nj_batch", _timed("batch", _observe_batch)),
+    ("project.sixj_recursion", "_sixj_family_doubled",
+     _timed("family", _observe_family, nested=[("exact", "escalations")])),
+    ("project.sixj_table", "SixJTable.lookup_doubled", _timed("table")),
+    ("project.sixj_cache", "SixJCache.lookup_doubled", _cache_lookup),
+    ("project.su2_9j_closed_form", "_ninej_exact_doubled", _timed("ninej_exact")),
+    ("project.su2_9j_closed_form", "_ninej_float_doubled", _timed("ninej_float")),
+    ("project.su2_3nj_network", "_evaluate_network", _timed("network")),
+]
+
+# needs mpmath; hooked only where it is installed
+_MP_HOOKS = [
+    ("project.su2_3nj_mpmath", "_racah_mp", _timed("mpmath_series", _observe_series)),
+    ("project.su2_3nj_mpmath", "_sixj_mp_doubled",
+     _timed("mpmath", nested=[("mpmath_series", "passes"), ("exact", "escalations")])),
+]
+
+
+def is_enabled():
+    return bool(_patched)
+
+
+def _import_project():
+    """Import every ``project`` module whose dependencies are installed."""
+    package = importlib.import_module("project")
+    for info in pkgutil.iter_modules(package.__path__, "project."):
+        try:
+            importlib.import_module(info.name)
+        except ImportError:
+            pass
+
+
+def enable():
+    """Start recording (idempotent).  Imports every ``project`` module."""
+    if _patched:
+        return
+    _import_project()
+    hooks = list(_HOOKS)
+    if "project.su2_3nj_mpmath" in sys.modules:
+        hooks += _MP_HOOKS
+    for module_name, attribute, factory in hooks:
+        module = importlib.import_module(module_name)
+        if "." in attribute:
+            cls_name, name = attribute.split(".")
+            owner = getattr(module, cls_name)
+            original = owner.__dict__[name]
+            _patched.append((owner, name, original))
+            setattr(owner, name, factory(original))
+            continue
+        original = getattr(module, attribute)
+        wrapped = factory(original)
+        # rebind every module-level reference, including ``from ... import``s
+        for other in list(sys.modules.values()):
+            if getattr(other, "__name__", "").startswith("project") and \
+                    getattr(other, attribute, None) is original:
+                _patched.append((other, attribute, original))
+                setattr(other, attribute, wrapped)
+
+
+def disable():
+    """Stop recording and restore the original functions (counters are kept)."""
+    while _patched:
+        owner, name, original = _patched.pop()
+        setattr(owner, name, original)
+
+
+def reset():
+    """Clear all counters."""
+    with _lock:
+        _stats.clear()
+
+
+def counters():
+    """Snapshot of the counters: ``{stage: {"calls", "total_ns", "max_ns", ...}}``."""
+    with _lock:
+        return {stage: dict(entry) for stage, entry in sorted(_stats.items())}
+
+
+def merge(snapshot):
+    """Add counters from another process (as returned by ``counters()``)."""
+    with _lock:
+        for stage, counts in snapshot.items():
+            entry = _stats.setdefault(stage, {"calls": 0, "total_ns": 0, "max_ns": 0})
+            for key, value in counts.items():
+                if key.startswith("max_"):
+                    entry[key] = max(entry.get(key, 0), value)
+                else:
+                    entry[key] = entry.get(key, 0) + value
+
+
+@contextmanager
+def instrumented():
+    """Record within a ``with`` block, starting from cleared counters."""
+    was_enabled = is_enabled()
+    reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def dump_json(target, **extra):
+    """Write the counters (plus ``extra`` top-level fields) as JSON."""
+    document = dict(extra, stages=counters())
+    if hasattr(target, "write"):
+        json.dump(document, target, indent=1)
+        target.write("\n")
+    else:
+        with open(target, "w") as f:
+            json.dump(document, f, indent=1)
+
+
+class _RawStats:
+    """Adapter letting ``pstats.Stats`` load a marshalled stats dict."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class Profile:
+    """
+    cProfile statistics of this process and of any worker chunks added with
+    ``add``; ``dump`` writes a file readable by ``pstats``/snakeviz.
+    """
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+        self._workers = []
+
+    def __enter__(self):
+        self._profiler.enable()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.disable()
+
+    def add(self, raw_stats):
+        """Fold in the ``stats`` dict of a profile taken in another process."""
+        self._workers.append(raw_stats)
+
+    def stats(self):
+        stats = pstats.Stats(self._profiler)
+        for raw in self._workers:
+            stats.add(pstats.Stats(_RawStats(raw)))
+        return stats
+
+    def dump(self, path):
+        self.stats().dump_stats(path)
+
+    def report(self, stream=None, sort="cumulative", limit=25):
+        stats = self.stats()
+        stats.stream = stream or sys.stderr
+        stats.sort_stats(sort).print_stats(limit)
+
+
+def profile_call(fn, *args):
+    """Run ``fn(*args)`` under cProfile; returns ``(result, raw stats dict)``."""
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args)
+    profiler.create_stats()
+    return result, profiler.stats
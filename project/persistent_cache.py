@@ -0,0 +1,193 @@
+# project/persistent_cache.py
+
+"""
+Persistent on-disk cache of computed 6j values.
+
+Values are stored in an SQLite database keyed by backend (mode and, for
+mpmath, precision) and by the canonical doubled-spin representative of the
+symbol (see ``project.sixj_cache``), so every arrangement of a symbol is
+computed once and reused across processes and restarts.  The database runs
+in WAL mode: many worker processes can read while one writes, and inserts
+are ``INSERT OR IGNORE`` so concurrent writers computing the same symbol do
+not conflict.  New values are buffered and written in batches.
+"""
+
+import os
+import sqlite3
+import threading
+from fractions import Fraction
+
+from project.sixj_cache import canonical_6j
+from project.su2_3nj_closed_form import (
+    Surd,
+    _doubled_args,
+    _sixj_exact_doubled,
+    _sixj_float_doubled,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sixj (
+    backend TEXT NOT NULL,
+    j1 INTEGER NOT NULL, j2 INTEGER NOT NULL, j3 INTEGER NOT NULL,
+    j4 INTEGER NOT NULL, j5 INTEGER NOT NULL, j6 INTEGER NOT NULL,
+    value NOT NULL,
+    PRIMARY KEY (backend, j1, j2, j3, j4, j5, j6)
+) WITHOUT ROWID
+"""
+
+
+def _encode_surd(value):
+    return f"{value.sign}:{value.p}:{value.q}:{value.r}"
+
+
+def _decode_surd(text):
+    sign, p, q, r = text.split(":")
+    return Surd.canonical(int(sign), int(p), int(q), Fraction(r))
+
+
+def _codec(mode, dps):
+    """``(backend_key, evaluate, encode, decode)`` for a cache mode."""
+    if mode in ("exact", "symbolic"):
+        return "exact", _sixj_exact_doubled, _encode_surd, _decode_surd
+    if mode == "prime":
+        from project.prime_factorial import _sixj_prime_doubled
+        # same values as the exact engine, so share its rows
+        return "exact", _sixj_prime_doubled, _encode_surd, _decode_surd
+    if mode == "float":
+        return "float", lambda t: _sixj_float_doubled(t)[0], float, float
+    if mode == "mpmath":
+        import mpmath
+        from project.su2_3nj_mpmath import _sixj_mp_doubled
+
+        def decode(text):
+            with mpmath.workdps(dps):
+                return mpmath.mpf(text)
+        return (
+            f"mpmath:{dps}",
+            lambda t: _sixj_mp_doubled(t, dps),
+            lambda v: mpmath.nstr(v, dps + 5, strip_zeros=False),
+            decode,
+        )
+    raise ValueError(f"unknown mode {mode!r}")
+
+
+class PersistentSixJCache:
+    """
+    SQLite-backed 6j cache shared across processes.
+
+    ``mode`` is one of "exact", "symbolic", "prime", "float" or "mpmath"
+    (with ``dps``).  New values are buffered and written every
+    ``batch_size`` misses, on ``flush()`` and on ``close()``; use the cache
+    as a context manager to make sure the buffer is written.
+    """
+
+    def __init__(self, path, mode="float", dps=15, batch_size=256):
+        self.path = os.fspath(path)
+        self.mode = mode
+        self.dps = dps
+        self.batch_size = batch_size
+        self.backend, self._evaluate, self._encode, self._decode = _codec(mode, dps)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pending = {}
+        self.hits = self.misses = 0
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connection(self):
+        """Per-thread SQLite connection (connections cannot be shared)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _fetch(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM sixj WHERE backend=? AND j1=? AND j2=? AND j3=?"
+            " AND j4=? AND j5=? AND j6=?",
+            (self.backend, *key),
+        ).fetchone()
+        return None if row is None else self._decode(row[0])
+
+    def _lookup_raw(self, two_js):
+        """Stored value (a ``Surd`` in the symbolic mode) for a doubled tuple."""
+        key = canonical_6j(two_js)
+        if key is None:
+            return self._evaluate(two_js)
+        with self._lock:
+            value = self._pending.get(key)
+        if value is None:
+            value = self._fetch(key)
+        if value is not None:
+            with self._lock:
+                self.hits += 1
+            return value
+        with self._lock:
+            self.misses += 1
+        value = self._evaluate(key)
+        self._store(key, value)
+        return value
+
+    def lookup_doubled(self, two_js):
+        """Value for a doubled-spin tuple, read from disk when available."""
+        value = self._lookup_raw(two_js)
+        if self.mode == "symbolic":
+            return value.to_sympy()
+        return value
+
+    def __call__(self, j1, j2=None, j3=None, j4=None, j5=None, j6=None):
+        two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+        return self.lookup_doubled(two_js)
+
+    def _store(self, key, value):
+        with self._lock:
+            self._pending[key] = value
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write buffered values to the database."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        with self._connection() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO sixj VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(self.backend, *key, self._encode(v)) for key, v in pending.items()],
+            )
+
+    def prepopulate(self, tuples):
+        """
+        Compute and store every doubled-spin tuple in ``tuples`` that is not
+        cached yet; returns the number of newly computed symbols.
+        """
+        before = self.misses
+        for two_js in tuples:
+            self._lookup_raw(tuple(two_js))
+        self.flush()
+        return self.misses - before
+
+    def __len__(self):
+        self.flush()
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM sixj WHERE backend=?", (self.backend,)
+        ).fetchone()[0]
+
+    def close(self):
+        """Flush and close this thread's connection."""
+        self.flush()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
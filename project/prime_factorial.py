@@ -0,0 +1,90 @@
+# project/prime_factorial.py
+
+"""
+Prime-factorization backend for the Racah 6j sum.
+
+Every factorial n! is stored as its vector of prime exponents, so the
+products and quotients in the triangle coefficients and Racah terms become
+vector additions.  Big integers are only formed for the final alternating
+sum, after the common prime content of all terms has been divided out, which
+keeps exact evaluation practical for spins into the hundreds.
+
+This is not the fast exact path: turning every term's exponent vector back
+into an integer costs more than the single Horner recurrence of
+``closed_form_3nj_exact`` (about 10 times slower at 2j = 100 and 20 times
+at 2j = 1000-2000).  It is kept as an independent exact backend that shares
+no arithmetic with the term-ratio evaluation.
+"""
+
+from fractions import Fraction
+
+from project.factorial_store import PrimeFactorialTable, store
+from project.su2_3nj_closed_form import (
+    Surd,
+    _ZERO,
+    _doubled_args,
+    _racah_bounds,
+    _triangle_factorials,
+)
+
+
+def _sixj_prime_doubled(two_js, table=None):
+    """Exact 6j symbol of a doubled-spin tuple via prime-exponent vectors."""
+    if table is None:
+        table = store.prime_table(max(max(two_js), 0))
+    elif not table.covers(two_js):
+        raise ValueError(
+            f"spins {two_js} exceed table range max_two_j={table.max_two_j}"
+        )
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        return _ZERO
+    triads, alphas, betas = bounds
+    k_min, k_max = max(alphas), min(betas)
+    # every factorial used below is at most (k_max + 1)!
+    width = len(table.exponents[k_max + 1])
+
+    terms = [
+        table.combine(
+            (k + 1,),
+            [k - a for a in alphas] + [b - k for b in betas],
+            width,
+        )
+        for k in range(k_min, k_max + 1)
+    ]
+    common = [min(col) for col in zip(*terms)]
+    total = 0
+    for k, vec in zip(range(k_min, k_max + 1), terms):
+        term = table.to_int([e - c for e, c in zip(vec, common)])
+        total += -term if k % 2 else term
+    if total == 0:
+        return _ZERO
+
+    nums, dens = _triangle_factorials(triads)
+    radicand = table.combine(nums, dens, width)
+    num = den = p = q = 1
+    for prime, c, e in zip(table.primes, common, radicand):
+        # rational part: common content times the square part of the radicand
+        power = c + (e // 2 if e >= 0 else -(-e // 2))
+        if power > 0:
+            num *= prime ** power
+        elif power < 0:
+            den *= prime ** -power
+        if e % 2:
+            if e > 0:
+                p *= prime
+            else:
+                q *= prime
+    sign = 1 if total > 0 else -1
+    return Surd.canonical(sign, p, q, Fraction(abs(total) * num, den))
+
+
+def closed_form_3nj_prime(j1, j2=None, j3=None, j4=None, j5=None, j6=None, table=None):
+    """
+    Exact Wigner 6j symbol as a ``Surd`` using the prime-exponent backend.
+
+    ``table`` may be a ``PrimeFactorialTable`` pre-built for the spin range
+    of a sweep; by default the shared ``factorial_store`` table is used.
+    """
+    two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+    return _sixj_prime_doubled(two_js, table)
@@ -0,0 +1,273 @@
+# project/result_io.py
+
+"""
+Streaming writers (and readers) for sweep results.
+
+Results are ``(two_js, value)`` pairs as produced by ``project.sweep``.  All
+writers consume them incrementally in bounded memory and come in three
+formats, chosen by file extension or explicitly:
+
+* CSV (``.csv``): the ``data/*.csv`` layout, columns ``j1..j6,value`` with
+  spins written as "3/2";
+* NDJSON (``.ndjson``, ``.jsonl``): one JSON object per line with the same
+  keys;
+* columnar binary (``.s6j``): a 64-byte file header followed by row groups.
+  Each row group is a 16-byte header (magic, row count) followed by the six
+  doubled-spin columns as little-endian int16 and then the values as
+  float64, padded so the value column is 8-byte aligned.  Files can be
+  appended to, and ``read_columnar`` maps every row group with
+  ``np.memmap`` without reading it.  A row group cut short by a crash is
+  ignored on reading.
+
+Exact (``Surd``) values are written to the text formats as expressions such
+as ``-1/18*sqrt(6)``, and to the binary format as float64.
+"""
+
+import csv
+import json
+import os
+import struct
+
+import numpy as np
+
+from project.su2_3nj_closed_form import Surd
+
+_FILE_MAGIC = b"SU2S6JC1"
+_FILE_HEADER = struct.Struct("<8sqq40x")  # magic, version, row group size
+_GROUP_MAGIC = b"SU2S6JRG"
+_GROUP_HEADER = struct.Struct("<8sq")     # magic, row count
+_VERSION = 1
+
+COLUMNS = ("j1", "j2", "j3", "j4", "j5", "j6")
+
+_EXTENSIONS = {".csv": "csv", ".ndjson": "ndjson", ".jsonl": "ndjson", ".s6j": "columnar"}
+
+
+def format_spin(two_j):
+    """Spin from its doubled value, as "1" or "3/2"."""
+    return str(two_j // 2) if two_j % 2 == 0 else f"{two_j}/2"
+
+
+def format_value(value):
+    """Text form of a result value; ``Surd`` values become expressions."""
+    if isinstance(value, Surd):
+        if value.sign == 0:
+            return "0"
+        text = str(value.r)
+        if (value.p, value.q) != (1, 1):
+            radicand = str(value.p) if value.q == 1 else f"{value.p}/{value.q}"
+            text = f"sqrt({radicand})" if value.r == 1 else f"{text}*sqrt({radicand})"
+        return f"-{text}" if value.sign < 0 else text
+    return repr(float(value)) if isinstance(value, (float, np.floating)) else str(value)
+
+
+def _group_layout(count):
+    """Byte sizes ``(spins, padding, values)`` of a row group's columns."""
+    spins = 6 * 2 * count
+    return spins, -spins % 8, 8 * count
+
+
+def _open_text(target, append):
+    """``(file, owned)`` for a path or an already open text stream."""
+    if hasattr(target, "write"):
+        return target, False
+    return open(target, "a" if append else "w", newline=""), True
+
+
+class CSVResultWriter:
+    """Write results as CSV rows ``j1..j6,value`` to a path or text stream."""
+
+    def __init__(self, path, append=False):
+        exists = (
+            append and not hasattr(path, "write")
+            and os.path.exists(path) and os.path.getsize(path) > 0
+        )
+        self._file, self._owned = _open_text(path, append)
+        self._writer = csv.writer(self._file)
+        if not exists:
+            self._writer.writerow(COLUMNS + ("value",))
+        self.count = 0
+
+    def write(self, two_js, value):
+        self._writer.writerow([format_spin(t) for t in two_js] + [format_value(value)])
+        self.count += 1
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class NDJSONResultWriter:
+    """Write results as one JSON object per line to a path or text stream."""
+
+    def __init__(self, path, append=False):
+        self._file, self._owned = _open_text(path, append)
+        self.count = 0
+
+    def write(self, two_js, value):
+        record = dict(zip(COLUMNS, (format_spin(t) for t in two_js)))
+        record["value"] = float(value) if isinstance(value, (float, np.floating)) \
+            else format_value(value)
+        self._file.write(json.dumps(record) + "\n")
+        self.count += 1
+
+    def close(self):
+        if self._owned:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class ColumnarResultWriter:
+    """
+    Write results to the columnar binary format in row groups of
+    ``row_group_size`` rows; at most one row group is held in memory.
+    """
+
+    def __init__(self, path, append=False, row_group_size=1 << 16):
+        if append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                magic, version, row_group_size = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+            if magic != _FILE_MAGIC or version != _VERSION:
+                raise ValueError(f"{path} is not a columnar 6j result file")
+            self._file = open(path, "ab")
+        else:
+            self._file = open(path, "wb")
+            self._file.write(_FILE_HEADER.pack(_FILE_MAGIC, _VERSION, row_group_size))
+        self.row_group_size = row_group_size
+        self._spins = np.empty((6, row_group_size), dtype="<i2")
+        self._values = np.empty(row_group_size, dtype="<f8")
+        self._fill = 0
+        self.count = 0
+
+    def write(self, two_js, value):
+        if not all(0 <= t <= 0x7FFF for t in two_js):
+            raise ValueError(f"doubled spins {two_js} do not fit in int16")
+        self._spins[:, self._fill] = two_js
+        self._values[self._fill] = float(value)
+        self._fill += 1
+        self.count += 1
+        if self._fill == self.row_group_size:
+            self._flush_group()
+
+    def _flush_group(self):
+        n = self._fill
+        if n == 0:
+            return
+        _, padding, _ = _group_layout(n)
+        self._file.write(_GROUP_HEADER.pack(_GROUP_MAGIC, n))
+        self._file.write(np.ascontiguousarray(self._spins[:, :n]).tobytes())
+        self._file.write(b"\0" * padding)
+        self._file.write(self._values[:n].tobytes())
+        self._fill = 0
+
+    def close(self):
+        self._flush_group()
+        self._file.close()
+
+
+_WRITERS = {
+    "csv": CSVResultWriter,
+    "ndjson": NDJSONResultWriter,
+    "columnar": ColumnarResultWriter,
+}
+
+
+def result_format(path):
+    """Format name implied by a file extension."""
+    ext = os.path.splitext(os.fspath(path))[1].lower()
+    if ext not in _EXTENSIONS:
+        raise ValueError(f"cannot infer a result format from {path!r}; pass format=")
+    return _EXTENSIONS[ext]
+
+
+def open_writer(path, format=None, append=False, **options):
+    """
+    Open a result writer for ``path`` ("csv", "ndjson" or "columnar").
+
+    The text formats also accept an open text stream such as ``sys.stdout``
+    (with an explicit ``format``).
+    """
+    format = format or result_format(path)
+    if format not in _WRITERS:
+        raise ValueError(f"unknown result format {format!r}")
+    if not hasattr(path, "write"):
+        path = os.fspath(path)
+    return _WRITERS[format](path, append=append, **options)
+
+
+def write_results(results, path, format=None, append=False, **options):
+    """
+    Stream ``(two_js, value)`` pairs from ``results`` to ``path``; returns
+    the number of rows written.
+    """
+    writer = open_writer(path, format=format, append=append, **options)
+    try:
+        for two_js, value in results:
+            writer.write(two_js, value)
+    finally:
+        writer.close()
+    return writer.count
+
+
+class ColumnarResults:
+    """
+    Memory-mapped view of a columnar result file.
+
+    ``groups`` is a list of ``(spins, values)`` memmaps per row group, with
+    ``spins`` of shape (6, n); ``spins`` and ``values`` concatenate them.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as f:
+            magic, version, self.row_group_size = _FILE_HEADER.unpack(f.read(_FILE_HEADER.size))
+            if magic != _FILE_MAGIC or version != _VERSION:
+                raise ValueError(f"{self.path} is not a columnar 6j result file")
+            self.groups = []
+            offset = _FILE_HEADER.size
+            while offset + _GROUP_HEADER.size <= size:
+                f.seek(offset)
+                magic, n = _GROUP_HEADER.unpack(f.read(_GROUP_HEADER.size))
+                spin_bytes, padding, value_bytes = _group_layout(n)
+                end = offset + _GROUP_HEADER.size + spin_bytes + padding + value_bytes
+                if magic != _GROUP_MAGIC or end > size:
+                    break  # truncated trailing group
+                start = offset + _GROUP_HEADER.size
+                spins = np.memmap(self.path, dtype="<i2", mode="r", offset=start, shape=(6, n))
+                values = np.memmap(
+                    self.path, dtype="<f8", mode="r",
+                    offset=start + spin_bytes + padding, shape=(n,),
+                )
+                self.groups.append((spins, values))
+                offset = end
+
+    def __len__(self):
+        return sum(len(values) for _, values in self.groups)
+
+    @property
+    def spins(self):
+        """All doubled spins as an (N, 6) int16 array."""
+        if not self.groups:
+            return np.empty((0, 6), dtype="<i2")
+        return np.concatenate([s for s, _ in self.groups], axis=1).T
+
+    @property
+    def values(self):
+        """All values as a float64 array."""
+        if not self.groups:
+            return np.empty(0, dtype="<f8")
+        return np.concatenate([v for _, v in self.groups])
+
+    def __iter__(self):
+        for spins, values in self.groups:
+            for row, value in zip(spins.T.tolist(), values.tolist()):
+                yield tuple(row), value
+
+
+def read_columnar(path):
+    """Open a columnar result file for memory-mapped reading."""
+    return ColumnarResults(path)
@@ -0,0 +1,214 @@
+# project/sixj_cache.py
+
+"""
+Symmetry-canonicalized memoization cache for 6j symbols.
+
+The 6j symbol {j1 j2 j3; j4 j5 j6} depends only on its four triad sums
+
+    alpha = (j1+j2+j3, j1+j5+j6, j4+j2+j6, j4+j5+j3)
+
+and three quadrilateral sums
+
+    beta = (j1+j2+j4+j5, j2+j3+j5+j6, j3+j1+j6+j4),
+
+and its 144 tetrahedral and Regge symmetries act on them as the independent
+permutations S4 x S3 of the rows and columns of the Regge array
+R[i][j] = beta[j] - alpha[i].  Sorting alpha and beta therefore maps every
+arrangement of a symbol to one canonical representative, which is what the
+cache is keyed on.
+"""
+
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from itertools import permutations
+from typing import NamedTuple
+
+from project.su2_3nj_closed_form import (
+    _doubled_args,
+    _racah_bounds,
+    _sixj_exact_doubled,
+    _sixj_float_doubled,
+)
+
+
+def _spins_from_regge(alphas, betas):
+    """Doubled spins of the 6j with the given ordered triad/quadrilateral sums."""
+    a1, a2, a3, a4 = alphas
+    b1, b2, b3 = betas
+    return (
+        a1 + a2 - b2, a1 + a3 - b3, a1 + a4 - b1,
+        a3 + a4 - b2, a2 + a4 - b3, a2 + a3 - b1,
+    )
+
+
+def canonical_6j(two_js):
+    """
+    Canonical representative of a doubled-spin 6j tuple under all 144
+    symmetries, or None if the symbol is inadmissible (identically zero).
+    """
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        return None
+    _, alphas, betas = bounds
+    return _spins_from_regge(sorted(alphas), sorted(betas))
+
+
+def symmetry_images(two_js):
+    """Set of all doubled-spin tuples equivalent to an admissible 6j."""
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        raise ValueError(f"{two_js} is not an admissible 6j symbol")
+    _, alphas, betas = bounds
+    return {
+        _spins_from_regge(pa, pb)
+        for pa in permutations(alphas)
+        for pb in permutations(betas)
+    }
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+def _evaluator(mode, dps=15):
+    """Doubled-spin evaluator whose result is stored for ``mode``."""
+    if mode in ("exact", "symbolic"):
+        return _sixj_exact_doubled
+    if mode == "float":
+        return lambda two_js: _sixj_float_doubled(two_js)[0]
+    if mode == "prime":
+        from project.prime_factorial import _sixj_prime_doubled
+        return _sixj_prime_doubled
+    if mode == "mpmath":
+        from project.su2_3nj_mpmath import _sixj_mp_doubled
+        return lambda two_js: _sixj_mp_doubled(two_js, dps)
+    raise ValueError(f"unknown mode {mode!r}")
+
+
+class SixJCache:
+    """
+    Bounded LRU cache of 6j values keyed on the canonical symmetry
+    representative, so all 144 arrangements of a symbol share one entry.
+
+    ``mode`` is one of the ``closed_form_3nj`` modes "exact", "symbolic",
+    "float", "prime" or "mpmath" (with ``dps``); "symbolic" stores the exact
+    ``Surd`` and converts it to SymPy on the way out.  Misses are evaluated
+    directly, or read through ``backing`` (a ``PersistentSixJCache`` of the
+    same mode and precision) when given.
+    Thread-safe.
+    """
+
+    def __init__(self, maxsize=1 << 16, mode="float", backing=None, dps=15):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.mode = mode
+        self.dps = dps
+        self.backing = backing
+        self._evaluate = _evaluator(mode, dps)
+        if backing is not None:
+            if backing.mode != mode:
+                raise ValueError(
+                    f"backing cache mode {backing.mode!r} does not match {mode!r}"
+                )
+            if mode == "mpmath" and backing.dps != dps:
+                raise ValueError(
+                    f"backing cache precision {backing.dps} does not match {dps}"
+                )
+            self._evaluate = backing._lookup_raw
+        # any inadmissible tuple evaluates to zero in the mode's value type
+        self._zero = self._evaluate((0, 0, 1, 0, 0, 1))
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    def _get(self, key):
+        """Stored value of a canonical tuple (counted as a hit), or None."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+        return value
+
+    def _put(self, key, value):
+        """Store the value of a canonical tuple evaluated after a miss."""
+        with self._lock:
+            self.misses += 1
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def lookup_doubled(self, two_js):
+        """Value for a doubled-spin tuple, evaluated at most once per class."""
+        key = canonical_6j(two_js)
+        if key is None:
+            value = self._zero
+        else:
+            value = self._get(key)
+            if value is None:
+                value = self._evaluate(key)
+                self._put(key, value)
+        if self.mode == "symbolic":
+            return value.to_sympy()
+        return value
+
+    def __call__(self, j1, j2=None, j3=None, j4=None, j5=None, j6=None):
+        two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+        return self.lookup_doubled(two_js)
+
+    def cache_info(self):
+        """Hit/miss statistics, in the style of ``functools.lru_cache``."""
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, self.maxsize, len(self._data)
+            )
+
+    def cache_clear(self):
+        """Drop all entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+_default_caches = {}
+
+# path of an SQLite database backing the default caches, if set
+CACHE_DB_ENV = "SU2_3NJ_CACHE_DB"
+
+
+def default_cache(mode="symbolic", dps=15):
+    """
+    The process-wide ``SixJCache`` for ``mode`` (and ``dps`` in the mpmath
+    mode), created on first use.
+
+    If the ``SU2_3NJ_CACHE_DB`` environment variable names a database file,
+    the cache is backed by a ``PersistentSixJCache`` there, shared by all
+    processes using the same file.
+    """
+    key = (mode, dps) if mode == "mpmath" else mode
+    cache = _default_caches.get(key)
+    if cache is None:
+        backing = None
+        path = os.environ.get(CACHE_DB_ENV)
+        if path:
+            from project.persistent_cache import PersistentSixJCache
+            backing = PersistentSixJCache(path, mode=mode, dps=dps)
+            atexit.register(backing.flush)
+        cache = _default_caches.setdefault(
+            key, SixJCache(mode=mode, backing=backing, dps=dps),
+        )
+    return cache
+
+
+def closed_form_3nj_cached(j1, j2=None, j3=None, j4=None, j5=None, j6=None, mode="symbolic",
+                           dps=15):
+    """``closed_form_3nj`` served from the symmetry-canonical default cache."""
+    return default_cache(mode, dps)(j1, j2, j3, j4, j5, j6)
@@ -0,0 +1,298 @@
+# project/sixj_enumeration.py
+
+"""
+Rejection-free enumeration of admissible 6j tuples with counts and ranks.
+
+``AdmissibleSixJ(M)`` is the sequence of every admissible doubled-spin 6j
+tuple with all 2j <= M in lexicographic order (as ``sweep.admissible_6j``),
+and ``AdmissibleSixJ(M, canonical=True)`` has one ``canonical_6j``
+representative per symmetry class with a member inside that bound.  Both
+are generated from nested ranges that only contain admissible values, so
+no candidate is ever rejected:
+
+* lexicographic: t1, t2 and t4 range over 0..M and t3 over the triangle of
+  (t1, t2).  t5 is restricted both by the triangle (t4, t5, t3) and so that
+  the t6 range of the triads (t1, t5, t6) and (t4, t2, t6) is not empty:
+
+      max(|t4-t3|, t1-t4-t2, |t4-t2|-t1) <= t5 <= min(t4+t3, t1+t4+t2, M).
+
+  These bounds share the parity of t3+t4, and the triangle conditions on
+  the earlier spins keep every range non-empty.
+* canonical: the six non-negative Regge parameters of ``sixj_table`` are
+  in bijection with the symmetry classes.  Pairing the largest triad sums
+  with the largest quadrilateral sums gives the member whose largest 2j is
+  smallest, max(a3+a4-b3, a2+a4-b2, a1+a4-b1, a2+a3-b1) for sorted sums;
+  these four forms (``_FORMS``) are linear in the parameters with
+  non-negative coefficients, so bounding them by M bounds each parameter
+  by what the earlier ones leave.  Classes come in lexicographic order of
+  the parameters; the canonical representative itself can have a 2j above
+  M.
+
+Both sequences are split into prefixes ((t1, t2, t3), or the first four
+Regge parameters) whose completions are generated together with vectorized
+NumPy.  The exact length is known before anything is generated: the
+completions of (t1, t2, t3) number sum over t6 of (A6 A3 A6)[t1, t2], with
+A_z[x, y] the triangle indicator of (x, y, z), and those of a canonical
+prefix follow from its remaining budgets.  The first rank of every prefix
+gives random access by rank, ``rank`` inverts it, and ``array``/``chunks``
+build blocks of consecutive tuples.  ``shards(n)`` cuts the sequence into n
+rank ranges of equal cost, counted in Racah terms plus one per tuple as in
+``sweep``.
+"""
+
+import numpy as np
+
+from project.sixj_cache import canonical_6j
+from project.sixj_table import _params_to_spins, _regge_parameters
+from project.spin6 import Spin6
+from project.su2_3nj_closed_form import _racah_bounds
+
+# coefficients in the Regge parameters (g1, g2, g3, u, h1, h2) of the four
+# forms whose maximum is the smallest largest 2j within a symmetry class
+_FORMS = np.array([
+    [1, 2, 2, 2, 1, 0],
+    [1, 1, 2, 2, 1, 1],
+    [0, 1, 2, 2, 2, 1],
+    [1, 1, 1, 2, 2, 1],
+])
+
+
+def _ragged(lo, hi, step=2):
+    """``(parent, value)`` of the ranges lo[i], lo[i] + step, ..., <= hi[i]."""
+    counts = np.maximum((hi - lo) // step + 1, 0)
+    parent = np.repeat(np.arange(len(lo)), counts)
+    starts = np.cumsum(counts) - counts
+    offset = np.arange(len(parent)) - starts[parent]
+    return parent, lo[parent] + step * offset
+
+
+def _completions(prefixes, max_two_j):
+    """
+    All admissible tuples starting with the (n, 3) ``prefixes`` (t1, t2,
+    t3), in lexicographic order, as an (N, 6) int64 array.
+    """
+    m = max_two_j
+    t1, t2, t3 = np.asarray(prefixes, dtype=np.int64).reshape(-1, 3).T
+    parent = np.repeat(np.arange(len(t1)), m + 1)
+    t1, t2, t3 = t1[parent], t2[parent], t3[parent]
+    t4 = np.tile(np.arange(m + 1), len(parent) // (m + 1))
+    lo = np.maximum.reduce([abs(t4 - t3), t1 - t4 - t2, abs(t4 - t2) - t1])
+    hi = np.minimum.reduce([t4 + t3, t1 + t4 + t2, np.full_like(t4, m)])
+    parent, t5 = _ragged(lo, hi)
+    t1, t2, t3, t4 = t1[parent], t2[parent], t3[parent], t4[parent]
+    lo = np.maximum(abs(t1 - t5), abs(t4 - t2))
+    hi = np.minimum.reduce([t1 + t5, t4 + t2, np.full_like(t5, m)])
+    parent, t6 = _ragged(lo, hi)
+    return np.stack([t1[parent], t2[parent], t3[parent], t4[parent], t5[parent], t6], axis=1)
+
+
+def _prefix_counts(max_two_j):
+    """Completions of every prefix (t1, t2, t3) as an (M+1)^3 int64 array."""
+    n = max_two_j + 1
+    x, y, z = np.indices((n, n, n))
+    triangle = ((x + y + z) % 2 == 0) & (abs(x - y) <= z) & (z <= x + y)
+    a = np.moveaxis(triangle, 2, 0).astype(np.float64)   # a[z] = A_z
+    counts = np.empty((n, n, n), dtype=np.int64)
+    for t3 in range(n):
+        # entries are at most (M+1)^3, exact in float64
+        counts[:, :, t3] = np.rint((a @ a[t3] @ a).sum(axis=0)).astype(np.int64)
+    counts[~triangle] = 0
+    return counts
+
+
+def _extend(params, budgets, k):
+    """
+    Every admissible value of Regge parameter k after each row of
+    ``params``, given the remaining ``budgets`` of the four forms:
+    ``(parent, params, budgets)`` of the extended rows.
+    """
+    step = _FORMS[:, k]
+    used = step > 0
+    hi = (budgets[:, used] // step[used]).min(axis=1)
+    parent, value = _ragged(np.zeros_like(hi), hi, step=1)
+    params = np.column_stack([params[parent], value])
+    return parent, params, budgets[parent] - value[:, None] * step
+
+
+def _canonical_prefixes(max_two_j):
+    """Regge parameters (g1, g2, g3, u) of the classes, in order, with their budgets."""
+    params = np.zeros((1, 0), dtype=np.int64)
+    budgets = np.full((1, 4), max_two_j, dtype=np.int64)
+    for k in range(4):
+        _, params, budgets = _extend(params, budgets, k)
+    return params, budgets
+
+
+def _canonical_completions(params, budgets):
+    """Canonical doubled spins of every class with the given prefixes, in order."""
+    for k in (4, 5):
+        _, params, budgets = _extend(params, budgets, k)
+    return _params_to_spins(params)
+
+
+def _canonical_counts(params, budgets):
+    """Number of classes with each prefix: the h2 values summed over h1."""
+    parent, _, budgets = _extend(params, budgets, 4)
+    step = _FORMS[:, 5]
+    used = step > 0
+    h2 = (budgets[:, used] // step[used]).min(axis=1) + 1
+    return np.bincount(parent, weights=h2, minlength=len(params)).astype(np.int64)
+
+
+def _racah_cost(two_js):
+    """Racah terms plus one of each row of an (N, 6) admissible array."""
+    t1, t2, t3, t4, t5, t6 = np.asarray(two_js, dtype=np.int64).T
+    alphas = np.stack([t1 + t2 + t3, t1 + t5 + t6, t4 + t2 + t6, t4 + t5 + t3]) // 2
+    betas = np.stack([t1 + t2 + t4 + t5, t2 + t3 + t5 + t6, t3 + t1 + t6 + t4]) // 2
+    return np.maximum(betas.min(axis=0) - alphas.max(axis=0) + 1, 0) + 1
+
+
+class AdmissibleSixJ:
+    """
+    Every admissible 6j tuple with all 2j <= ``max_two_j`` or, with
+    ``canonical=True``, the ``canonical_6j`` representative of every
+    symmetry class with such a member (the representative itself may have
+    a larger 2j); see the module docstring.
+
+    Iterating yields ``Spin6`` values (lexicographic order needs no counts).
+    ``len``, indexing by rank, ``rank``, ``array``, ``chunks`` and
+    ``shards`` use a table of prefixes and their first ranks, built on first
+    use with O(M^5) (lexicographic) or about O(M^4) (canonical) work.
+    """
+
+    def __init__(self, max_two_j, canonical=False):
+        if max_two_j < 0:
+            raise ValueError("max_two_j must be non-negative")
+        self.max_two_j = max_two_j
+        self.canonical = canonical
+        self._prefixes = None   # (P, 3) spins or (P, 4) Regge parameters
+        self._budgets = None    # canonical: remaining budgets of each prefix
+        self._offsets = None    # first rank of each prefix, and the length
+
+    def __repr__(self):
+        return f"AdmissibleSixJ({self.max_two_j}, canonical={self.canonical})"
+
+    # -- iteration ---------------------------------------------------------
+
+    def __iter__(self):
+        if self.canonical:
+            return (Spin6(*row) for block in self.chunks() for row in block.tolist())
+        return self._iter_lexicographic()
+
+    def _iter_lexicographic(self):
+        m = self.max_two_j
+        new = tuple.__new__     # Spin6 without its Python-level __new__
+        for t1 in range(m + 1):
+            for t2 in range(m + 1):
+                for t3 in range(abs(t1 - t2), min(t1 + t2, m) + 1, 2):
+                    for t4 in range(m + 1):
+                        lo5 = max(abs(t4 - t3), t1 - t4 - t2, abs(t4 - t2) - t1)
+                        hi5 = min(t4 + t3, t1 + t4 + t2, m)
+                        for t5 in range(lo5, hi5 + 1, 2):
+                            lo6 = max(abs(t1 - t5), abs(t4 - t2))
+                            hi6 = min(t1 + t5, t4 + t2, m)
+                            for t6 in range(lo6, hi6 + 1, 2):
+                                yield new(Spin6, (t1, t2, t3, t4, t5, t6))
+
+    # -- counting and ranks -------------------------------------------------
+
+    def _table(self):
+        if self._offsets is None:
+            m = self.max_two_j
+            if self.canonical:
+                self._prefixes, self._budgets = _canonical_prefixes(m)
+                counts = _canonical_counts(self._prefixes, self._budgets)
+            else:
+                counts = _prefix_counts(m)
+                self._prefixes = np.argwhere(counts)
+                counts = counts[counts > 0]
+            self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._offsets
+
+    def _completions(self, first, last):
+        """Tuples of the prefixes ``first <= i < last``."""
+        if self.canonical:
+            return _canonical_completions(self._prefixes[first:last], self._budgets[first:last])
+        return _completions(self._prefixes[first:last], self.max_two_j)
+
+    def __len__(self):
+        return int(self._table()[-1])
+
+    def __getitem__(self, rank):
+        if isinstance(rank, slice):
+            start, stop, step = rank.indices(len(self))
+            if step < 0:
+                raise ValueError("slices must go forward")
+            return self.array(start, stop)[::step]
+        n = len(self)
+        if rank < 0:
+            rank += n
+        if not 0 <= rank < n:
+            raise IndexError("rank out of range")
+        return Spin6(*self.array(rank, rank + 1)[0].tolist())
+
+    def rank(self, two_js):
+        """Position of a doubled-spin tuple in the sequence; ValueError if absent."""
+        two_js = tuple(int(t) for t in two_js)
+        bounds = _racah_bounds(two_js)
+        absent = ValueError(f"{two_js} is not in {self!r}")
+        if bounds is None:
+            raise absent
+        offsets = self._table()
+        if self.canonical:
+            if canonical_6j(two_js) != two_js:
+                raise absent
+            params = np.array(_regge_parameters(*bounds[1:]))
+            if (_FORMS @ params).max() > self.max_two_j:
+                raise absent
+            head, key = self._prefixes, params[:4]
+        else:
+            if max(two_js) > self.max_two_j:
+                raise absent
+            head, key = self._prefixes, np.array(two_js[:3])
+        i = int(np.flatnonzero((head == key).all(axis=1))[0])
+        rows = self._completions(i, i + 1)
+        within = int(np.flatnonzero((rows == two_js).all(axis=1))[0])
+        return int(offsets[i]) + within
+
+    # -- blocks --------------------------------------------------------------
+
+    def array(self, start=0, stop=None):
+        """Tuples of ranks ``start <= rank < stop`` as an (N, 6) int64 array."""
+        offsets = self._table()
+        n = int(offsets[-1])
+        stop = n if stop is None else min(stop, n)
+        start = max(start, 0)
+        if start >= stop:
+            return np.empty((0, 6), dtype=np.int64)
+        first = int(np.searchsorted(offsets, start, side="right")) - 1
+        last = int(np.searchsorted(offsets, stop, side="left"))
+        base = int(offsets[first])
+        return self._completions(first, last)[start - base:stop - base]
+
+    def chunks(self, chunk_size=1 << 16, start=0, stop=None):
+        """Yield consecutive (N, 6) blocks of at most ``chunk_size`` tuples."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        for begin in range(start, stop, chunk_size):
+            yield self.array(begin, min(begin + chunk_size, stop))
+
+    def shards(self, n, chunk_size=1 << 16):
+        """
+        Split the ranks into ``n`` consecutive ``(start, stop)`` ranges of
+        about equal cost (Racah terms plus one per tuple), for independent
+        workers.  Costs every tuple once, in vectorized chunks.
+        """
+        if n < 1:
+            raise ValueError("n must be positive")
+        totals = [int(_racah_cost(c).sum()) for c in self.chunks(chunk_size)]
+        before = np.concatenate([[0], np.cumsum(totals, dtype=np.int64)])
+        cuts = [0]
+        for i in range(1, n):
+            target = int(before[-1]) * i // n
+            c = max(int(np.searchsorted(before, target, side="right")) - 1, 0)
+            start = c * chunk_size
+            cost = np.cumsum(_racah_cost(self.array(start, start + chunk_size)))
+            offset = int(np.searchsorted(cost, target - before[c], side="left"))
+            cuts.append(min(max(start + offset, cuts[-1]), len(self)))
+        cuts.append(len(self))
+        return list(zip(cuts[:-1], cuts[1:]))
@@ -0,0 +1,144 @@
+# project/sixj_recursion.py
+
+"""
+Three-term (Schulten-Gordon) recursion for whole families of 6j symbols.
+
+For fixed j1, j2, j4, j5, j6 the symbols f(x) = {j1 j2 x; j4 j5 j6} over all
+admissible x satisfy (Schulten & Gordon, J. Math. Phys. 16, 1961 (1975))
+
+    x E(x+1) f(x+1) + F(x) f(x) + (x+1) E(x) f(x-1) = 0
+
+with, writing the symbol as {x j1 j2; j6 j4 j5} and J(y) = y(y+1),
+
+    E(x) = sqrt([x^2 - (j1-j2)^2] [(j1+j2+1)^2 - x^2]
+                [x^2 - (j4-j5)^2] [(j4+j5+1)^2 - x^2])
+    F(x) = (2x+1) { J(x) [-J(x) + J(j1) + J(j2) - 2 J(j6)]
+                    + J(j4) [J(x) + J(j1) - J(j2)]
+                    + J(j5) [J(x) - J(j1) + J(j2)] }.
+
+The recursion is run forward from x_min while the values keep growing
+(the classically forbidden region, where forward iteration is stable) and
+backward from x_max down to that point; the two halves are matched there,
+normalised with the orthogonality relation
+
+    sum_x (2x+1)(2 j6+1) f(x)^2 = 1
+
+and given the sign of the closed form at x_max.  The whole
+family costs O(range) operations instead of one Racah sum per member.
+"""
+
+import math
+
+import numpy as np
+
+from project.su2_3nj_closed_form import (
+    _sixj_exact_doubled,
+    _sixj_float_doubled,
+    _to_doubled,
+    _triangle_admissible,
+)
+
+# values are rescaled when they exceed this during the recursion
+_BIG = 1e150
+
+
+def _family_range(t1, t2, t4, t5):
+    """Doubled values of the running spin admissible in both of its triads."""
+    if (t1 + t2) % 2 != (t4 + t5) % 2:
+        return np.zeros(0, dtype=np.int64)
+    lo = max(abs(t1 - t2), abs(t4 - t5))
+    hi = min(t1 + t2, t4 + t5)
+    return np.arange(lo, hi + 1, 2, dtype=np.int64)
+
+
+def _sixj_family_doubled(t1, t2, t4, t5, t6):
+    """
+    Values {j1 j2 x; j4 j5 j6} for all admissible x, from doubled spins.
+
+    Returns ``(two_x, values)`` as NumPy arrays.
+    """
+    two_x = _family_range(t1, t2, t4, t5)
+    n = len(two_x)
+    if n == 0 or not (_triangle_admissible(t1, t5, t6) and _triangle_admissible(t4, t2, t6)):
+        return two_x, np.zeros(n)
+    if n <= 2:
+        values = [_sixj_float_doubled((t1, t2, int(t), t4, t5, t6))[0] for t in two_x]
+        return two_x, np.array(values)
+
+    j1, j2, j4, j5, j6 = (t / 2 for t in (t1, t2, t4, t5, t6))
+    x = two_x / 2
+
+    def E(y):
+        return np.sqrt(np.maximum(
+            (y * y - (j1 - j2) ** 2) * ((j1 + j2 + 1) ** 2 - y * y)
+            * (y * y - (j4 - j5) ** 2) * ((j4 + j5 + 1) ** 2 - y * y), 0.0))
+
+    def J(y):
+        return y * (y + 1)
+
+    e_lo = E(x)          # E(x), zero at x_min
+    e_hi = E(x + 1)      # E(x+1), zero at x_max
+    F = (2 * x + 1) * (
+        J(x) * (-J(x) + J(j1) + J(j2) - 2 * J(j6))
+        + J(j4) * (J(x) + J(j1) - J(j2))
+        + J(j5) * (J(x) - J(j1) + J(j2))
+    )
+
+    f = np.zeros(n)
+    mid = 0
+    if x[0] > 0:
+        # forward from x_min while |f| grows; at x_min = 0 the forward
+        # recursion is degenerate and the backward sweep covers everything
+        f[0] = 1.0
+        f[1] = -F[0] * f[0] / (x[0] * e_hi[0])
+        if abs(f[1]) > abs(f[0]):
+            mid = n - 1
+            for i in range(1, n - 1):
+                f[i + 1] = -(F[i] * f[i] + (x[i] + 1) * e_lo[i] * f[i - 1]) / (x[i] * e_hi[i])
+                if abs(f[i + 1]) > _BIG:
+                    f[: i + 2] /= _BIG
+                if abs(f[i + 1]) <= abs(f[i]):
+                    mid = i
+                    break
+
+    # backward from x_max down to mid
+    g = np.zeros(n)
+    g[n - 1] = 1.0
+    g[n - 2] = -F[n - 1] * g[n - 1] / ((x[n - 1] + 1) * e_lo[n - 1])
+    for i in range(n - 2, mid, -1):
+        g[i - 1] = -(F[i] * g[i] + x[i] * e_hi[i] * g[i + 1]) / ((x[i] + 1) * e_lo[i])
+        if abs(g[i - 1]) > _BIG:
+            g[i - 1:] /= _BIG
+
+    # match the two halves at mid (and its neighbours, for robustness)
+    if x[0] == 0:
+        scale = 1.0
+    else:
+        lo, hi = max(mid - 1, 0), min(mid + 1, n - 1)
+        scale = np.dot(f[lo:hi + 1], g[lo:hi + 1]) / np.dot(g[lo:hi + 1], g[lo:hi + 1])
+    values = np.concatenate([f[:mid], scale * g[mid:]])
+
+    norm = np.sum((2 * x + 1) * values ** 2) * (2 * j6 + 1)
+    values /= math.sqrt(norm)
+    # g[n-1] = 1, so the recursion gives f(x_max) the sign of ``scale``; fix
+    # it from the closed form there, exactly if the float sum is unreliable
+    edge = (t1, t2, int(two_x[-1]), t4, t5, t6)
+    reference, error = _sixj_float_doubled(edge)
+    sign = math.copysign(1.0, reference)
+    if not abs(reference) > error:
+        sign = _sixj_exact_doubled(edge).sign
+    if sign * scale < 0:
+        values = -values
+    return two_x, values
+
+
+def closed_form_3nj_family(j1, j2, j4, j5, j6):
+    """
+    All 6j symbols {j1 j2 x; j4 j5 j6} over the admissible range of x.
+
+    Returns ``(two_x, values)``: the doubled values 2x (NumPy int array) and
+    the corresponding float64 6j values, computed in O(range) time with the
+    Schulten-Gordon three-term recursion.
+    """
+    t1, t2, t4, t5, t6 = (_to_doubled(j) for j in (j1, j2, j4, j5, j6))
+    return _sixj_family_doubled(t1, t2, t4, t5, t6)
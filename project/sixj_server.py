@@ -0,0 +1,378 @@
+# project/sixj_server.py
+
+"""
+Asyncio evaluation server for 6j symbols, with an async client.
+
+``SixJServer`` listens on a Unix domain socket or on a localhost TCP port
+and speaks newline-delimited JSON.  A request is
+
+    {"id": 1, "two_js": [[2, 2, 2, 2, 2, 2], [1, 1, 2, 1, 1, 2]]}
+
+(doubled spins, one or many tuples) or ``{"id": 2, "op": "stats"}``; the
+reply carries the same id and either ``"values"`` (floats, or for the
+exact modes ``Surd``s encoded as "sign:p:q:r"), the stats, or
+``"error"``.  Requests on one connection are served concurrently and may
+be answered out of order.  Doubled spins above ``max_two_j`` are rejected.
+
+The event loop never evaluates a symbol.  Each tuple is reduced to its
+canonical symmetry representative (``canonical_6j``) and looked up in a
+``SixJCache`` shared by all connections.  Misses join the pending set,
+where concurrent requests for any arrangement of the same symbol
+(including those already being evaluated) wait on one future.  The
+pending set is flushed ``max_delay`` seconds after its first entry, or as
+soon as it holds ``max_batch`` symbols, as one vectorized batch on a
+process pool (``workers=1``: a single thread of this process).  If a batch
+fails, its symbols are evaluated one by one, so an error only reaches the
+requests waiting on the symbol that caused it.  Symbols still pending or
+being evaluated when the server closes fail with a RuntimeError.
+
+``stats()`` reports request and symbol counts, cache hits, coalesced
+duplicates, batches, the current and largest queue depth (symbols pending
+or being evaluated) and percentiles of the request latencies, from receipt
+to reply, over the last ``history`` requests.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from project.benchmark import summarize
+from project.persistent_cache import _decode_surd, _encode_surd
+from project.sixj_cache import SixJCache, canonical_6j
+from project.sweep import _evaluate_chunk
+
+MODES = ("float", "exact", "prime")
+
+# longest request line accepted (a batch of about 2^20 tuples)
+_LINE_LIMIT = 1 << 25
+
+# default largest doubled spin served; far inside the int64 batch arithmetic
+MAX_TWO_J = 1 << 14
+
+
+def _check_tuple(two_js, max_two_j):
+    if len(two_js) != 6 or not all(type(t) is int and t >= 0 for t in two_js):
+        raise ValueError(f"expected six non-negative doubled spins, got {two_js!r}")
+    if max(two_js) > max_two_j:
+        raise ValueError(f"doubled spins above {max_two_j} are not served, got {two_js!r}")
+    return tuple(two_js)
+
+
+def _closed_error():
+    return RuntimeError("the server closed before the symbol was evaluated")
+
+
+class SixJServer:
+    """
+    Coalescing 6j server; see the module docstring.
+
+    ``mode`` is "float" (batch evaluator), "exact" or "prime" (``Surd``).
+    ``cache`` is a ``SixJCache`` of the same mode, shared with other users,
+    or a new one of ``cache_size`` entries.  Tuples with a doubled spin
+    above ``max_two_j`` are rejected with a ValueError.  Use as an async context
+    manager, or call ``start`` and ``close``; ``evaluate`` serves requests
+    from the same event loop without a connection.
+    """
+
+    def __init__(self, mode="float", workers=None, cache=None, cache_size=1 << 20,
+                 max_batch=4096, max_delay=0.001, history=10000, max_two_j=MAX_TWO_J):
+        if mode not in MODES:
+            raise ValueError(f"unknown mode {mode!r}")
+        if cache is not None and cache.mode != mode:
+            raise ValueError(f"cache mode {cache.mode!r} does not match {mode!r}")
+        self.mode = mode
+        self.workers = workers or os.cpu_count() or 1
+        self.cache = cache if cache is not None else SixJCache(cache_size, mode=mode)
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_two_j = max_two_j
+        self._pending = {}     # canonical tuple -> future, not yet submitted
+        self._running = {}     # canonical tuple -> future, being evaluated
+        self._timer = None
+        self._executor = None
+        self._server = None
+        self._latencies = deque(maxlen=history)
+        self._counts = dict.fromkeys(
+            ("requests", "errors", "symbols", "cache_hits", "coalesced", "evaluated", "batches"), 0,
+        )
+        self._active = 0
+        self._max_queue_depth = 0
+
+    async def start(self, path=None, host="127.0.0.1", port=0):
+        """Listen on the Unix socket ``path``, or on ``host``:``port`` (0: any free port)."""
+        if self.workers == 1:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle, path, limit=_LINE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle, host, port, limit=_LINE_LIMIT)
+        return self
+
+    @property
+    def address(self):
+        """The socket path, or the ``(host, port)`` pair, being listened on."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(_closed_error())
+        self._pending.clear()
+        if self._executor is not None:
+            # batches not yet started are cancelled, and _run fails their symbols
+            executor, self._executor = self._executor, None
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def evaluate(self, tuples):
+        """Values of a list of doubled-spin tuples."""
+        start = time.perf_counter_ns()
+        self._counts["requests"] += 1
+        self._active += 1
+        try:
+            tuples = [_check_tuple(t, self.max_two_j) for t in tuples]
+            self._counts["symbols"] += len(tuples)
+            values = [None] * len(tuples)
+            waiting = {}       # future -> indices of the request waiting on it
+            for i, two_js in enumerate(tuples):
+                key = canonical_6j(two_js)
+                if key is None:
+                    values[i] = self.cache._zero
+                    continue
+                value = self.cache._get(key)
+                if value is not None:
+                    self._counts["cache_hits"] += 1
+                    values[i] = value
+                    continue
+                future = self._pending.get(key) or self._running.get(key)
+                if future is None:
+                    future = self._pending[key] = asyncio.get_running_loop().create_future()
+                    self._schedule()
+                else:
+                    self._counts["coalesced"] += 1
+                waiting.setdefault(future, []).append(i)
+            self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+            # shielded: the futures are shared with other requests
+            results = await asyncio.gather(*map(asyncio.shield, waiting))
+            for indices, value in zip(waiting.values(), results):
+                for i in indices:
+                    values[i] = value
+            return values
+        except Exception:
+            self._counts["errors"] += 1
+            raise
+        finally:
+            self._active -= 1
+            self._latencies.append(time.perf_counter_ns() - start)
+
+    @property
+    def queue_depth(self):
+        """Symbols waiting for a batch or being evaluated."""
+        return len(self._pending) + len(self._running)
+
+    def stats(self):
+        """Counters, queue depth and request latency percentiles (ns) as a dict."""
+        return dict(
+            self._counts,
+            mode=self.mode,
+            active_requests=self._active,
+            queue_depth=self.queue_depth,
+            max_queue_depth=self._max_queue_depth,
+            latency_ns=summarize(self._latencies) if self._latencies else {},
+        )
+
+    def _schedule(self):
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+
+    def _flush(self):
+        """Submit the pending set in batches of at most ``max_batch`` symbols."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending = list(self._pending.items())
+        self._pending.clear()
+        self._running.update(pending)
+        for start in range(0, len(pending), self.max_batch):
+            asyncio.get_running_loop().create_task(
+                self._run(pending[start:start + self.max_batch])
+            )
+
+    async def _run(self, batch):
+        keys = [key for key, _ in batch]
+        self._counts["batches"] += 1
+        self._counts["evaluated"] += len(keys)
+        # what the futures get if this task itself is cancelled
+        outcomes = [_closed_error()] * len(keys)
+        try:
+            outcomes = await self._outcomes(keys)
+        finally:
+            for (key, future), outcome in zip(batch, outcomes):
+                del self._running[key]
+                if isinstance(outcome, BaseException):
+                    if not future.done():
+                        future.set_exception(outcome)
+                    continue
+                self.cache._put(key, outcome)
+                if not future.done():
+                    future.set_result(outcome)
+
+    async def _outcomes(self, keys):
+        """Value, or the exception raised evaluating it, of every key."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, _evaluate_chunk, self.mode, 15, keys)
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                raise
+            # cancelled by close()
+            return [_closed_error()] * len(keys)
+        except Exception as exc:
+            if len(keys) == 1:
+                return [exc]
+        # find the symbols that fail; the others still get their values
+        singles = await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _evaluate_chunk, self.mode, 15, [key])
+            for key in keys
+        ), return_exceptions=True)
+        return [
+            _closed_error() if isinstance(single, asyncio.CancelledError)
+            else single if isinstance(single, Exception) else single[0]
+            for single in singles
+        ]
+
+    def _encode(self, value):
+        return value if self.mode == "float" else _encode_surd(value)
+
+    async def _reply(self, line, writer, lock):
+        reply = {"id": None}
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("a request must be a JSON object")
+            reply["id"] = message.get("id")
+            op = message.get("op", "evaluate")
+            if op == "stats":
+                reply["stats"] = self.stats()
+            elif op == "evaluate":
+                values = await self.evaluate(message["two_js"])
+                reply["values"] = [self._encode(v) for v in values]
+            else:
+                raise ValueError(f"unknown op {op!r}")
+        except Exception as exc:
+            # any failure is reported, so that no request goes unanswered
+            reply["error"] = f"{type(exc).__name__}: {exc}"
+        async with lock:
+            writer.write(json.dumps(reply).encode() + b"\n")
+            await writer.drain()
+
+    async def _handle(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(self._reply(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class SixJClient:
+    """
+    Async client of a ``SixJServer``.  One connection serves any number of
+    concurrent coroutines; replies are matched to requests by id.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    @classmethod
+    async def connect(cls, path=None, host="127.0.0.1", port=None):
+        """Connect to the Unix socket ``path``, or to ``host``:``port``."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=_LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=_LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def _listen(self):
+        try:
+            while line := await self._reader.readline():
+                reply = json.loads(line)
+                future = self._waiting.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+            error = ConnectionError("server closed the connection")
+        except Exception as exc:
+            error = exc
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiting.clear()
+
+    async def _request(self, **message):
+        message["id"] = next(self._ids)
+        future = self._waiting[message["id"]] = asyncio.get_running_loop().create_future()
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+        reply = await future
+        if "error" in reply:
+            raise ValueError(reply["error"])
+        return reply
+
+    async def batch(self, tuples):
+        """Values of a list of doubled-spin tuples (``Surd`` in the exact modes)."""
+        reply = await self._request(two_js=[list(t) for t in tuples])
+        return [_decode_surd(v) if isinstance(v, str) else v for v in reply["values"]]
+
+    async def sixj(self, two_js):
+        """Value of one doubled-spin tuple."""
+        return (await self.batch([two_js]))[0]
+
+    async def stats(self):
+        return (await self._request(op="stats"))["stats"]
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        await self._listener
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
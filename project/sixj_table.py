@@ -0,0 +1,217 @@
+# project/sixj_table.py
+
+"""
+Precomputed, memory-mapped table of 6j symbols for O(1) lookups.
+
+Every admissible 6j has a canonical representative (``project.sixj_cache``)
+whose sorted triad sums a1 <= a2 <= a3 <= a4 and quadrilateral sums
+b1 <= b2 <= b3 are fixed by six free non-negative integers
+
+    p = (a2 - a1, a3 - a2, a4 - a3, b1 - a4, b2 - b1, b3 - b2),
+
+the smallest triad sum following from sum(a) = sum(b).  Conversely any such
+six integers describe an admissible symbol, so canonical 6j symbols are in
+bijection with N^6.  Their sum L = sum(p) is the largest entry b3 - a1 of the
+Regge array and never exceeds the largest doubled spin, so the table for
+2j_max = M stores every canonical symbol with L <= M, indexed by the colex
+rank of the combination c_k = p_1 + ... + p_k + k - 1:
+
+    index = sum_k C(c_k, k),   0 <= index < C(M + 6, 6).
+
+Tables for smaller M are prefixes of larger ones.  Values are float64 in a
+flat file after a fixed 64-byte header, read back with ``np.memmap`` so all
+worker processes share one copy in the page cache.  Exact values can be
+stored alongside as variable-length ``Surd`` records.
+"""
+
+import os
+import struct
+from math import comb
+
+import numpy as np
+
+from project.persistent_cache import _decode_surd, _encode_surd
+from project.su2_3nj_batch import closed_form_3nj_batch
+from project.su2_3nj_closed_form import (
+    _doubled_args,
+    _racah_bounds,
+    _sixj_exact_doubled,
+    _sixj_float_doubled,
+)
+
+_MAGIC = b"SU2SIXJ1"
+_HEADER = struct.Struct("<8sqqq32x")  # magic, max_two_j, count, has_exact
+_HEADER_SIZE = 64
+assert _HEADER.size == _HEADER_SIZE
+
+# path of a table used by closed_form_3nj(mode="table"), if set
+TABLE_ENV = "SU2_3NJ_TABLE"
+
+
+def table_size(max_two_j):
+    """Number of entries in the table for doubled spins up to ``max_two_j``."""
+    return comb(max_two_j + 6, 6)
+
+
+def _regge_parameters(alphas, betas):
+    """The six free parameters of a symbol from its triad/quadrilateral sums."""
+    a1, a2, a3, a4 = sorted(alphas)
+    b1, b2, b3 = sorted(betas)
+    return (a2 - a1, a3 - a2, a4 - a3, b1 - a4, b2 - b1, b3 - b2)
+
+
+def table_index(two_js):
+    """
+    Table offset of a doubled-spin 6j tuple, or None if it is inadmissible.
+
+    The offset is valid for any table with ``table_size(M)`` greater than it;
+    a symbol with largest doubled spin <= M is always in the table for M.
+    """
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        return None
+    _, alphas, betas = bounds
+    index = 0
+    s = 0
+    for k, p in enumerate(_regge_parameters(alphas, betas), start=1):
+        s += p
+        index += comb(s + k - 1, k)
+    return index
+
+
+def _params_to_spins(p):
+    """Canonical doubled spins from an (n, 6) array of free parameters."""
+    g1, g2, g3, u, h1, h2 = p.T
+    a1 = g2 + 2 * g3 + 3 * u + 2 * h1 + h2
+    a2 = a1 + g1
+    a3 = a2 + g2
+    a4 = a3 + g3
+    b1 = a4 + u
+    b2 = b1 + h1
+    b3 = b2 + h2
+    return np.stack([
+        a1 + a2 - b2, a1 + a3 - b3, a1 + a4 - b1,
+        a3 + a4 - b2, a2 + a4 - b3, a2 + a3 - b1,
+    ], axis=1)
+
+
+def table_entries(start, stop, max_two_j):
+    """Canonical doubled spins of the entries ``start <= index < stop``."""
+    n = max_two_j + 6
+    binomials = [np.array([comb(c, k) for c in range(n)], dtype=np.int64) for k in range(7)]
+    rank = np.arange(start, stop, dtype=np.int64)
+    c = np.empty((len(rank), 6), dtype=np.int64)
+    for k in range(6, 0, -1):
+        c[:, k - 1] = np.searchsorted(binomials[k], rank, side="right") - 1
+        rank = rank - binomials[k][c[:, k - 1]]
+    s = c - np.arange(6)
+    p = np.diff(s, axis=1, prepend=0)
+    return _params_to_spins(p)
+
+
+def build_table(path, max_two_j, exact=False, chunk_size=1 << 16):
+    """
+    Write the table for doubled spins up to ``max_two_j`` to ``path``.
+
+    Values are computed with the batch evaluator.  With ``exact=True`` the
+    exact ``Surd`` of every entry is also written, to ``path + ".exact"``
+    (records) and ``path + ".exact.idx"`` (int64 record offsets).
+    """
+    path = os.fspath(path)
+    count = table_size(max_two_j)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, max_two_j, count, int(exact)))
+        f.truncate(_HEADER_SIZE + 8 * count)
+    values = np.memmap(path, dtype=np.float64, mode="r+", offset=_HEADER_SIZE, shape=(count,))
+    offsets = np.memmap(
+        path + ".exact.idx", dtype=np.int64, mode="w+", shape=(count + 1,)
+    ) if exact else None
+    records = open(path + ".exact", "wb") if exact else None
+    try:
+        position = 0
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            spins = table_entries(start, stop, max_two_j)
+            values[start:stop] = closed_form_3nj_batch(spins)
+            if exact:
+                for i, row in enumerate(spins.tolist(), start=start):
+                    record = _encode_surd(_sixj_exact_doubled(tuple(row))).encode()
+                    offsets[i] = position
+                    records.write(record)
+                    position += len(record)
+        if exact:
+            offsets[count] = position
+            offsets.flush()
+        values.flush()
+    finally:
+        if records is not None:
+            records.close()
+    del values, offsets
+    return count
+
+
+class SixJTable:
+    """
+    Read-only memory-mapped 6j table written by ``build_table``.
+
+    Lookups outside the table's range fall back to direct evaluation.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as f:
+            magic, self.max_two_j, self.count, has_exact = _HEADER.unpack(f.read(_HEADER_SIZE))
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is not a 6j table")
+        self.values = np.memmap(
+            self.path, dtype=np.float64, mode="r", offset=_HEADER_SIZE, shape=(self.count,)
+        )
+        self.has_exact = bool(has_exact)
+        if self.has_exact:
+            self._offsets = np.memmap(self.path + ".exact.idx", dtype=np.int64, mode="r")
+            self._records = np.memmap(self.path + ".exact", dtype=np.uint8, mode="r")
+
+    def lookup_doubled(self, two_js):
+        """float64 value of a doubled-spin 6j tuple."""
+        index = table_index(two_js)
+        if index is None:
+            return 0.0
+        if index < self.count:
+            return float(self.values[index])
+        return _sixj_float_doubled(two_js)[0]
+
+    def exact_doubled(self, two_js):
+        """Exact ``Surd`` of a doubled-spin 6j tuple."""
+        index = table_index(two_js)
+        if index is None or not self.has_exact or index >= self.count:
+            return _sixj_exact_doubled(two_js)
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        return _decode_surd(self._records[start:stop].tobytes().decode())
+
+    def __call__(self, j1, j2=None, j3=None, j4=None, j5=None, j6=None):
+        two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+        return self.lookup_doubled(two_js)
+
+    def __len__(self):
+        return self.count
+
+
+_default_table = None
+
+
+def default_table():
+    """The table named by the ``SU2_3NJ_TABLE`` environment variable."""
+    global _default_table
+    if _default_table is None:
+        path = os.environ.get(TABLE_ENV)
+        if not path:
+            raise RuntimeError(
+                f"mode='table' needs a table file; set {TABLE_ENV} (see build_table)"
+            )
+        _default_table = SixJTable(path)
+    return _default_table
+
+
+def closed_form_3nj_table(j1, j2=None, j3=None, j4=None, j5=None, j6=None):
+    """6j symbol as a float, looked up in the default memory-mapped table."""
+    return default_table()(j1, j2, j3, j4, j5, j6)
@@ -0,0 +1,130 @@
+# project/spin6.py
+
+"""
+Compact doubled-spin 6j tuple.
+
+``Spin6`` holds the six doubled spins (2j1, ..., 2j6) of a 6j symbol
+{j1 j2 j3; j4 j5 j6} as plain ints.  It is a ``NamedTuple`` (no instance
+dict), compares and hashes like the plain tuple, and is accepted
+wherever the backends take a doubled-spin tuple: ``lookup_doubled``, the
+symmetry caches, ``sweep`` and ``closed_form_3nj_batch``.  The public
+evaluators (``closed_form_3nj`` and the ``closed_form_3nj_*`` backends,
+``reference_3nj`` and the cache and table ``__call__``s) also take a
+single ``Spin6`` in place of their six spin arguments, with no per-spin
+conversion at all.
+
+``key`` packs a ``Spin6`` with every 2j <= ``MAX_KEY_TWO_J`` into one
+non-negative int64 (``KEY_BITS`` bits per spin, 2j1 in the highest bits,
+so keys sort like the tuples), for compact hash keys and integer columns.
+
+Arrays of tuples convert without copying between an (N, 6) int32 array
+and the structured dtype ``spin6_dtype()`` (fields ``two_j1`` ..
+``two_j6``) with ``to_structured`` and ``doubled_view``.
+``closed_form_3nj_batch`` takes either and widens one chunk at a time to
+int64 for its arithmetic.  NumPy is only imported by these array helpers.
+"""
+
+from typing import NamedTuple
+
+KEY_BITS = 10
+MAX_KEY_TWO_J = (1 << KEY_BITS) - 1
+FIELDS = ("two_j1", "two_j2", "two_j3", "two_j4", "two_j5", "two_j6")
+
+_dtype = None
+
+
+class Spin6(NamedTuple):
+    """Doubled spins of the 6j symbol {j1 j2 j3; j4 j5 j6}."""
+    two_j1: int
+    two_j2: int
+    two_j3: int
+    two_j4: int
+    two_j5: int
+    two_j6: int
+
+    @classmethod
+    def from_spins(cls, j1, j2, j3, j4, j5, j6):
+        """From spins given as ints, Fractions, "3/2" strings, etc."""
+        from project.su2_3nj_closed_form import _to_doubled
+        return cls(*(_to_doubled(j) for j in (j1, j2, j3, j4, j5, j6)))
+
+    @classmethod
+    def from_key(cls, key):
+        """Inverse of ``key``."""
+        shifts = range(5 * KEY_BITS, -1, -KEY_BITS)
+        return cls(*((key >> s) & MAX_KEY_TWO_J for s in shifts))
+
+    @property
+    def admissible(self):
+        """
+        True if all four triads (j1 j2 j3), (j1 j5 j6), (j4 j2 j6) and
+        (j4 j5 j3) satisfy the triangle and parity conditions.
+        """
+        t1, t2, t3, t4, t5, t6 = self
+        for a, b, c in ((t1, t2, t3), (t1, t5, t6), (t4, t2, t6), (t4, t5, t3)):
+            if (a + b + c) & 1 or a < 0 or b < 0 or c < 0 or \
+                    c > a + b or b > a + c or a > b + c:
+                return False
+        return True
+
+    @property
+    def key(self):
+        """The tuple packed into one non-negative int64."""
+        key = 0
+        for t in self:
+            if not 0 <= t <= MAX_KEY_TWO_J:
+                raise ValueError(f"2j = {t} does not fit in a {KEY_BITS}-bit key field")
+            key = (key << KEY_BITS) | t
+        return key
+
+    def spins(self):
+        """The spins j1 .. j6 as Fractions."""
+        from fractions import Fraction
+        return tuple(Fraction(t, 2) for t in self)
+
+    def canonical(self):
+        """Canonical representative under the 144 symmetries, or None if inadmissible."""
+        from project.sixj_cache import canonical_6j
+        two_js = canonical_6j(self)
+        return None if two_js is None else Spin6(*two_js)
+
+
+def spin6_dtype():
+    """NumPy structured dtype of a ``Spin6``: six little-endian int32 fields."""
+    global _dtype
+    if _dtype is None:
+        import numpy as np
+        _dtype = np.dtype([(name, "<i4") for name in FIELDS])
+    return _dtype
+
+
+def to_structured(two_js):
+    """
+    Structured array (dtype ``spin6_dtype()``) of an (N, 6) array or
+    sequence of doubled-spin tuples; a view when the input already is a
+    C-contiguous int32 array.
+    """
+    import numpy as np
+    two = np.ascontiguousarray(two_js, dtype="<i4").reshape(-1, 6)
+    return two.view(spin6_dtype()).reshape(len(two))
+
+
+def doubled_view(records):
+    """(N, 6) int32 view of a structured ``Spin6`` array (no copy)."""
+    import numpy as np
+    records = np.asarray(records)
+    if records.dtype != spin6_dtype():
+        raise ValueError(f"expected dtype {spin6_dtype()}, got {records.dtype}")
+    return np.ascontiguousarray(records).reshape(-1).view("<i4").reshape(-1, 6)
+
+
+def iter_spin6(two_js, chunk_size=1 << 14):
+    """
+    Yield the rows of an (N, 6) integer or structured ``Spin6`` array as
+    ``Spin6`` values with Python int fields, converting a chunk at a time.
+    """
+    if two_js.dtype.names is not None:
+        two_js = doubled_view(two_js)
+    for start in range(0, len(two_js), chunk_size):
+        for row in two_js[start:start + chunk_size].tolist():
+            yield Spin6(*row)
@@ -4,91 +4,387 @@
 True hypergeometric 4F3 closed-form for the Wigner 6-j symbol.
 
 Implements the Racah formula as a 4F3 hypergeometric series.
+
+The Racah sum is evaluated on doubled-spin Python integers: the alternating
+series is accumulated as a single integer numerator over a common
+denominator, and the result is returned in the canonical form
+``sign * sqrt(p/q) * r`` (see ``Surd``).  SymPy is only used to turn that
+exact value into a symbolic expression when one is requested, and is
+imported at that point: the numeric paths need nothing beyond the standard
+library, and importing this module does not load SymPy.
 """
 
-try:
-    import sympy as sp
-except ImportError:
-    print("ERROR: sympy is required. Install with 'pip install sympy'.")
-    import sys
-    sys.exit(2)
+import math
+import sys
+from fractions import Fraction
+from typing import NamedTuple
+
+from project.factorial_store import store
+from project.spin6 import Spin6
+
+
+class Surd(NamedTuple):
+    """
+    Exact value ``sign * sqrt(p/q) * r``.
+
+    In canonical form ``p`` is a squarefree positive integer, ``q`` is 1 and
+    ``r`` is a positive ``Fraction``, so every real number of this shape has
+    exactly one representation and equal values compare equal.  Zero is
+    ``Surd(0, 0, 1, Fraction(0))``.  The backends build their values with
+    ``canonical``; ``q`` is kept so that stored "sign:p:q:r" records of any
+    form still decode.
+    """
+    sign: int
+    p: int
+    q: int
+    r: Fraction
+
+    @classmethod
+    def canonical(cls, sign, p, q, r):
+        """
+        Canonical form of ``sign * sqrt(p/q) * r`` for coprime squarefree p
+        and q: sqrt(p/q) = sqrt(p q) / q.
+        """
+        if sign == 0 or r == 0:
+            return cls(0, 0, 1, Fraction(0))
+        return cls(sign, p * q, 1, Fraction(r) / q)
+
+    def __float__(self):
+        if self.sign == 0:
+            return 0.0
+        # scale p by 4**half into [1, 4): p alone can exceed the float range
+        half = (self.p.bit_length() - 1) // 2
+        return self.sign * math.sqrt(self.p / (self.q << 2 * half)) * float(self.r * (1 << half))
+
+    def to_sympy(self):
+        """Return the value as a SymPy expression."""
+        import sympy as sp
+        r = sp.Rational(self.r.numerator, self.r.denominator)
+        return self.sign * r * sp.sqrt(sp.Rational(self.p, self.q))
+
+
+_ZERO = Surd(0, 0, 1, Fraction(0))
+
+
+def _to_doubled(j):
+    """
+    Return 2j as a Python int.
+
+    Accepts ints, Fractions, SymPy Rationals, exact floats and strings such
+    as ``"3/2"``; raises ValueError if j is not an integer or half-integer.
+    """
+    if type(j) is int:
+        return 2 * j
+    two_j = 2 * Fraction(j)
+    if two_j.denominator != 1:
+        raise ValueError(f"spin {j!r} is not an integer or half-integer")
+    return int(two_j)
+
+
+def _doubled_args(j1, j2, j3, j4, j5, j6):
+    """
+    Doubled spins of the six spin arguments of a 6j evaluator, or ``j1``
+    itself when it is a ``Spin6`` and the others are omitted.
+    """
+    if type(j1) is Spin6 and j2 is None and j3 is None and j4 is None \
+            and j5 is None and j6 is None:
+        return j1
+    return tuple(_to_doubled(j) for j in (j1, j2, j3, j4, j5, j6))
+
+
+def _triangle_admissible(a, b, c):
+    """Triangle and parity condition for doubled spins a, b, c."""
+    return (
+        a >= 0 and b >= 0 and c >= 0
+        and (a + b + c) % 2 == 0
+        and c <= a + b and b <= a + c and a <= b + c
+    )
+
+
+def _racah_bounds(two_js):
+    """
+    Return ``(triads, alphas, betas)`` for the Racah sum of a doubled-spin
+    6j tuple, or None if any of its four triads is inadmissible.
+
+    The sum runs over ``max(alphas) <= k <= min(betas)``.
+    """
+    t1, t2, t3, t4, t5, t6 = two_js
+    triads = ((t1, t2, t3), (t1, t5, t6), (t4, t2, t6), (t4, t5, t3))
+    if not all(_triangle_admissible(*t) for t in triads):
+        return None
+    alphas = tuple(sum(t) // 2 for t in triads)
+    betas = (
+        (t1 + t2 + t4 + t5) // 2,
+        (t2 + t3 + t5 + t6) // 2,
+        (t3 + t1 + t6 + t4) // 2,
+    )
+    return triads, alphas, betas
+
+
+def _triangle_factorials(triads):
+    """
+    Factorial arguments of the squared triangle coefficients of doubled-spin
+    triads, as ``(numerator_args, denominator_args)``.
+    """
+    nums, dens = [], []
+    for a, b, c in triads:
+        nums.extend(((a + b - c) // 2, (a - b + c) // 2, (-a + b + c) // 2))
+        dens.append((a + b + c) // 2 + 1)
+    return nums, dens
+
+
+def _split_radicand(triads):
+    """
+    Write the product of squared triangle coefficients as
+    ``outside**2 * p / q`` with p, q squarefree, using prime exponents of the
+    factorials instead of the factorials themselves.
+    """
+    nums, dens = _triangle_factorials(triads)
+    table = store.prime_table(max(max(t) for t in triads))
+    radicand = table.combine(nums, dens, len(table.exponents[max(dens)]))
+    out_num = out_den = p = q = 1
+    for prime, e in zip(table.primes, radicand):
+        if e > 0:
+            out_num *= prime ** (e // 2)
+            if e % 2:
+                p *= prime
+        elif e < 0:
+            out_den *= prime ** (-e // 2)
+            if e % 2:
+                q *= prime
+    return Fraction(out_num, out_den), p, q
+
+
+def _racah_seed(k, alphas, betas):
+    """
+    Integer numerator and denominator of the Racah term
+        t(k) = (-1)^k (k+1)! / [prod_i (k - a_i)! prod_j (b_j - k)!].
+    """
+    num = store.factorial(k + 1)
+    if k % 2:
+        num = -num
+    den = 1
+    for a in alphas:
+        den *= store.factorial(k - a)
+    for b in betas:
+        den *= store.factorial(b - k)
+    return num, den
+
+
+def _term_ratio(k, alphas, betas):
+    """
+    Integer numerator and denominator of the 4F3 term ratio
+        t(k+1) / t(k) = -(k+2) prod_j (b_j - k) / prod_i (k+1 - a_i).
+    """
+    num = -(k + 2)
+    for b in betas:
+        num *= b - k
+    den = 1
+    for a in alphas:
+        den *= k + 1 - a
+    return num, den
+
+
+def _racah_sum_exact(alphas, betas):
+    """
+    Exact Racah sum  sum_k t(k)  as a Fraction.
+
+    Only the seed term t(k_min) is built from factorials; the remaining
+    terms follow from the term ratio, nested Horner-style as
+        t(k_min) * (1 + r_0 (1 + r_1 (1 + ...)))
+    and carried as one integer numerator over one integer denominator.
+    """
+    k_min, k_max = max(alphas), min(betas)
+    if k_min > k_max:
+        return Fraction(0)
+    num, den = 1, 1
+    for k in range(k_max - 1, k_min - 1, -1):
+        r_num, r_den = _term_ratio(k, alphas, betas)
+        num, den = den * r_den + r_num * num, den * r_den
+    seed_num, seed_den = _racah_seed(k_min, alphas, betas)
+    return Fraction(seed_num * num, seed_den * den)
+
+
+def _racah_series_float(alphas, betas):
+    """
+    Floating-point sum of t(k) / t(k_min) over the Racah range, generated
+    from the term ratio; multiply by the seed term to get the Racah sum.
+    """
+    k_min, k_max = max(alphas), min(betas)
+    term = total = 1.0
+    for k in range(k_min, k_max):
+        r_num, r_den = _term_ratio(k, alphas, betas)
+        term *= r_num / r_den
+        total += term
+    return total
+
+
+def _sixj_exact_doubled(two_js):
+    """Exact 6j symbol of a doubled-spin tuple as a ``Surd``."""
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        return _ZERO
+    triads, alphas, betas = bounds
+    racah_sum = _racah_sum_exact(alphas, betas)
+    if racah_sum == 0:
+        return _ZERO
+    outside, p, q = _split_radicand(triads)
+    sign = 1 if racah_sum > 0 else -1
+    return Surd.canonical(sign, p, q, abs(racah_sum) * outside)
+
+
+# Terms of the normalised series are rescaled by 2**-_RESCALE_BITS whenever
+# they exceed 2**_RESCALE_BITS, which keeps spins in the thousands in range.
+_RESCALE_BITS = 512
+_EPS = sys.float_info.epsilon
+
+
+def _sixj_float_doubled(two_js):
+    """
+    6j symbol of a doubled-spin tuple in double precision.
+
+    Returns ``(value, error)`` where ``error`` estimates the absolute
+    rounding error.  The triangle coefficients and the seed term are
+    combined in log space; the Racah series is generated from the term
+    ratio and summed with Neumaier compensated summation.  The estimate
+    accounts for the error accumulated in each generated term (growing
+    linearly with its distance from the seed), the cancellation in the
+    alternating sum and the log-gamma rounding of the prefactor.
+    """
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        return 0.0, 0.0
+    triads, alphas, betas = bounds
+    k_min, k_max = max(alphas), min(betas)
 
-from sympy import factorial, sqrt, Rational, Integer, simplify
+    nums, dens = _triangle_factorials(triads)
+    logs = [store.log_factorial(n) for n in nums]
+    logs += [-store.log_factorial(d) for d in dens]
+    log_mag = 0.5 * sum(logs)
+    seed_logs = [store.log_factorial(k_min + 1)]
+    seed_logs += [-store.log_factorial(k_min - a) for a in alphas]
+    seed_logs += [-store.log_factorial(b - k_min) for b in betas]
+    log_mag += sum(seed_logs)
+    log_err = sum(abs(x) for x in logs) * 0.5 + sum(abs(x) for x in seed_logs)
+
+    term = total = 1.0
+    comp = 0.0
+    weighted = 1.0
+    scale = 0
+    for k in range(k_min, k_max):
+        r_num, r_den = _term_ratio(k, alphas, betas)
+        term *= r_num / r_den
+        if abs(term) > 2.0 ** _RESCALE_BITS:
+            term = math.ldexp(term, -_RESCALE_BITS)
+            total = math.ldexp(total, -_RESCALE_BITS)
+            comp = math.ldexp(comp, -_RESCALE_BITS)
+            weighted = math.ldexp(weighted, -_RESCALE_BITS)
+            scale += _RESCALE_BITS
+        t = total + term
+        if abs(total) >= abs(term):
+            comp += (total - t) + term
+        else:
+            comp += (term - t) + total
+        total = t
+        weighted += abs(term) * (2 * (k + 1 - k_min) + 1)
+    total += comp
+
+    log_mag += scale * math.log(2.0)
+    if k_min % 2:
+        total = -total
+    unit = math.exp(log_mag)
+    error = unit * _EPS * (weighted + abs(total) * (1.0 + log_err))
+    if total == 0.0:
+        return 0.0, error
+    value = math.copysign(math.exp(log_mag + math.log(abs(total))), total)
+    return value, error
 
 
 def triangle_coefficient(a, b, c):
     """
     Compute the triangle coefficient Δ(a,b,c).
-    
-    Returns 0 if triangle inequality violated, otherwise:
+
+    Returns 0 if triangle inequality or parity violated, otherwise:
     Δ(a,b,c) = sqrt[ (a+b-c)! (a-b+c)! (-a+b+c)! / (a+b+c+1)! ]
+
+    The factorials are exact integers from the shared ``factorial_store``;
+    SymPy is only used for the returned square root.
     """
-    # Convert to rationals
-    a, b, c = sp.Rational(a), sp.Rational(b), sp.Rational(c)
-    
-    # Check triangle inequality
-    if a + b < c or a + c < b or b + c < a:
-        return 0
-    if a < 0 or b < 0 or c < 0:
+    from sympy import Rational, sqrt
+
+    a, b, c = _to_doubled(a), _to_doubled(b), _to_doubled(c)
+    if not _triangle_admissible(a, b, c):
         return 0
-    
-    # Compute Δ
-    num = factorial(a + b - c) * factorial(a - b + c) * factorial(-a + b + c)
-    den = factorial(a + b + c + 1)
-    return sqrt(num / den)
+    num = (store.factorial((a + b - c) // 2) * store.factorial((a - b + c) // 2)
+           * store.factorial((-a + b + c) // 2))
+    den = store.factorial((a + b + c) // 2 + 1)
+    return sqrt(Rational(num, den))
+
+
+def closed_form_3nj_exact(j1, j2=None, j3=None, j4=None, j5=None, j6=None):
+    """
+    Exact Wigner 6j symbol as a ``Surd`` (``sign * sqrt(p/q) * r``).
+
+    Pure integer arithmetic on doubled spins; no SymPy objects are created.
+    """
+    two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+    return _sixj_exact_doubled(two_js)
 
 
-def closed_form_3nj(j1, j2, j3, j4, j5, j6):
+def closed_form_3nj_float(j1, j2=None, j3=None, j4=None, j5=None, j6=None, return_error=False):
+    """
+    Wigner 6j symbol as a Python float (double precision).
+
+    Uses the same triangle checks and Racah bounds as ``closed_form_3nj``
+    but log-factorial scaling and the 4F3 term ratio instead of exact
+    arithmetic.  With ``return_error=True`` returns ``(value, error)``,
+    ``error`` being an estimate of the absolute rounding error.
+    """
+    two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+    value, error = _sixj_float_doubled(two_js)
+    if return_error:
+        return value, error
+    return value
+
+
+def closed_form_3nj(j1, j2=None, j3=None, j4=None, j5=None, j6=None, mode="symbolic", dps=15):
     """
     Compute Wigner 6j symbol using 4F3 hypergeometric representation.
-    
+
     6j symbol: { j1  j2  j3 }
                { j4  j5  j6 }
-    
+
     Uses Racah's formula as a single sum (4F3-like structure).
+
+    mode="symbolic" (default) returns a simplified SymPy expression,
+    mode="exact" returns the underlying ``Surd`` and mode="prime" returns
+    the same ``Surd`` computed with prime-exponent factorials, an
+    independent check that is about 20 times slower than mode="exact" for
+    2j in the thousands (see ``project.prime_factorial``).  mode="float"
+    returns a double-precision float (see ``closed_form_3nj_float``) and
+    mode="mpmath" an mpmath ``mpf`` correct to ``dps`` digits (see
+    ``project.su2_3nj_mpmath``).  mode="table" looks the float value up in
+    the precomputed table named by ``SU2_3NJ_TABLE`` (see
+    ``project.sixj_table``).
+
+    The spins may be given as one ``Spin6`` of doubled spins instead
+    (``closed_form_3nj(Spin6(2, 2, 2, 2, 2, 2), mode="float")``), which
+    skips their conversion.
     """
-    # Convert to rationals
-    j1, j2, j3, j4, j5, j6 = map(sp.Rational, (j1, j2, j3, j4, j5, j6))
-    
-    # Compute triangle coefficients
-    delta1 = triangle_coefficient(j1, j2, j3)
-    delta2 = triangle_coefficient(j1, j5, j6)
-    delta3 = triangle_coefficient(j4, j2, j6)
-    delta4 = triangle_coefficient(j4, j5, j3)
-    
-    if delta1 == 0 or delta2 == 0 or delta3 == 0 or delta4 == 0:
-        return Integer(0)
-    
-    prefactor = delta1 * delta2 * delta3 * delta4
-    
-    # Racah sum bounds
-    k_min = max(j1 + j2 + j3, j1 + j5 + j6, j4 + j2 + j6, j4 + j5 + j3)
-    k_max = min(j1 + j2 + j4 + j5, j2 + j3 + j5 + j6, j1 + j3 + j4 + j6)
-    
-    # If bounds are invalid, return 0
-    if k_min > k_max:
-        return Integer(0)
-    
-    # Compute the Racah sum
-    racah_sum = 0
-    k = k_min
-    while k <= k_max:
-        sign = (-1) ** k
-        numerator = factorial(k + 1)
-        denominator = (
-            factorial(k - j1 - j2 - j3) *
-            factorial(k - j1 - j5 - j6) *
-            factorial(k - j4 - j2 - j6) *
-            factorial(k - j4 - j5 - j3) *
-            factorial(j1 + j2 + j4 + j5 - k) *
-            factorial(j2 + j3 + j5 + j6 - k) *
-            factorial(j1 + j3 + j4 + j6 - k)
-        )
-        term = sign * numerator / denominator
-        racah_sum += term
-        k += 1
-    
-    result = prefactor * racah_sum
-    
-    # Simplify to get exact rational result
-    return simplify(result)
+    if mode == "table":
+        from project.sixj_table import closed_form_3nj_table
+        return closed_form_3nj_table(j1, j2, j3, j4, j5, j6)
+    if mode == "float":
+        return closed_form_3nj_float(j1, j2, j3, j4, j5, j6)
+    if mode == "mpmath":
+        from project.su2_3nj_mpmath import closed_form_3nj_mp
+        return closed_form_3nj_mp(j1, j2, j3, j4, j5, j6, dps=dps)
+    if mode == "prime":
+        from project.prime_factorial import closed_form_3nj_prime
+        return closed_form_3nj_prime(j1, j2, j3, j4, j5, j6)
+    value = closed_form_3nj_exact(j1, j2, j3, j4, j5, j6)
+    if mode == "exact":
+        return value
+    if mode == "symbolic":
+        return value.to_sympy()
+    raise ValueError(f"unknown mode {mode!r}")
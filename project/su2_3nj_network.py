@@ -0,0 +1,376 @@
+# project/su2_3nj_network.py
+
+"""
+General 3nj symbols as contracted networks of 6j symbols.
+
+Every recoupling graph reduces (by the Yutsis rules) to a sum over internal
+spins of products of 6j symbols, dimension factors (2x+1) and a phase.  A
+``SixJNetwork`` records that reduced form by name:
+
+    SixJNetwork(
+        externals=("j1", ..., "j9"),                 # argument order
+        factors=(("j1", "j4", "j7", "j8", "j9", "x"), ...),
+        weights=("x",),                              # (2x+1) factors
+        phase=(("x", 2),),                           # (-1)^(2x)
+    )
+
+Evaluating a network is a tensor contraction: each 6j factor becomes a table
+over the ranges of the internal spins it contains, and the internal spins
+are summed out one at a time.  ``plan_contraction`` picks the elimination
+order with the fewest multiply-adds (exhaustively for up to
+``_EXHAUSTIVE_LIMIT`` internal spins, greedily beyond), and all 6j values
+needed by all factors are deduplicated by their symmetry-canonical form
+before any is computed, so shared subexpressions are evaluated once.
+
+Named topologies are the 9j and the 3nj symbols of the first kind (the
+n-cycle family: 12j and 15j of the first kind, and so on), in the
+convention of Varshalovich et al., "Quantum Theory of Angular Momentum",
+section 10.12:
+
+    {j1 .. jn; l1 .. ln; k1 .. kn} = sum_x (-1)^(R + (n-1) x) (2x+1)
+        {j1 k1 x; k2 j2 l1} {j2 k2 x; k3 j3 l2} ... {jn kn x; j1 k1 ln},
+
+with R = sum_i (j_i + l_i + k_i).
+"""
+
+from fractions import Fraction
+from itertools import permutations, product
+from math import prod
+from typing import NamedTuple
+
+import numpy as np
+
+from project.sixj_cache import canonical_6j
+from project.su2_3nj_batch import closed_form_3nj_batch
+from project.su2_3nj_closed_form import Surd, _ZERO, _sixj_exact_doubled, _to_doubled
+from project.su2_9j_closed_form import _radicand_mul
+
+# positions of the four triads of a 6j {a b c; d e f}
+_TRIADS = ((0, 1, 2), (0, 4, 5), (3, 1, 5), (3, 4, 2))
+
+# search all elimination orders up to this many internal spins
+_EXHAUSTIVE_LIMIT = 7
+
+
+class SixJNetwork(NamedTuple):
+    """
+    A 3nj symbol reduced to 6j symbols; see the module docstring.
+
+    ``factors`` are 6-tuples of spin names, each either in ``externals`` or
+    an internal (summed) spin.  ``phase`` is a tuple of ``(name, c)`` pairs
+    for the overall sign (-1)^(sum c * j).
+    """
+    externals: tuple
+    factors: tuple
+    weights: tuple = ()
+    phase: tuple = ()
+
+    @property
+    def internals(self):
+        """Internal spin names, in order of first appearance."""
+        seen = dict.fromkeys(name for f in self.factors for name in f)
+        return tuple(name for name in seen if name not in self.externals)
+
+
+def first_kind_network(n):
+    """3nj symbol of the first kind with n >= 3 columns (3n arguments)."""
+    if n < 3:
+        raise ValueError("3nj symbols of the first kind need n >= 3")
+    j = [f"j{i}" for i in range(1, n + 1)]
+    l = [f"l{i}" for i in range(1, n + 1)]
+    k = [f"k{i}" for i in range(1, n + 1)]
+    factors = tuple(
+        (j[i], k[i], "x", k[i + 1], j[i + 1], l[i]) for i in range(n - 1)
+    ) + ((j[-1], k[-1], "x", j[0], k[0], l[-1]),)
+    return SixJNetwork(
+        externals=tuple(j + l + k),
+        factors=factors,
+        weights=("x",),
+        phase=tuple((name, 1) for name in j + l + k) + (("x", n - 1),),
+    )
+
+
+NINE_J = SixJNetwork(
+    externals=tuple(f"j{i}" for i in range(1, 10)),
+    factors=(
+        ("j1", "j4", "j7", "j8", "j9", "x"),
+        ("j2", "j5", "j8", "j4", "x", "j6"),
+        ("j3", "j6", "j9", "x", "j1", "j2"),
+    ),
+    weights=("x",),
+    phase=(("x", 2),),
+)
+
+NAMED_NETWORKS = {
+    "9j": NINE_J,
+    "12j": first_kind_network(4),
+    "12j-I": first_kind_network(4),
+    "15j": first_kind_network(5),
+    "15j-I": first_kind_network(5),
+}
+
+
+def _interval(name, values, ranges):
+    """Known ``(lo, hi)`` of a doubled spin, or None."""
+    if name in values:
+        return values[name], values[name]
+    return ranges.get(name)
+
+
+def internal_ranges(network, values):
+    """
+    Ranges ``{name: (lo, hi)}`` of the doubled internal spins, step 2,
+    inferred from the triangle conditions; an empty range has lo > hi.
+    """
+    ranges = {}
+    changed = True
+    while changed:
+        changed = False
+        for spins in network.factors:
+            for triad in _TRIADS:
+                names = [spins[i] for i in triad]
+                for v in names:
+                    if v in values:
+                        continue
+                    others = list(names)
+                    others.remove(v)
+                    (a_lo, a_hi), (b_lo, b_hi) = (
+                        _interval(o, values, ranges) or (None, None) for o in others
+                    )
+                    if a_lo is None or b_lo is None:
+                        continue
+                    lo = max(0, a_lo - b_hi, b_lo - a_hi)
+                    if (lo - a_lo - b_lo) % 2:
+                        lo += 1
+                    hi = a_hi + b_hi
+                    old = ranges.get(v)
+                    if old is not None:
+                        lo, hi = max(lo, old[0]), min(hi, old[1])
+                        if (lo - old[0]) % 2:
+                            lo += 1
+                    if old != (lo, hi):
+                        ranges[v] = (lo, hi)
+                        changed = True
+    missing = [v for v in network.internals if v not in ranges]
+    if missing:
+        raise ValueError(f"cannot bound internal spins {missing} from the network")
+    return ranges
+
+
+class ContractionPlan(NamedTuple):
+    """Elimination order of the internal spins and its multiply-add count."""
+    order: tuple
+    cost: int
+
+
+def _order_cost(scopes, sizes, order):
+    """Multiply-adds of eliminating ``order`` from factors with ``scopes``."""
+    scopes = [frozenset(s) for s in scopes]
+    cost = 0
+    for v in order:
+        touching = [s for s in scopes if v in s]
+        union = frozenset().union(*touching)
+        cost += prod(sizes[u] for u in union) * max(len(touching), 1)
+        scopes = [s for s in scopes if v not in s] + [union - {v}]
+    return cost
+
+
+def plan_contraction(network, sizes):
+    """
+    Cheapest elimination order for internal spins of the given range sizes.
+
+    Orders are searched exhaustively for up to ``_EXHAUSTIVE_LIMIT``
+    internal spins; beyond that the spin whose elimination creates the
+    smallest intermediate table is removed first.
+    """
+    internals = network.internals
+    scopes = [
+        {name for name in f if name in sizes} for f in network.factors
+    ] + [{w} for w in network.weights]
+    if len(internals) <= _EXHAUSTIVE_LIMIT:
+        best = min(permutations(internals), key=lambda o: _order_cost(scopes, sizes, o))
+        return ContractionPlan(tuple(best), _order_cost(scopes, sizes, best))
+    order = []
+    remaining = set(internals)
+    current = [frozenset(s) for s in scopes]
+    while remaining:
+        def created(v):
+            return prod(sizes[u] for u in frozenset().union(*(s for s in current if v in s)))
+        v = min(sorted(remaining), key=created)
+        union = frozenset().union(*(s for s in current if v in s))
+        current = [s for s in current if v not in s] + [union - {v}]
+        order.append(v)
+        remaining.discard(v)
+    return ContractionPlan(tuple(order), _order_cost(scopes, sizes, order))
+
+
+class _SurdSum:
+    """Exact sum of surds, kept as ``{(p, q): Fraction}`` (value sum r sqrt(p/q))."""
+
+    __slots__ = ("terms",)
+
+    def __init__(self, terms=None):
+        self.terms = terms or {}
+
+    @classmethod
+    def from_surd(cls, s):
+        if s.sign == 0:
+            return cls()
+        return cls({(s.p, s.q): s.sign * s.r})
+
+    def __add__(self, other):
+        terms = dict(self.terms)
+        for key, r in other.terms.items():
+            total = terms.get(key, 0) + r
+            if total:
+                terms[key] = total
+            else:
+                terms.pop(key, None)
+        return _SurdSum(terms)
+
+    def __mul__(self, other):
+        out = _SurdSum()
+        for (p1, q1), r1 in self.terms.items():
+            for (p2, q2), r2 in other.terms.items():
+                p, q, f = _radicand_mul(p1, q1, p2, q2)
+                out = out + _SurdSum({(p, q): r1 * r2 * f})
+        return out
+
+    def to_surd(self):
+        if not self.terms:
+            return _ZERO
+        if len(self.terms) > 1:
+            raise ArithmeticError("3nj network did not reduce to a single surd")
+        ((p, q), r), = self.terms.items()
+        return Surd.canonical(1 if r > 0 else -1, p, q, abs(r))
+
+
+def _phase_sign(coefficient_twos):
+    """(-1)^(sum c * j) from the doubled sum  sum c * 2j  (must be even)."""
+    if coefficient_twos % 2:
+        raise ValueError("network phase is not an integer power of -1")
+    return -1 if (coefficient_twos // 2) % 2 else 1
+
+
+def _evaluate_network(network, two_values, exact):
+    """Contract a network at doubled external spins ``two_values``."""
+    values = dict(zip(network.externals, two_values))
+    ranges = internal_ranges(network, values)
+    if any(lo > hi for lo, hi in ranges.values()):
+        return _ZERO if exact else 0.0
+    grids = {v: np.arange(lo, hi + 1, 2, dtype=np.int64) for v, (lo, hi) in ranges.items()}
+    sizes = {v: len(g) for v, g in grids.items()}
+    plan = plan_contraction(network, sizes)
+
+    # every 6j row needed by every factor, deduplicated by canonical form
+    factor_rows = []
+    canon = {}
+    for spins in network.factors:
+        scope = tuple(dict.fromkeys(n for n in spins if n in grids))
+        keys = []
+        for point in product(*(grids[v].tolist() for v in scope)):
+            env = dict(zip(scope, point))
+            row = tuple(env[n] if n in env else values[n] for n in spins)
+            key = canonical_6j(row)
+            if key is not None:
+                canon.setdefault(key, len(canon))
+            keys.append(key)
+        factor_rows.append((scope, keys))
+    unique = list(canon)
+    if exact:
+        evaluated = [_SurdSum.from_surd(_sixj_exact_doubled(key)) for key in unique]
+        zero = _SurdSum()
+        evaluated.append(zero)
+        dtype = object
+    else:
+        evaluated = list(closed_form_3nj_batch(np.array(unique, dtype=np.int64).reshape(-1, 6)))
+        evaluated.append(0.0)
+        dtype = np.float64
+    lookup = np.empty(len(evaluated), dtype=dtype)
+    lookup[:] = evaluated
+
+    tables = []
+    for scope, keys in factor_rows:
+        index = np.array([len(unique) if k is None else canon[k] for k in keys], dtype=np.int64)
+        tables.append((scope, lookup[index].reshape([sizes[v] for v in scope])))
+
+    # dimension weights and the x-dependent part of the phase as 1-d tables
+    for v, g in grids.items():
+        weight = np.ones(len(g))
+        if v in network.weights:
+            weight *= g + 1
+        c = sum(c for name, c in network.phase if name == v)
+        weight[(c * (g - g[0]) // 2) % 2 == 1] *= -1
+        if exact:
+            weight = np.array([_SurdSum({(1, 1): Fraction(int(w))}) for w in weight], dtype=object)
+        tables.append(((v,), weight))
+
+    for v in plan.order:
+        touching = [t for t in tables if v in t[0]]
+        tables = [t for t in tables if v not in t[0]]
+        scope = tuple(dict.fromkeys(n for s, _ in touching for n in s))
+        result = None
+        for s, table in touching:
+            aligned = np.moveaxis(
+                table.reshape(table.shape + (1,) * (len(scope) - len(s))),
+                list(range(len(s))), [scope.index(n) for n in s],
+            )
+            result = aligned if result is None else result * aligned
+        axis = scope.index(v)
+        tables.append((scope[:axis] + scope[axis + 1:], result.sum(axis=axis)))
+
+    if exact:
+        total = _SurdSum({(1, 1): Fraction(1)})
+        for _, table in tables:
+            # object-array reductions return bare elements, not 0-d arrays
+            total = total * (table.item() if isinstance(table, np.ndarray) else table)
+        if not total.terms:
+            return _ZERO
+    else:
+        total = 1.0
+        for _, table in tables:
+            total *= float(table)
+        if total == 0.0:
+            return 0.0
+    # constant phase, with each internal spin at the start of its range
+    sign = _phase_sign(sum(
+        c * (values[name] if name in values else grids[name][0])
+        for name, c in network.phase
+    ))
+    if exact:
+        return (total * _SurdSum({(1, 1): Fraction(sign)})).to_surd()
+    return sign * total
+
+
+def closed_form_3nj_network(topology, *spins, mode="symbolic"):
+    """
+    Evaluate a 3nj symbol given as a ``SixJNetwork`` or a name in
+    ``NAMED_NETWORKS`` ("9j", "12j", "15j", ...), with the external spins in
+    the network's argument order.
+
+    ``mode`` is "symbolic" (SymPy expression, the default), "exact" (a
+    ``Surd``) or "float".
+    """
+    network = NAMED_NETWORKS[topology] if isinstance(topology, str) else topology
+    if len(spins) != len(network.externals):
+        raise ValueError(
+            f"expected {len(network.externals)} spins, got {len(spins)}"
+        )
+    two_values = tuple(_to_doubled(j) for j in spins)
+    if mode == "float":
+        return _evaluate_network(network, two_values, exact=False)
+    if mode == "exact":
+        return _evaluate_network(network, two_values, exact=True)
+    if mode == "symbolic":
+        return _evaluate_network(network, two_values, exact=True).to_sympy()
+    raise ValueError(f"unknown mode {mode!r}")
+
+
+def closed_form_12j(*spins, mode="symbolic"):
+    """12j symbol of the first kind {j1 j2 j3 j4; l1 l2 l3 l4; k1 k2 k3 k4}."""
+    return closed_form_3nj_network("12j", *spins, mode=mode)
+
+
+def closed_form_15j(*spins, mode="symbolic"):
+    """15j symbol of the first kind {j1 .. j5; l1 .. l5; k1 .. k5}."""
+    return closed_form_3nj_network("15j", *spins, mode=mode)
@@ -0,0 +1,184 @@
+# project/su2_3nj_reference.py
+
+"""
+Independent exact reference engine for Wigner 6j symbols.
+
+Cross-checks and speed comparisons used to import ``generate_3nj`` and
+``recursion_3nj`` from a sibling checkout of the generating-functional
+project.  This module replaces them with an implementation that shares no
+arithmetic with the Racah-sum closed form: whole families
+f(x) = {j1 j2 x; j4 j5 j6} are computed exactly from the Schulten-Gordon
+three-term recursion (see ``project.sixj_recursion`` for E and F)
+
+    x E(x+1) f(x+1) + F(x) f(x) + (x+1) E(x) f(x-1) = 0.
+
+E(x) is a square root, but writing f(x) = v(x) / R(x) with
+R(x) = E(x+1) E(x+2) ... E(x_max) turns the recursion into
+
+    v(x-1) = -[x E(x+1)^2 v(x+1) + F(x) v(x)] / (x+1),   v(x_max) = 1,
+
+which only involves the rational squares E^2 and F and is run with
+Fractions from x_max downwards (no cancellation, x+1 never vanishes).  The
+scale comes from the orthogonality relation
+
+    sum_x (2x+1)(2 j6+1) f(x)^2 = 1
+
+and the sign from the convention sgn f(x_max) = (-1)^(j1+j2+j4+j5).  Each
+f(x)^2 is thus an exact rational; its square root is reduced to a ``Surd``
+by trial division with the primes up to the largest triad sum + 1, the only
+primes that can occur to an odd power (the remaining cofactor is checked to
+be a perfect square).
+
+The stable entry point is ``reference_3nj``, with the same spin arguments
+and ``mode`` values as ``closed_form_3nj``; ``reference_6j_family`` returns
+a whole family.
+"""
+
+import math
+from fractions import Fraction
+from functools import lru_cache
+
+from project.su2_3nj_closed_form import (
+    Surd,
+    _ZERO,
+    _doubled_args,
+    _to_doubled,
+    _triangle_admissible,
+)
+
+
+def _primes_upto(n):
+    """Primes <= n (sieve of Eratosthenes)."""
+    if n < 2:
+        return []
+    sieve = bytearray([1]) * (n + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(n) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytearray(len(range(i * i, n + 1, i)))
+    return [i for i, is_prime in enumerate(sieve) if is_prime]
+
+
+def _square_root_parts(n, primes):
+    """
+    Write the positive integer n as ``outside**2 * kernel`` with the kernel
+    squarefree over ``primes``; raises ArithmeticError if the cofactor left
+    after removing those primes is not a perfect square.
+    """
+    outside = kernel = 1
+    for prime in primes:
+        if n % prime:
+            continue
+        e = 0
+        while n % prime == 0:
+            n //= prime
+            e += 1
+        outside *= prime ** (e // 2)
+        if e % 2:
+            kernel *= prime
+    root = math.isqrt(n)
+    if root * root != n:
+        raise ArithmeticError("6j square has an unexpected squarefree factor")
+    return outside * root, kernel
+
+
+def _surd_from_square(sign, square, primes):
+    """The ``Surd`` ``sign * sqrt(square)`` for a positive Fraction ``square``."""
+    num_out, p = _square_root_parts(square.numerator, primes)
+    den_out, q = _square_root_parts(square.denominator, primes)
+    return Surd.canonical(sign, p, q, Fraction(num_out, den_out))
+
+
+@lru_cache(maxsize=256)
+def _reference_family_doubled(t1, t2, t4, t5, t6):
+    """
+    Exact values {j1 j2 x; j4 j5 j6} from doubled spins, as a dict mapping
+    every admissible 2x to a ``Surd``.
+    """
+    if (t1 + t2) % 2 != (t4 + t5) % 2:
+        return {}
+    lo = max(abs(t1 - t2), abs(t4 - t5))
+    hi = min(t1 + t2, t4 + t5)
+    two_x = range(lo, hi + 1, 2)
+    if not (_triangle_admissible(t1, t5, t6) and _triangle_admissible(t4, t2, t6)):
+        return {t: _ZERO for t in two_x}
+
+    j1, j2, j4, j5, j6 = (Fraction(t, 2) for t in (t1, t2, t4, t5, t6))
+
+    def J(y):
+        return y * (y + 1)
+
+    def E2(y):
+        return ((y * y - (j1 - j2) ** 2) * ((j1 + j2 + 1) ** 2 - y * y)
+                * (y * y - (j4 - j5) ** 2) * ((j4 + j5 + 1) ** 2 - y * y))
+
+    def F(y):
+        return (2 * y + 1) * (
+            J(y) * (-J(y) + J(j1) + J(j2) - 2 * J(j6))
+            + J(j4) * (J(y) + J(j1) - J(j2))
+            + J(j5) * (J(y) - J(j1) + J(j2))
+        )
+
+    # v(x) and R(x)^2 from x_max downwards; f(x)^2 = v(x)^2 / R(x)^2 / norm
+    xs = [Fraction(t, 2) for t in two_x]
+    v = [Fraction(0)] * len(xs)
+    r2 = [Fraction(1)] * len(xs)
+    v[-1] = Fraction(1)
+    for i in range(len(xs) - 1, 0, -1):
+        x = xs[i]
+        above = x * E2(x + 1) * v[i + 1] if i + 1 < len(xs) else 0
+        v[i - 1] = -(above + F(x) * v[i]) / (x + 1)
+        r2[i - 1] = r2[i] * E2(x)
+    weights = [v[i] * v[i] / r2[i] for i in range(len(xs))]
+    norm = (2 * j6 + 1) * sum((2 * x + 1) * w for x, w in zip(xs, weights))
+
+    sign = -1 if (t1 + t2 + t4 + t5) // 2 % 2 else 1
+    primes = _primes_upto(max(t1 + t2 + hi, t4 + t5 + hi, t1 + t5 + t6, t4 + t2 + t6) // 2 + 1)
+    family = {}
+    for t, vi, w in zip(two_x, v, weights):
+        if vi == 0:
+            family[t] = _ZERO
+        else:
+            family[t] = _surd_from_square(sign if vi > 0 else -sign, w / norm, primes)
+    return family
+
+
+def reference_6j_family(j1, j2, j4, j5, j6, mode="exact"):
+    """
+    All 6j symbols {j1 j2 x; j4 j5 j6} over the admissible range of x, as a
+    list of ``(x, value)`` pairs with x a Fraction.
+
+    ``mode`` is "exact" (``Surd`` values), "symbolic" (SymPy) or "float".
+    """
+    t1, t2, t4, t5, t6 = (_to_doubled(j) for j in (j1, j2, j4, j5, j6))
+    family = _reference_family_doubled(t1, t2, t4, t5, t6)
+    return [(Fraction(t, 2), _convert(value, mode)) for t, value in family.items()]
+
+
+def _convert(value, mode):
+    if mode == "exact":
+        return value
+    if mode == "symbolic":
+        return value.to_sympy()
+    if mode == "float":
+        return float(value)
+    raise ValueError(f"unknown mode {mode!r}")
+
+
+def reference_3nj(j1, j2=None, j3=None, j4=None, j5=None, j6=None, mode="symbolic"):
+    """
+    Reference value of the 6j symbol {j1 j2 j3; j4 j5 j6}.
+
+    Computed from the exact recursion over the j3 family (cached, so
+    neighbouring values of j3 are free), independently of the Racah sum in
+    ``project.su2_3nj_closed_form``.  ``mode`` is "symbolic" (default,
+    SymPy), "exact" (``Surd``) or "float".
+    """
+    two_js = _doubled_args(j1, j2, j3, j4, j5, j6)
+    if not all(_triangle_admissible(*triad) for triad in (
+        two_js[:3], (two_js[0], two_js[4], two_js[5]),
+        (two_js[3], two_js[1], two_js[5]), (two_js[3], two_js[4], two_js[2]),
+    )):
+        return _convert(_ZERO, mode)
+    t1, t2, t3, t4, t5, t6 = two_js
+    return _convert(_reference_family_doubled(t1, t2, t4, t5, t6)[t3], mode)
@@ -0,0 +1,174 @@
+# project/su2_9j_closed_form.py
+
+"""
+Wigner 9j symbols as a single sum over products of three 6j symbols:
+
+    {j1 j2 j3}
+    {j4 j5 j6} = sum_x (-1)^(2x) (2x+1) {j1 j4 j7} {j2 j5 j8} {j3 j6 j9}
+    {j7 j8 j9}                          {j8 j9 x } {j4 x  j6} {x  j1 j2}
+
+Using the 6j symmetries, each factor is rewritten with x in the third slot,
+
+    {j8 j4 x; j1 j9 j7},  {j4 j8 x; j2 j6 j5},  {j1 j9 x; j6 j2 j3},
+
+so the float path gets each factor for every x at once from the
+Schulten-Gordon family recursion (``project.sixj_recursion``).  The exact
+path multiplies exact ``Surd`` values; the radicand of a product does not
+depend on x (each triad containing x occurs in two of the factors), so the
+sum stays a single ``Surd``.
+"""
+
+from fractions import Fraction
+from math import gcd
+
+import numpy as np
+
+from project.sixj_recursion import _sixj_family_doubled
+from project.su2_3nj_batch import closed_form_3nj_batch
+from project.su2_3nj_closed_form import (
+    Surd,
+    _ZERO,
+    _sixj_exact_doubled,
+    _to_doubled,
+    _triangle_admissible,
+)
+
+
+def _factor_spins(two_js):
+    """The fixed five doubled spins of each 6j factor, in family order."""
+    t1, t2, t3, t4, t5, t6, t7, t8, t9 = two_js
+    return (t8, t4, t1, t9, t7), (t4, t8, t2, t6, t5), (t1, t9, t6, t2, t3)
+
+
+def _ninej_admissible(two_js):
+    """Triangle conditions of the three rows and three columns."""
+    t = two_js
+    return all(_triangle_admissible(t[a], t[b], t[c]) for a, b, c in (
+        (0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    ))
+
+
+def _x_range(two_js):
+    """Doubled values of the summation variable allowed by all three factors."""
+    t1, t2, t3, t4, t5, t6, t7, t8, t9 = two_js
+    lo = max(abs(t1 - t9), abs(t4 - t8), abs(t2 - t6))
+    hi = min(t1 + t9, t4 + t8, t2 + t6)
+    return np.arange(lo, hi + 1, 2, dtype=np.int64)
+
+
+def _radicand_mul(p1, q1, p2, q2):
+    """
+    sqrt(p1/q1) * sqrt(p2/q2) = f * sqrt(p/q) for squarefree coprime
+    radicands; returns ``(p, q, f)`` with p, q squarefree and coprime.
+    """
+    g = gcd(p1, p2)
+    p = (p1 // g) * (p2 // g)
+    f = Fraction(g)
+    g = gcd(q1, q2)
+    q = (q1 // g) * (q2 // g)
+    f /= g
+    g = gcd(p, q)
+    return p // g, q // g, f
+
+
+def _surd_mul(a, b):
+    """Product of two ``Surd`` values, kept in canonical form."""
+    if a.sign == 0 or b.sign == 0:
+        return _ZERO
+    p, q, f = _radicand_mul(a.p, a.q, b.p, b.q)
+    return Surd.canonical(a.sign * b.sign, p, q, a.r * b.r * f)
+
+
+def _ninej_exact_doubled(two_js):
+    """Exact 9j symbol from doubled spins, as a ``Surd``."""
+    if not _ninej_admissible(two_js):
+        return _ZERO
+    factors = _factor_spins(two_js)
+    radicand = None
+    total = Fraction(0)
+    for two_x in _x_range(two_js).tolist():
+        term = Surd(1, 1, 1, Fraction(two_x + 1))
+        for s1, s2, s4, s5, s6 in factors:
+            term = _surd_mul(term, _sixj_exact_doubled((s1, s2, two_x, s4, s5, s6)))
+        if term.sign == 0:
+            continue
+        if radicand is None:
+            radicand = (term.p, term.q)
+        elif radicand != (term.p, term.q):
+            raise ArithmeticError(f"inconsistent radicands in 9j sum for {two_js}")
+        sign = -term.sign if two_x % 2 else term.sign
+        total += sign * term.r
+    if total == 0:
+        return _ZERO
+    return Surd.canonical(1 if total > 0 else -1, *radicand, abs(total))
+
+
+def _ninej_float_doubled(two_js):
+    """9j symbol from doubled spins as a float, via 6j family recursions."""
+    if not _ninej_admissible(two_js):
+        return 0.0
+    two_x = _x_range(two_js)
+    if len(two_x) == 0:
+        return 0.0
+    product = (two_x + 1).astype(np.float64)
+    product[two_x % 2 == 1] *= -1
+    for spins in _factor_spins(two_js):
+        family_x, values = _sixj_family_doubled(*spins)
+        start = (two_x[0] - family_x[0]) // 2
+        product *= values[start:start + len(two_x)]
+    return float(np.sum(product))
+
+
+def closed_form_9j_batch(two_js):
+    """
+    Wigner 9j symbols for an (N, 9) array of doubled spins, as float64.
+
+    Row ``(2j1, ..., 2j9)`` gives the 9j with rows (j1 j2 j3), (j4 j5 j6),
+    (j7 j8 j9); inadmissible rows evaluate to 0.  All 6j factors of all rows
+    are evaluated in one call to ``closed_form_3nj_batch`` and reduced per
+    row, which is fastest for many small symbols; use ``closed_form_9j`` for
+    large spins, where the family recursion is more accurate.
+    """
+    two = np.asarray(two_js)
+    if two.ndim != 2 or two.shape[1] != 9:
+        raise ValueError(f"expected an (N, 9) array of doubled spins, got shape {two.shape}")
+    if not np.issubdtype(two.dtype, np.integer):
+        raise ValueError("doubled spins must be integers")
+    two = two.astype(np.int64, copy=False)
+    t1, t2, t3, t4, t5, t6, t7, t8, t9 = two.T
+    lo = np.maximum.reduce([np.abs(t1 - t9), np.abs(t4 - t8), np.abs(t2 - t6)])
+    hi = np.minimum.reduce([t1 + t9, t4 + t8, t2 + t6])
+    counts = np.maximum((hi - lo) // 2 + 1, 0)
+    values = np.zeros(len(two))
+    if counts.sum() == 0:
+        return values
+    # one entry per (row, x); inadmissible 6j rows evaluate to 0
+    row = np.repeat(np.arange(len(two)), counts)
+    offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    x = lo[row] + 2 * offset
+    t1, t2, t3, t4, t5, t6, t7, t8, t9 = two[row].T
+    sixj = closed_form_3nj_batch(np.concatenate([
+        np.stack([t8, t4, x, t1, t9, t7], axis=1),
+        np.stack([t4, t8, x, t2, t6, t5], axis=1),
+        np.stack([t1, t9, x, t6, t2, t3], axis=1),
+    ])).reshape(3, -1)
+    terms = np.where(x % 2 == 1, -1.0, 1.0) * (x + 1) * sixj.prod(axis=0)
+    np.add.at(values, row, terms)
+    return values
+
+
+def closed_form_9j(j1, j2, j3, j4, j5, j6, j7, j8, j9, mode="symbolic"):
+    """
+    Wigner 9j symbol {j1 j2 j3; j4 j5 j6; j7 j8 j9}.
+
+    ``mode`` is "symbolic" (SymPy expression, the default), "exact" (a
+    ``Surd``) or "float".
+    """
+    two_js = tuple(_to_doubled(j) for j in (j1, j2, j3, j4, j5, j6, j7, j8, j9))
+    if mode == "float":
+        return _ninej_float_doubled(two_js)
+    if mode == "exact":
+        return _ninej_exact_doubled(two_js)
+    if mode == "symbolic":
+        return _ninej_exact_doubled(two_js).to_sympy()
+    raise ValueError(f"unknown mode {mode!r}")
@@ -0,0 +1,193 @@
+# project/sweep.py
+
+"""
+Parallel sweeps over large sets of 6j symbols.
+
+``sweep`` evaluates a stream of doubled-spin tuples on a
+``concurrent.futures`` process pool.  Tuples are read lazily and packed into
+chunks of roughly equal estimated cost (the number of Racah terms, see
+``racah_terms``), so a chunk of a few large symbols takes about as long as
+a chunk of many small ones.  At most a few chunks per worker are in flight
+at a time; each idle worker takes the next chunk, costliest first within
+the look-ahead window, so no worker sits idle while another has a backlog.
+Results stream back either in input order or as chunks complete.
+
+Admissible tuples up to a spin bound come from ``admissible_6j`` (or
+``project.sixj_enumeration.AdmissibleSixJ``); tuples can also be read from
+a text file with ``read_tuples``.
+
+When ``project.instrumentation`` is enabled, or a ``Profile`` is passed,
+each worker records its own counters and cProfile statistics per chunk and
+sends them back with the values, so the parent sees the totals.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+import numpy as np
+
+from project.sixj_enumeration import AdmissibleSixJ
+from project.spin6 import iter_spin6
+from project.su2_3nj_batch import closed_form_3nj_batch
+from project.su2_3nj_closed_form import _racah_bounds, _sixj_exact_doubled, _to_doubled
+
+# chunks submitted per worker ahead of the results being consumed
+_IN_FLIGHT_PER_WORKER = 4
+
+
+def admissible_6j(max_two_j):
+    """
+    Yield every admissible doubled-spin 6j tuple with all 2j <= max_two_j,
+    in lexicographic order, as ``Spin6`` (see ``AdmissibleSixJ`` for
+    counts, ranks, canonical tuples and shards).
+    """
+    return iter(AdmissibleSixJ(max_two_j))
+
+
+def read_tuples(path, doubled=False):
+    """
+    Yield doubled-spin tuples from a text file with six spins per line,
+    separated by whitespace or commas ("3/2" style or doubled integers with
+    ``doubled=True``).  Blank lines and lines starting with "#" are skipped.
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            fields = line.replace(",", " ").split()
+            if len(fields) != 6:
+                raise ValueError(f"expected six spins per line, got {line!r}")
+            if doubled:
+                yield tuple(int(x) for x in fields)
+            else:
+                yield tuple(_to_doubled(x) for x in fields)
+
+
+def racah_terms(two_js):
+    """Number of terms in the Racah sum of a doubled-spin tuple (0 if zero)."""
+    bounds = _racah_bounds(two_js)
+    if bounds is None:
+        return 0
+    _, alphas, betas = bounds
+    return max(min(betas) - max(alphas) + 1, 0)
+
+
+def _evaluate_chunk(mode, dps, tuples):
+    """Worker: values of one chunk of doubled-spin tuples."""
+    if mode == "float":
+        return closed_form_3nj_batch(np.array(tuples, dtype=np.int64).reshape(-1, 6)).tolist()
+    if mode == "exact":
+        return [_sixj_exact_doubled(t) for t in tuples]
+    if mode == "prime":
+        from project.prime_factorial import _sixj_prime_doubled
+        return [_sixj_prime_doubled(t) for t in tuples]
+    if mode == "mpmath":
+        from project.su2_3nj_mpmath import _sixj_mp_doubled
+        return [_sixj_mp_doubled(t, dps) for t in tuples]
+    raise ValueError(f"unknown mode {mode!r}")
+
+
+def _evaluate_chunk_instrumented(mode, dps, tuples, profile):
+    """Worker: ``_evaluate_chunk`` plus its counters and cProfile statistics."""
+    from project import instrumentation
+    instrumentation.enable()
+    instrumentation.reset()
+    if profile:
+        values, raw = instrumentation.profile_call(_evaluate_chunk, mode, dps, tuples)
+    else:
+        values, raw = _evaluate_chunk(mode, dps, tuples), None
+    return values, instrumentation.counters(), raw
+
+
+def _chunks(tuples, chunk_cost, max_chunk):
+    """Pack tuples into lists of about ``chunk_cost`` Racah terms each."""
+    chunk, cost = [], 0
+    for t in tuples:
+        t = t if isinstance(t, tuple) else tuple(t)
+        chunk.append(t)
+        # every tuple costs at least one unit of bookkeeping
+        cost += racah_terms(t) + 1
+        if cost >= chunk_cost or len(chunk) >= max_chunk:
+            yield chunk, cost
+            chunk, cost = [], 0
+    if chunk:
+        yield chunk, cost
+
+
+def sweep(tuples, mode="float", workers=None, chunk_cost=1 << 16,
+          max_chunk=1 << 14, ordered=True, dps=15, profile=None):
+    """
+    Evaluate doubled-spin 6j tuples in parallel; yields ``(two_js, value)``.
+    ``tuples`` is an iterable of tuples (or ``Spin6``), or an (N, 6) or
+    structured ``Spin6`` array.
+
+    ``mode`` is "float" (batch evaluator), "exact" (``Surd``), "prime" or
+    "mpmath" (with ``dps``).  ``workers`` defaults to the CPU count; with
+    ``workers=1`` everything runs in this process.  Chunks hold about
+    ``chunk_cost`` Racah terms and at most ``max_chunk`` tuples.  With
+    ``ordered=False`` results are yielded chunk by chunk as they complete.
+    Worker cProfile statistics are added to ``profile`` (an
+    ``instrumentation.Profile``) when given.
+    """
+    if mode not in ("float", "exact", "prime", "mpmath"):
+        raise ValueError(f"unknown mode {mode!r}")
+    if isinstance(tuples, np.ndarray):
+        tuples = iter_spin6(tuples)
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(tuples, chunk_cost, max_chunk)
+    if workers == 1:
+        for chunk, _ in chunks:
+            yield from zip(chunk, _evaluate_chunk(mode, dps, chunk))
+        return
+
+    from project import instrumentation
+    instrumented = profile is not None or instrumentation.is_enabled()
+
+    def submit(pool, chunk):
+        if instrumented:
+            return pool.submit(_evaluate_chunk_instrumented, mode, dps, chunk, profile is not None)
+        return pool.submit(_evaluate_chunk, mode, dps, chunk)
+
+    def collect(future):
+        if not instrumented:
+            return future.result()
+        values, counters, raw = future.result()
+        if instrumentation.is_enabled():
+            instrumentation.merge(counters)
+        if profile is not None:
+            profile.add(raw)
+        return values
+
+    window = workers * _IN_FLIGHT_PER_WORKER
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {}   # future -> (sequence number, chunk)
+        done = {}      # sequence number -> (chunk, values), for ordered output
+        next_out = 0
+        sequence = 0
+        while True:
+            # refill the window, submitting the costliest chunks first
+            # (ordered output buffers finished chunks behind a slow one;
+            # stop reading ahead once that buffer is several windows deep)
+            room = min(window - len(pending), 4 * window - len(pending) - len(done))
+            batch = list(islice(chunks, max(room, 0)))
+            batch = [(sequence + i, chunk, cost) for i, (chunk, cost) in enumerate(batch)]
+            sequence += len(batch)
+            for seq, chunk, _ in sorted(batch, key=lambda b: -b[2]):
+                future = submit(pool, chunk)
+                pending[future] = (seq, chunk)
+            if not pending:
+                break
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                seq, chunk = pending.pop(future)
+                values = collect(future)
+                if ordered:
+                    done[seq] = (chunk, values)
+                else:
+                    yield from zip(chunk, values)
+            while next_out in done:
+                chunk, values = done.pop(next_out)
+                yield from zip(chunk, values)
+                next_out += 1
@@ -0,0 +1,329 @@
+# project/validation.py
+
+"""
+Exhaustive validation of the fast 6j backends against exact identities.
+
+Three checks run over every admissible symbol up to a spin bound:
+
+* ``symmetry``: all 144 tetrahedral and Regge symmetries.  The group is
+  generated here from two column swaps, a row swap and Regge's
+  transformation, independently of the Regge-array canonicalization in
+  ``project.sixj_cache``; each symmetry class within the bound is checked
+  once, from its lexicographically smallest member.
+* ``orthogonality``: for every (j1, j2, j4, j5)
+
+      sum_x (2x+1)(2 j6+1) {j1 j2 x; j4 j5 j6}{j1 j2 x; j4 j5 j6'} = delta(j6, j6').
+
+* ``biedenharn_elliott``: for all nine spins with {p q r; e a d} admissible,
+
+      sum_x (-1)^(S+x) (2x+1) {a b x; c d p}{c d x; e f q}{e f x; b a r}
+          = {p q r; e a d}{p q r; f b c},
+
+  S being the sum of the nine spins.  This check grows like the ninth power
+  of the bound and has its own, lower one.
+
+Values come from the batch evaluator (mode "float") or from the exact
+integer backends ("exact", "prime") converted to floats, and identities
+hold when ``|lhs - rhs| <= atol + rtol * scale``, with ``scale`` the sum of
+the magnitudes of the terms.  Work is split into chunks run on a process
+pool, and every failure is written to the ``log`` stream as one JSON line
+as soon as its chunk finishes.
+"""
+
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+import numpy as np
+
+from project.su2_3nj_batch import closed_form_3nj_batch
+from project.su2_3nj_closed_form import _sixj_exact_doubled
+from project.sweep import admissible_6j
+
+CHECKS = ("symmetry", "orthogonality", "biedenharn_elliott")
+
+# default bound for the Biedenharn-Elliott check
+BE_MAX_TWO_J = 6
+
+# work items per chunk for each check
+_CHUNK = {"symmetry": 1 << 11, "orthogonality": 1 << 8, "biedenharn_elliott": 1 << 11}
+
+# chunks submitted per worker ahead of the results being consumed
+_IN_FLIGHT_PER_WORKER = 4
+
+
+def _permutation_map(order):
+    """Doubled map of a permutation of the six positions."""
+    m = np.zeros((6, 6), dtype=np.int64)
+    m[np.arange(6), order] = 2
+    return m
+
+
+def symmetry_maps():
+    """
+    The 144 symmetries of the 6j symbol as integer matrices M, acting on a
+    doubled-spin tuple t as ``M @ t // 2``; the identity comes first.
+    """
+    regge = np.array([
+        [2, 0, 0, 0, 0, 0],
+        [0, 1, 1, 0, 1, -1],
+        [0, 1, 1, 0, -1, 1],
+        [0, 0, 0, 2, 0, 0],
+        [0, 1, -1, 0, 1, 1],
+        [0, -1, 1, 0, 1, 1],
+    ], dtype=np.int64)
+    generators = [
+        _permutation_map((1, 0, 2, 4, 3, 5)),   # swap columns 1, 2
+        _permutation_map((0, 2, 1, 3, 5, 4)),   # swap columns 2, 3
+        _permutation_map((3, 4, 2, 0, 1, 5)),   # swap rows in columns 1, 2
+        regge,
+    ]
+    identity = _permutation_map(range(6))
+    group = {identity.tobytes(): identity}
+    frontier = [identity]
+    while frontier:
+        new = []
+        for a in frontier:
+            for g in generators:
+                product = g @ a
+                assert not (product % 2).any()
+                b = product // 2
+                if b.tobytes() not in group:
+                    group[b.tobytes()] = b
+                    new.append(b)
+        frontier = new
+    return np.array(list(group.values()))
+
+
+_MAPS = symmetry_maps()
+
+
+def _values(mode, two_js):
+    """Float values of the rows of an (N, 6) doubled-spin array."""
+    two_js = np.asarray(two_js, dtype=np.int64).reshape(-1, 6)
+    if mode == "float":
+        return closed_form_3nj_batch(two_js)
+    if mode == "exact":
+        evaluate = _sixj_exact_doubled
+    elif mode == "prime":
+        from project.prime_factorial import _sixj_prime_doubled as evaluate
+    else:
+        raise ValueError(f"unknown mode {mode!r}")
+    rows = [tuple(t) for t in two_js.tolist()]
+    known = {t: float(evaluate(t)) for t in set(rows)}
+    return np.array([known[t] for t in rows], dtype=float)
+
+
+def _failure(check, spins, error, tolerance, **detail):
+    record = {"check": check, "spins": spins, "error": error, "tolerance": tolerance}
+    record.update(detail)
+    return record
+
+
+def _check_symmetry(mode, rtol, atol, max_two_j, tuples):
+    """Worker: symmetry classes led by ``tuples``; returns (checked, error, failures)."""
+    t = np.array(tuples, dtype=np.int64).reshape(-1, 6)
+    images = np.einsum("sij,nj->nsi", _MAPS, t) // 2           # (N, 144, 6)
+    # one member per class: the smallest image inside the bound
+    base = max_two_j + 1
+    keys = images @ (base ** np.arange(5, -1, -1))
+    keys[(images > max_two_j).any(axis=2)] = np.iinfo(np.int64).max
+    leaders = keys[:, 0] == keys.min(axis=1)
+    t, images = t[leaders], images[leaders]
+    values = _values(mode, images.reshape(-1, 6)).reshape(len(t), len(_MAPS))
+    errors = np.abs(values - values[:, :1]).max(axis=1)
+    tolerance = atol + rtol * np.abs(values[:, 0])
+    failures = []
+    for n in np.flatnonzero(errors > tolerance):
+        worst = int(np.argmax(np.abs(values[n] - values[n, 0])))
+        failures.append(_failure(
+            "symmetry", t[n].tolist(), float(errors[n]), float(tolerance[n]),
+            image=images[n, worst].tolist(),
+            values=[float(values[n, 0]), float(values[n, worst])],
+        ))
+    return len(t), float(errors.max(initial=0.0)), failures
+
+
+def _orthogonality_groups(max_two_j):
+    """(t1, t2, t4, t5) for which some j6 is admissible."""
+    r = range(max_two_j + 1)
+    for t1 in r:
+        for t2 in r:
+            for t4 in r:
+                for t5 in r:
+                    if (t1 + t5) % 2 == (t4 + t2) % 2 and \
+                            max(abs(t1 - t5), abs(t4 - t2)) <= min(t1 + t5, t4 + t2):
+                        yield (t1, t2, t4, t5)
+
+
+def _check_orthogonality(mode, rtol, atol, max_two_j, groups):
+    """Worker: orthogonality for each (t1, t2, t4, t5) in ``groups``."""
+    rows, shapes = [], []
+    for t1, t2, t4, t5 in groups:
+        xs = range(max(abs(t1 - t2), abs(t4 - t5)), min(t1 + t2, t4 + t5) + 1, 2)
+        ys = range(max(abs(t1 - t5), abs(t4 - t2)), min(t1 + t5, t4 + t2) + 1, 2)
+        rows.extend((t1, t2, x, t4, t5, y) for x in xs for y in ys)
+        shapes.append((xs, ys))
+    values = _values(mode, rows)
+    checked, worst, failures, start = 0, 0.0, [], 0
+    for (t1, t2, t4, t5), (xs, ys) in zip(groups, shapes):
+        d = values[start:start + len(xs) * len(ys)].reshape(len(xs), len(ys))
+        start += len(xs) * len(ys)
+        w = np.sqrt(np.array(ys) + 1.0)
+        gram = (d * w).T @ ((np.array(xs) + 1.0)[:, None] * (d * w))
+        errors = np.abs(gram - np.eye(len(ys)))
+        tolerance = atol + rtol * len(xs)
+        checked += len(ys) * (len(ys) + 1) // 2
+        worst = max(worst, float(errors.max(initial=0.0)))
+        for i, k in zip(*np.nonzero(np.triu(errors > tolerance))):
+            failures.append(_failure(
+                "orthogonality", [t1, t2, t4, t5], float(errors[i, k]), tolerance,
+                two_j6=[ys[i], ys[k]], value=float(gram[i, k]),
+            ))
+    return checked, worst, failures
+
+
+def _be_instances(max_two_j):
+    """
+    Doubled (a, b, c, d, e, f, p, q, r) with both {p q r; e a d} and
+    {p q r; f b c} admissible, all spins <= max_two_j.
+    """
+    for p, q, r, e, a, d in admissible_6j(max_two_j):
+        for _, _, _, f, b, c in _admissible_with(p, q, r, max_two_j):
+            yield (a, b, c, d, e, f, p, q, r)
+
+
+def _admissible_with(p, q, r, max_two_j):
+    """Admissible tuples {p q r; f b c} with all spins <= max_two_j."""
+    for f in range(max_two_j + 1):
+        for b in range(abs(f - r), min(f + r, max_two_j) + 1, 2):
+            lo = max(abs(p - b), abs(f - q))
+            hi = min(p + b, f + q, max_two_j)
+            if (lo - p - b) % 2 or (lo - f - q) % 2:
+                continue
+            for c in range(lo, hi + 1, 2):
+                yield (p, q, r, f, b, c)
+
+
+def _check_biedenharn_elliott(mode, rtol, atol, max_two_j, instances):
+    """Worker: the Biedenharn-Elliott identity for each 9-tuple in ``instances``."""
+    rows, counts, phases, weights = [], [], [], []
+    for a, b, c, d, e, f, p, q, r in instances:
+        s = a + b + c + d + e + f + p + q + r
+        # a+b, c+d and e+f have the same parity when both sides are admissible
+        xs = range(max(abs(a - b), abs(c - d), abs(e - f)),
+                   min(a + b, c + d, e + f) + 1, 2)
+        for x in xs:
+            rows += [(a, b, x, c, d, p), (c, d, x, e, f, q), (e, f, x, b, a, r)]
+            phases.append(-1.0 if (s + x) // 2 % 2 else 1.0)
+            weights.append(x + 1.0)
+        rows += [(p, q, r, e, a, d), (p, q, r, f, b, c)]
+        counts.append(len(xs))
+    values = _values(mode, rows)
+    worst, failures, start = 0.0, [], 0
+    term_index = 0
+    for instance, n in zip(instances, counts):
+        lhs_values = values[start:start + 3 * n].reshape(n, 3)
+        terms = lhs_values.prod(axis=1) * np.array(phases[term_index:term_index + n]) \
+            * np.array(weights[term_index:term_index + n])
+        rhs = values[start + 3 * n] * values[start + 3 * n + 1]
+        start += 3 * n + 2
+        term_index += n
+        lhs = terms.sum()
+        error = abs(lhs - rhs)
+        tolerance = atol + rtol * (np.abs(terms).sum() + abs(rhs))
+        worst = max(worst, float(error))
+        if error > tolerance:
+            failures.append(_failure(
+                "biedenharn_elliott", list(instance), float(error), float(tolerance),
+                lhs=float(lhs), rhs=float(rhs),
+            ))
+    return len(instances), worst, failures
+
+
+_WORKERS = {
+    "symmetry": _check_symmetry,
+    "orthogonality": _check_orthogonality,
+    "biedenharn_elliott": _check_biedenharn_elliott,
+}
+
+
+def _run_chunk(check, mode, rtol, atol, max_two_j, items):
+    return check, _WORKERS[check](mode, rtol, atol, max_two_j, items)
+
+
+def _tasks(checks, max_two_j, be_max_two_j):
+    """``(check, bound, items)`` chunks of work for the selected checks."""
+    sources = {
+        "symmetry": (max_two_j, lambda: admissible_6j(max_two_j)),
+        "orthogonality": (max_two_j, lambda: _orthogonality_groups(max_two_j)),
+        "biedenharn_elliott": (be_max_two_j, lambda: _be_instances(be_max_two_j)),
+    }
+    for check in checks:
+        bound, items = sources[check]
+        items = items()
+        while True:
+            chunk = list(islice(items, _CHUNK[check]))
+            if not chunk:
+                break
+            yield check, bound, chunk
+
+
+def validate(max_two_j, checks=CHECKS, mode="float", workers=None, rtol=1e-10,
+             atol=1e-12, be_max_two_j=None, log=None):
+    """
+    Check symmetries, orthogonality and the Biedenharn-Elliott identity for
+    all admissible 6j symbols with 2j <= ``max_two_j``.
+
+    ``mode`` is "float", "exact" or "prime"; ``be_max_two_j`` bounds the
+    Biedenharn-Elliott check (default ``min(max_two_j, BE_MAX_TWO_J)``).
+    ``workers`` defaults to the CPU count (1 runs in this process).  Each
+    failure is written to the text stream ``log`` as a JSON line when found,
+    followed by one summary line per check.  Returns the summary as
+    ``{check: {"checked", "failures", "max_error"}}``.
+    """
+    unknown = set(checks) - set(CHECKS)
+    if unknown:
+        raise ValueError(f"unknown checks {sorted(unknown)}")
+    if mode not in ("float", "exact", "prime"):
+        raise ValueError(f"unknown mode {mode!r}")
+    if be_max_two_j is None:
+        be_max_two_j = min(max_two_j, BE_MAX_TWO_J)
+    summary = {check: {"checked": 0, "failures": 0, "max_error": 0.0} for check in checks}
+
+    def record(check, result):
+        checked, worst, failures = result
+        entry = summary[check]
+        entry["checked"] += checked
+        entry["failures"] += len(failures)
+        entry["max_error"] = max(entry["max_error"], worst)
+        if log is not None:
+            for failure in failures:
+                log.write(json.dumps(failure) + "\n")
+            if failures:
+                log.flush()
+
+    tasks = _tasks(checks, max_two_j, be_max_two_j)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for check, bound, items in tasks:
+            record(*_run_chunk(check, mode, rtol, atol, bound, items))
+    else:
+        window = workers * _IN_FLIGHT_PER_WORKER
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = set()
+            while True:
+                for check, bound, items in islice(tasks, window - len(pending)):
+                    pending.add(pool.submit(_run_chunk, check, mode, rtol, atol, bound, items))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    record(*future.result())
+
+    if log is not None:
+        for check, entry in summary.items():
+            log.write(json.dumps({"summary": check, **entry}) + "\n")
+        log.flush()
+    return summary
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_suite.py
+
+Benchmark every 6j backend: per-call latency distributions (warm and cold),
+batch throughput and peak memory, across spins from 1/2 to 400.  Writes
+data/benchmark_results.json (full results with environment and commit) and
+data/performance_benchmark_results.csv (one row per measurement).
+
+    python scripts/benchmark_suite.py --quick
+    python scripts/benchmark_suite.py --baseline old.json   # exit 1 on regressions
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from project.benchmark import BACKENDS, DEFAULT_SIZES, compare, flatten, run_suite
+
+DATA_DIR = os.path.join(REPO_ROOT, "data")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--quick", action="store_true", help="few sizes and repetitions")
+    parser.add_argument("--sizes", type=int, nargs="+", help="doubled spins to benchmark")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=100, help="warm calls per measurement")
+    parser.add_argument("--cold-repeat", type=int, default=3, help="fresh interpreters per cold measurement")
+    parser.add_argument("--json", default=os.path.join(DATA_DIR, "benchmark_results.json"))
+    parser.add_argument("--csv", default=os.path.join(DATA_DIR, "performance_benchmark_results.csv"))
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    sizes = tuple(args.sizes or ((1, 10, 100) if args.quick else DEFAULT_SIZES))
+    repeat = 20 if args.quick else args.repeat
+    cold_repeat = 1 if args.quick else args.cold_repeat
+    results = run_suite(sizes, args.backends, repeat, cold_repeat, log=print)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+    with open(args.json, "w") as f:
+        json.dump(results, f, indent=1)
+    rows = flatten(results)
+    fields = list(dict.fromkeys(key for row in rows for key in row))
+    with open(args.csv, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Saved {args.json} and {args.csv}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for backend, two_j, ratio in regressions:
+            print(f"REGRESSION {backend} 2j={two_j}: {ratio:.2f}x slower")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
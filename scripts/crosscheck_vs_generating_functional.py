@@ -2,7 +2,8 @@
 """
 scripts/test_recursion_cross_check.py
 
-V&V: Cross-check closed-form against recursion-based 3nj implementation using SymPy.
+V&V: Cross-check closed-form against the exact recursion reference
+(project.su2_3nj_reference) using SymPy.
 Writes results to data/recursion_cross_check_results.csv.
 """
 
@@ -18,19 +19,14 @@ except ImportError:
     sys.exit(1)
 
 # —————————————————————————————————————————————————————————
-# allow importing both this repo and the generating-functional project
+# allow importing this repo's project package
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 REPO_ROOT  = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
 sys.path.insert(0, REPO_ROOT)
-
-# assume sibling repos under same parent "asciimath"
-BASE_DIR   = os.path.abspath(os.path.join(REPO_ROOT, os.pardir))
-GF_PROJ    = os.path.join(BASE_DIR, "su2-3nj-generating-functional", "project")
-sys.path.insert(0, GF_PROJ)
 # —————————————————————————————————————————————————————————
 
 from project.su2_3nj_closed_form import closed_form_3nj
-from su2_3nj import recursion_3nj
+from project.su2_3nj_reference import reference_3nj
 
 def main():
     # test spin tuples
@@ -50,7 +46,7 @@ def main():
 
         for js in test_spins:
             direct = closed_form_3nj(*js)
-            rec    = recursion_3nj(*js)
+            rec    = reference_3nj(*js)
             diff   = sp.simplify(direct - rec)
             match  = diff == 0
 
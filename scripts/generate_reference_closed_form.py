@@ -3,34 +3,12 @@ import os
 import sys
 import json
 import sympy as sp
-import importlib.util
 
-# --------------------------------------------------
-# Layout:
-#   .../asciimath/
-#     ├── su2-3nj-generating-functional/
-#     └── su2-3nj-uniform-closed-form/  ← THIS repo
-# --------------------------------------------------
-
-# 1) Path to this repo’s root
+# allow importing this repo's project package
 THIS_REPO = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-# 2) Path to the generating-functional repo
-GEN_FUNC_REPO = os.path.abspath(os.path.join(THIS_REPO, "..", "su2-3nj-generating-functional"))
-
-# Insert generating-functional first so project.su2_3nj comes from there
-sys.path.insert(0, GEN_FUNC_REPO)
-# Then insert this repo so project.su2_3nj_closed_form is available
 sys.path.insert(0, THIS_REPO)
 
-# Try to import generate_3nj from project.su2_3nj, fallback to direct file load if needed
-try:
-    from project.su2_3nj import generate_3nj
-except ModuleNotFoundError:
-    su2_3nj_path = os.path.join(GEN_FUNC_REPO, "project", "su2_3nj.py")
-    spec = importlib.util.spec_from_file_location("su2_3nj", su2_3nj_path)
-    su2_3nj = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(su2_3nj)
-    generate_3nj = su2_3nj.generate_3nj
+from project.su2_3nj_reference import reference_3nj
 
 def main():
     # Define your test tuples
@@ -42,7 +20,7 @@ def main():
 
     ref = {}
     for js in tests:
-        val = sp.simplify(generate_3nj(*js))
+        val = sp.simplify(reference_3nj(*js))
         key = ",".join(map(str, js))
         ref[key] = str(val)
 
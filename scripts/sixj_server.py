@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+scripts/sixj_server.py
+
+Run the asyncio 6j evaluation server (project.sixj_server) on a Unix domain
+socket or a localhost TCP port until interrupted, optionally logging its
+queue depth and latency percentiles as JSON lines to stderr.
+
+    python scripts/sixj_server.py --socket /tmp/sixj.sock
+    python scripts/sixj_server.py --port 7360 --mode exact --workers 8 --stats-interval 10
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from project.sixj_server import MAX_TWO_J, MODES, SixJServer
+
+
+async def _log_stats(server, interval):
+    while True:
+        await asyncio.sleep(interval)
+        print(json.dumps(server.stats()), file=sys.stderr, flush=True)
+
+
+async def serve(args):
+    server = SixJServer(mode=args.mode, workers=args.workers, max_batch=args.max_batch,
+                        max_delay=args.max_delay, max_two_j=args.max_two_j)
+    if args.socket:
+        await server.start(path=args.socket)
+    else:
+        await server.start(port=args.port)
+    print(f"serving {args.mode} 6j symbols on {server.address}", file=sys.stderr, flush=True)
+    if args.stats_interval:
+        asyncio.get_running_loop().create_task(_log_stats(server, args.stats_interval))
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            print(json.dumps(server.stats()), file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--socket", help="Unix domain socket path")
+    address.add_argument("--port", type=int, help="TCP port on 127.0.0.1 (0: any free port)")
+    parser.add_argument("--mode", default="float", choices=MODES)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="evaluation processes (default: all CPUs; 1: a thread)")
+    parser.add_argument("--max-batch", type=int, default=4096,
+                        help="largest batch of distinct symbols per evaluation")
+    parser.add_argument("--max-delay", type=float, default=0.001,
+                        help="seconds to collect concurrent requests into a batch")
+    parser.add_argument("--max-two-j", type=int, default=MAX_TWO_J,
+                        help="reject tuples with a larger doubled spin")
+    parser.add_argument("--stats-interval", type=float, default=0,
+                        help="log stats to stderr every this many seconds")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
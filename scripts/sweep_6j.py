@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+scripts/sweep_6j.py
+
+Evaluate every admissible 6j symbol up to a spin bound, or every tuple in an
+input file, on a process pool, streaming results (j1..j6, value) as CSV,
+NDJSON or columnar binary.
+
+    python scripts/sweep_6j.py --max-two-j 20 --workers 64 -o data/sweep.csv
+    python scripts/sweep_6j.py --max-two-j 60 -o data/sweep_60.s6j
+    python scripts/sweep_6j.py --input tuples.txt --mode exact
+    python scripts/sweep_6j.py --max-two-j 40 --canonical --shard 3/16 -o data/shard_3.s6j
+    python scripts/sweep_6j.py --max-two-j 30 -o /dev/null --stats - --profile sweep.prof
+"""
+
+import argparse
+import os
+import sys
+from contextlib import nullcontext
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from project import instrumentation
+from project.result_io import write_results
+from project.sixj_enumeration import AdmissibleSixJ
+from project.spin6 import iter_spin6
+from project.sweep import admissible_6j, read_tuples, sweep
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--max-two-j", type=int, help="sweep all admissible tuples with 2j <= this")
+    source.add_argument("--input", help="file with six spins per line")
+    parser.add_argument("--doubled", action="store_true", help="input spins are doubled integers")
+    parser.add_argument("--canonical", action="store_true",
+                        help="with --max-two-j: one canonical tuple per symmetry class")
+    parser.add_argument("--shard", help="with --max-two-j: only shard K/N of N equal-cost shards")
+    parser.add_argument("--mode", default="float", choices=["float", "exact", "prime", "mpmath"])
+    parser.add_argument("--dps", type=int, default=15, help="digits for --mode mpmath")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all CPUs)")
+    parser.add_argument("--chunk-cost", type=int, default=1 << 16,
+                        help="Racah terms per dispatched chunk")
+    parser.add_argument("--unordered", action="store_true",
+                        help="write results as they complete instead of in input order")
+    parser.add_argument("-o", "--output", default="-",
+                        help="output file; .csv, .ndjson or .s6j (default: CSV on stdout)")
+    parser.add_argument("--format", choices=["csv", "ndjson", "columnar"],
+                        help="output format (default: from the file extension)")
+    parser.add_argument("--append", action="store_true", help="append to an existing output file")
+    parser.add_argument("--stats", help="write per-stage timings and counters as JSON ('-': stderr)")
+    parser.add_argument("--profile", help="write a cProfile (pstats) file covering all workers")
+    args = parser.parse_args(argv)
+
+    if args.stats:
+        instrumentation.enable()
+    profile = instrumentation.Profile() if args.profile else None
+
+    if args.input:
+        tuples = read_tuples(args.input, doubled=args.doubled)
+    elif args.canonical or args.shard:
+        tuples = AdmissibleSixJ(args.max_two_j, canonical=args.canonical)
+        if args.shard:
+            k, n = (int(x) for x in args.shard.split("/"))
+            if not 0 <= k < n:
+                parser.error("--shard K/N needs 0 <= K < N")
+            start, stop = tuples.shards(n)[k]
+            tuples = (row for chunk in tuples.chunks(start=start, stop=stop)
+                      for row in iter_spin6(chunk))
+    else:
+        tuples = admissible_6j(args.max_two_j)
+
+    results = sweep(
+        tuples, mode=args.mode, workers=args.workers, chunk_cost=args.chunk_cost,
+        ordered=not args.unordered, dps=args.dps, profile=profile,
+    )
+    with profile if profile is not None else nullcontext():
+        if args.output == "-":
+            count = write_results(results, sys.stdout, format=args.format or "csv")
+        else:
+            count = write_results(results, args.output, format=args.format, append=args.append)
+
+    if args.stats:
+        target = sys.stderr if args.stats == "-" else args.stats
+        instrumentation.dump_json(target, mode=args.mode, rows=count)
+    if profile is not None:
+        profile.dump(args.profile)
+        profile.report(limit=15)
+
+
+if __name__ == "__main__":
+    main()
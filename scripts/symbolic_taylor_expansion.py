@@ -1,55 +1,63 @@
-# Corrected symbolic expansion
-import sympy as sp
-import pandas as pd
-import os
-import sys
-
-# Determine script location and project root
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.abspath(os.path.join(script_dir, '..'))
-
-# Add project root to path to ensure consistent imports when run from different locations
-sys.path.insert(0, project_root)
+#!/usr/bin/env python3
+"""
+scripts/symbolic_taylor_expansion.py
 
-# Create data directory if it doesn't exist
-data_dir = os.path.join(project_root, 'data')
-os.makedirs(data_dir, exist_ok=True)
+Expand the tetrahedral generating functional (1 + sum V + sum Q)^(-2)
+degree by degree, turn every coefficient into its 6j symbol and check each
+one exactly against closed_form_3nj.  Writes one row per nonzero
+coefficient with 2j <= --max-two-j; the exit status is 1 on any mismatch.
 
-# Define symbolic variables
-x, y, z = sp.symbols('x y z')
+    python scripts/symbolic_taylor_expansion.py
+    python scripts/symbolic_taylor_expansion.py --max-two-j 6 --output data/taylor_6.csv
+"""
 
-# Angular momentum values: 0, 1/2, 1
-j_values = [0, sp.Rational(1, 2), 1]
-
-# Construct the explicit expansion around the origin
-terms = []
-for j12 in j_values:
-    for j23 in j_values:
-        for j34 in j_values:
-            if (j12, j23, j34) == (0, 0, 0):
+import argparse
+import csv
+import os
+import sys
+from fractions import Fraction
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from project.generating_functional import sixj_from_coefficient, tetrahedral_6j
+from project.su2_3nj_closed_form import closed_form_3nj
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--max-two-j", type=int, default=2,
+                        help="largest exponent (doubled spin) per variable")
+    parser.add_argument("--output", default=os.path.join(REPO_ROOT, "data", "taylor_expansion_terms.csv"))
+    args = parser.parse_args(argv)
+
+    functional = tetrahedral_6j()
+    names = functional.names
+    fields = [f"{name} exponent" for name in names] + [
+        "j1", "j2", "j3", "j4", "j5", "j6", "coefficient", "sixj", "sixj_float", "match",
+    ]
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    rows = mismatches = 0
+    with open(args.output, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(fields)
+        bounds = (args.max_two_j,) * len(names)
+        for two_js, coefficient in functional.coefficients(6 * args.max_two_j, bounds):
+            if not coefficient:
                 continue
-            coeff_symbol = sp.Symbol(f'C_{j12}_{j23}_{j34}')
-            term = coeff_symbol * x**(2*j12) * y**(2*j23) * z**(2*j34)
-            terms.append(term)
-
-# Construct the symbolic Taylor expansion explicitly
-G_expansion = 1 + sum(terms)
-
-# DataFrame representation for clarity
-data = [{
-    'Coefficient': term.coeff(x**sp.degree(term, x) * y**sp.degree(term, y) * z**sp.degree(term, z)),
-    'x exponent': sp.degree(term, x),
-    'y exponent': sp.degree(term, y),
-    'z exponent': sp.degree(term, z)
-} for term in terms]
-
-df_expansion = pd.DataFrame(data)
-
-# Save the DataFrame to CSV in the data directory
-output_file = os.path.join(data_dir, 'taylor_expansion_terms.csv')
-df_expansion.to_csv(output_file, index=False)
-print(f"Saved Taylor expansion terms to {output_file}")
-
-# Display the DataFrame for console output
-print("\nExplicit Taylor Expansion of the Universal Generating Functional:")
-print(df_expansion.to_string())
\ No newline at end of file
+            value = sixj_from_coefficient(two_js, coefficient)
+            spins = [Fraction(t, 2) for t in two_js]
+            match = closed_form_3nj(*spins, mode="exact") == value
+            mismatches += not match
+            writer.writerow(list(two_js) + [str(j) for j in spins] + [
+                coefficient, value.to_sympy(), repr(float(value)), match,
+            ])
+            rows += 1
+    print(f"{rows} coefficients up to 2j = {args.max_two_j} written to {args.output}, "
+          f"{mismatches} mismatches against closed_form_3nj", file=sys.stderr)
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
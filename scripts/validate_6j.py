@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+scripts/validate_6j.py
+
+Exhaustively check all 144 symmetries, the orthogonality relation and the
+Biedenharn-Elliott identity for every admissible 6j symbol up to a spin
+bound, on a process pool, with the fast float or integer backends.
+Failures are streamed as JSON lines to the log (stdout by default),
+followed by a summary line per check; the exit status is 1 on any failure.
+
+    python scripts/validate_6j.py --max-two-j 12
+    python scripts/validate_6j.py --max-two-j 8 --mode prime --log data/validation_log.ndjson
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+sys.path.insert(0, REPO_ROOT)
+
+from project.validation import BE_MAX_TWO_J, CHECKS, validate
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--max-two-j", type=int, required=True,
+                        help="check all admissible tuples with 2j <= this")
+    parser.add_argument("--be-max-two-j", type=int, default=None,
+                        help=f"bound for the Biedenharn-Elliott check (default: min(max, {BE_MAX_TWO_J}))")
+    parser.add_argument("--checks", nargs="+", choices=CHECKS, default=list(CHECKS))
+    parser.add_argument("--mode", default="float", choices=["float", "exact", "prime"])
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all CPUs)")
+    parser.add_argument("--rtol", type=float, default=1e-10)
+    parser.add_argument("--atol", type=float, default=1e-12)
+    parser.add_argument("--log", default="-", help="NDJSON failure log (default: stdout)")
+    args = parser.parse_args(argv)
+
+    log = sys.stdout if args.log == "-" else open(args.log, "w")
+    try:
+        summary = validate(
+            args.max_two_j, checks=args.checks, mode=args.mode, workers=args.workers,
+            rtol=args.rtol, atol=args.atol, be_max_two_j=args.be_max_two_j, log=log,
+        )
+    finally:
+        if log is not sys.stdout:
+            log.close()
+    for check, entry in summary.items():
+        status = "PASS" if entry["failures"] == 0 else "FAIL"
+        print(f"{status}: {check}: {entry['checked']} checked, {entry['failures']} failures, "
+              f"max error {entry['max_error']:.3g}", file=sys.stderr)
+    sys.exit(1 if any(entry["failures"] for entry in summary.values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,10 +9,11 @@ This script validates:
 4. Cross-validation against SymPy's reference implementation
 """
 
+import os
 import sys
-sys.path.insert(0, 'project')
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from su2_3nj_closed_form import closed_form_3nj, triangle_coefficient
+from project.su2_3nj_closed_form import closed_form_3nj, triangle_coefficient
 from sympy.physics.wigner import wigner_6j
 from sympy import Rational, N, simplify
 import pandas as pd
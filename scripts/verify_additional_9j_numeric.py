@@ -1,5 +1,5 @@
-# Verify one additional explicit case numerically for robustness
-# Next simplest nontrivial term: j12=0, j23=1/2, j34=0
+# Verify one additional explicit 9j case numerically for robustness
+# {1/2 1/2 1; 1/2 1/2 1; 1 1 0} = -1/18 against an independent reference
 
 import sympy as sp
 import pandas as pd
@@ -17,28 +17,29 @@ sys.path.insert(0, project_root)
 data_dir = os.path.join(project_root, 'data')
 os.makedirs(data_dir, exist_ok=True)
 
-# Define symbolic variables
-x, y, z = sp.symbols('x y z')
-
-# Define symbolic term
-additional_term = sp.Symbol('C_0_1/2_0') * y
-
-# Illustrative known numerical value for this 9j symbol case
-# Assume again a simple known value, say 1 for illustration purposes
-expected_known_9j_value_additional = 1
-
-# Substitute into symbolic expression
-numerical_value_additional_term = additional_term.subs(sp.Symbol('C_0_1/2_0'), 1).subs(y, 1)
-
-# Verification explicitly
-verification_result_additional = {
-    'Generated Term (numerical)': float(numerical_value_additional_term),
-    'Expected Known 9j Symbol': expected_known_9j_value_additional,
-    'Match?': numerical_value_additional_term == expected_known_9j_value_additional
+from project.su2_9j_closed_form import closed_form_9j
+from sympy.physics.wigner import wigner_9j
+
+h = sp.Rational(1, 2)
+spins = (h, h, 1, h, h, 1, 1, 1, 0)
+
+# Evaluate the 9j symbol with the closed form (exact and float) and compare
+# against SymPy's independent reference implementation
+exact_value = closed_form_9j(*spins)
+float_value = closed_form_9j(*spins, mode="float")
+reference_value = wigner_9j(*spins)
+
+verification_result = {
+    '9j Symbol': str(spins),
+    'Closed Form (exact)': str(exact_value),
+    'Closed Form (float)': float_value,
+    'Reference (sympy wigner_9j)': str(reference_value),
+    'Match?': sp.simplify(exact_value - reference_value) == 0
+        and abs(float_value - float(reference_value)) < 1e-14,
 }
 
 # Combine results for clarity
-df_verification_additional = pd.DataFrame([verification_result_additional])
+df_verification_additional = pd.DataFrame([verification_result])
 
 # Save the DataFrame to CSV in the data directory
 output_file = os.path.join(data_dir, 'additional_9j_numeric_verification.csv')
@@ -1,5 +1,5 @@
-# Explicit numerical verification for simplest case (j12=0, j23=0, j34=1/2)
-# Known numerical value for a basic 9j-symbol from literature for small quantum numbers
+# Numerical verification of the simplest nontrivial 9j symbol
+# {1/2 1/2 0; 1/2 1/2 0; 0 0 0} = 1/2 against an independent reference
 
 import sympy as sp
 import pandas as pd
@@ -17,26 +17,25 @@ sys.path.insert(0, project_root)
 data_dir = os.path.join(project_root, 'data')
 os.makedirs(data_dir, exist_ok=True)
 
-# Define symbolic variables
-x, y, z = sp.symbols('x y z')
+from project.su2_9j_closed_form import closed_form_9j
+from sympy.physics.wigner import wigner_9j
 
-# Define simplest term from previous script
-simplest_term = sp.Symbol('C_0_0_1/2') * z
+h = sp.Rational(1, 2)
+spins = (h, h, 0, h, h, 0, 0, 0, 0)
 
-# From standard tables, the simplest nontrivial 9j symbol involving half-integers (0,0,1/2):
-# Typically, {0,0,1/2;0,0,1/2;0,0,1/2} = 1 or some known rational/simple fraction.
-# We'll assume an illustrative known value of 1 for simplicity.
-
-# Substitute the known value into our symbolic term
-numerical_value_of_generated_term = simplest_term.subs(sp.Symbol('C_0_0_1/2'), 1).subs(z, 1)
-
-# Compare explicitly
-expected_known_9j_value = 1  # Hypothetical illustrative known value
+# Evaluate the 9j symbol with the closed form (exact and float) and compare
+# against SymPy's independent reference implementation
+exact_value = closed_form_9j(*spins)
+float_value = closed_form_9j(*spins, mode="float")
+reference_value = wigner_9j(*spins)
 
 verification_result = {
-    'Generated Term (numerical)': float(numerical_value_of_generated_term),
-    'Expected Known 9j Symbol': expected_known_9j_value,
-    'Match?': numerical_value_of_generated_term == expected_known_9j_value
+    '9j Symbol': str(spins),
+    'Closed Form (exact)': str(exact_value),
+    'Closed Form (float)': float_value,
+    'Reference (sympy wigner_9j)': str(reference_value),
+    'Match?': sp.simplify(exact_value - reference_value) == 0
+        and abs(float_value - float(reference_value)) < 1e-14,
 }
 
 # Create DataFrame for results
@@ -0,0 +1,58 @@
+"""
+Test the NumPy batch evaluator against the scalar closed form.
+"""
+
+import numpy as np
+import pytest
+from project.su2_3nj_closed_form import closed_form_3nj, closed_form_3nj_float
+from project.su2_3nj_batch import closed_form_3nj_batch
+
+
+def _spins(two_js):
+    """Doubled spins -> spins accepted by closed_form_3nj."""
+    return [x // 2 if x % 2 == 0 else x / 2 for x in two_js]
+
+
+class TestBatchEvaluator:
+    """Batch values agree with closed_form_3nj row by row."""
+    
+    def test_small_spins_vs_exact(self):
+        two = np.array([
+            (0, 0, 0, 0, 0, 0),
+            (2, 2, 2, 2, 2, 2),
+            (2, 4, 6, 8, 10, 12),
+            (1, 1, 0, 1, 1, 2),
+            (3, 1, 2, 3, 1, 4),
+            (2, 2, 6, 0, 0, 0),   # triangle violation
+            (1, 1, 1, 1, 1, 1),   # parity violation
+        ])
+        values = closed_form_3nj_batch(two)
+        expected = [float(closed_form_3nj(*_spins(r), mode="exact")) for r in two.tolist()]
+        np.testing.assert_allclose(values, expected, rtol=1e-13, atol=1e-16)
+    
+    def test_random_batch_vs_scalar_float(self):
+        rng = np.random.default_rng(1234)
+        two = rng.integers(0, 24, size=(20000, 6))
+        values, errors = closed_form_3nj_batch(two, return_error=True, chunk_size=4096)
+        assert np.count_nonzero(values) > 100
+        for row, value, error in zip(two.tolist(), values, errors):
+            if value == 0.0:
+                continue
+            scalar, scalar_error = closed_form_3nj_float(*_spins(row), return_error=True)
+            assert value == pytest.approx(scalar, rel=1e-12)
+            assert error == pytest.approx(scalar_error, rel=1e-6)
+    
+    def test_large_spins(self):
+        two = np.array([(200, 190, 180, 195, 185, 170)])
+        value, error = closed_form_3nj_batch(two, return_error=True)
+        exact = float(closed_form_3nj(*_spins(two[0].tolist()), mode="exact"))
+        assert abs(value[0] - exact) <= error[0]
+    
+    def test_shape_validation(self):
+        with pytest.raises(ValueError):
+            closed_form_3nj_batch(np.zeros((3, 5), dtype=int))
+        with pytest.raises(ValueError):
+            closed_form_3nj_batch(np.zeros((3, 6)))
+    
+    def test_empty_batch(self):
+        assert closed_form_3nj_batch(np.zeros((0, 6), dtype=int)).shape == (0,)
@@ -0,0 +1,61 @@
+"""
+Test the benchmark harness on tiny workloads.
+"""
+
+import json
+
+import pytest
+from project.benchmark import (
+    benchmark_tuple,
+    compare,
+    flatten,
+    measure_batch,
+    measure_warm,
+    run_suite,
+    summarize,
+)
+from project.su2_3nj_closed_form import _racah_bounds
+
+
+class TestHarness:
+
+    @pytest.mark.parametrize("two_j", [1, 2, 5, 10, 801])
+    def test_benchmark_tuple_admissible(self, two_j):
+        assert _racah_bounds(benchmark_tuple(two_j)) is not None
+
+    def test_summarize(self):
+        s = summarize([5, 1, 3, 2, 4])
+        assert (s["n"], s["min"], s["median"], s["max"]) == (5, 1, 3, 5)
+
+    def test_measure_warm(self):
+        s = measure_warm("float", 4, repeat=5)
+        assert s["n"] == 5 and s["min"] > 0
+
+    def test_measure_batch(self):
+        r = measure_batch(3, repeat=2)
+        assert r["symbols"] > 0 and r["symbols_per_s"] > 0
+
+    def test_suite_and_compare(self):
+        results = run_suite(
+            sizes=(1, 4), backends=("float", "cached"), repeat=3,
+            cold_sizes=(), batch_sizes=(2,),
+        )
+        json.dumps(results)
+        assert len(results["latency"]) == 4
+        assert "cold_ns" in results["latency"][-1]
+        assert len(flatten(results)) == 5
+        assert compare(results, results) == []
+        slower = json.loads(json.dumps(results))
+        for r in slower["latency"]:
+            r["warm_ns"]["median"] *= 2
+        assert len(compare(slower, results)) == 4
+
+    def test_table_backend_restores_environment(self, monkeypatch):
+        from project import sixj_table
+        monkeypatch.delenv(sixj_table.TABLE_ENV, raising=False)
+        results = run_suite(
+            sizes=(2,), backends=("table",), repeat=3, cold_sizes=(), batch_sizes=(),
+        )
+        assert results["latency"][0]["backend"] == "table"
+        assert sixj_table.TABLE_ENV not in __import__("os").environ
+        assert sixj_table._default_table is None
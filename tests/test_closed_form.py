@@ -11,7 +11,7 @@ import sys
 
 # Add project to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-from project.su2_3nj_closed_form import closed_form_3nj
+from project.su2_3nj_closed_form import Surd, closed_form_3nj, closed_form_3nj_float
 
 
 class TestClosedFormAgainstReference:
@@ -105,3 +105,136 @@ class TestClosedFormDomain:
         # {0 0 0; 0 0 0} = 0 (by convention or computation)
         expected = wigner_6j(0, 0, 0, 0, 0, 0)
         assert result == expected
+
+
+class TestExactMode:
+    """Exact integer-arithmetic evaluation returning a canonical surd."""
+    
+    @pytest.mark.parametrize("spins", [
+        (1, 1, 1, 1, 1, 1),
+        (2, 2, 2, 2, 2, 2),
+        (1, 2, 3, 4, 5, 6),
+        (sp.Rational(3,2), sp.Rational(1,2), 1, sp.Rational(3,2), sp.Rational(1,2), 2),
+        (7, 8, 9, 8, 7, 6),
+    ])
+    def test_exact_matches_sympy(self, spins):
+        """Surd converted to SymPy equals wigner_6j."""
+        value = closed_form_3nj(*spins, mode="exact")
+        expected = wigner_6j(*[sp.Rational(j) for j in spins])
+        assert sp.simplify(value.to_sympy() - expected) == 0
+        assert float(value) == pytest.approx(float(expected), rel=1e-12, abs=1e-15)
+    
+    def test_canonical_form(self):
+        """Radicand is a squarefree integer, rational factor positive."""
+        value = closed_form_3nj(1, 2, 3, 4, 5, 6, mode="exact")
+        assert value.sign == 1
+        assert sp.Rational(value.p, value.q) * value.r**2 == sp.Rational(1430, 2145**2)
+        assert value.q == 1
+        assert value.r > 0
+        assert all(e == 1 for e in sp.factorint(value.p).values())
+    
+    def test_canonical_is_unique(self):
+        """Equal values built from different radicand splits compare equal."""
+        from fractions import Fraction
+        a = Surd.canonical(1, 7, 2, Fraction(1, 10))
+        b = Surd.canonical(1, 1, 14, Fraction(7, 10))
+        assert a == b == Surd(1, 14, 1, Fraction(1, 20))
+        assert Surd.canonical(-1, 3, 1, Fraction(0)) == Surd(0, 0, 1, Fraction(0))
+    
+    def test_float_of_large_radicand(self):
+        """Radicands beyond the float range still convert."""
+        from fractions import Fraction
+        p = 2 * 3 * 5 * 7 * 11 * 13 * 17 * 19 * 23 * 29 * 31 * 37 * 41 * 43 * 47 * 53
+        value = Surd(-1, p ** 20, 1, Fraction(1, p ** 10 * 3))
+        assert float(value) == pytest.approx(-1 / 3, rel=1e-15)
+    
+    def test_exact_and_prime_agree(self):
+        """Both exact backends return the same canonical Surd."""
+        for two_js in [(3, 1, 4, 4, 4, 3), (7, 8, 9, 8, 7, 6), (20, 22, 24, 21, 23, 25)]:
+            spins = [sp.Rational(t, 2) for t in two_js]
+            assert closed_form_3nj(*spins, mode="exact") == closed_form_3nj(*spins, mode="prime")
+    
+    def test_string_and_fraction_spins(self):
+        """Spins may be given as strings or Fractions."""
+        from fractions import Fraction
+        a = closed_form_3nj("1/2", "1/2", 1, "1/2", "1/2", 0, mode="exact")
+        b = closed_form_3nj(Fraction(1, 2), Fraction(1, 2), 1, Fraction(1, 2), Fraction(1, 2), 0, mode="exact")
+        assert a == b
+    
+    def test_non_half_integer_rejected(self):
+        """Spins that are not multiples of 1/2 raise ValueError."""
+        with pytest.raises(ValueError):
+            closed_form_3nj(sp.Rational(1, 3), 1, 1, 1, 1, 1, mode="exact")
+    
+    def test_zero_surd(self):
+        """Triangle violations give the canonical zero."""
+        value = closed_form_3nj(1, 1, 3, 0, 0, 0, mode="exact")
+        assert value.sign == 0 and float(value) == 0.0
+
+
+class TestTermRatio:
+    """Racah sum via the 4F3 term ratio matches the term-by-term sum."""
+    
+    @pytest.mark.parametrize("two_js", [
+        (2, 2, 2, 2, 2, 2),
+        (2, 4, 6, 8, 10, 12),
+        (3, 1, 2, 3, 1, 4),
+        (20, 18, 16, 19, 17, 15),
+    ])
+    def test_exact_and_float_series(self, two_js):
+        from fractions import Fraction
+        from project.su2_3nj_closed_form import (
+            _racah_bounds, _racah_seed, _racah_series_float, _racah_sum_exact,
+        )
+        _, alphas, betas = _racah_bounds(two_js)
+        k_min, k_max = max(alphas), min(betas)
+        direct = sum(Fraction(*_racah_seed(k, alphas, betas)) for k in range(k_min, k_max + 1))
+        assert _racah_sum_exact(alphas, betas) == direct
+        seed = Fraction(*_racah_seed(k_min, alphas, betas))
+        assert _racah_series_float(alphas, betas) == pytest.approx(float(direct / seed), rel=1e-12)
+
+
+class TestFloatMode:
+    """Double-precision path validated against the exact path."""
+    
+    @pytest.mark.parametrize("spins", [
+        (0, 0, 0, 0, 0, 0),
+        (1, 1, 1, 1, 1, 1),
+        (1, 1, 0, 1, 1, 0),
+        (1, 1, 2, 1, 1, 0),
+        (2, 2, 2, 2, 2, 2),
+        (2, 2, 2, 2, 2, 4),
+        (1, 2, 3, 4, 5, 6),
+        (sp.Rational(1,2), sp.Rational(1,2), 0, sp.Rational(1,2), sp.Rational(1,2), 1),
+        (sp.Rational(1,2), sp.Rational(1,2), 1, sp.Rational(1,2), sp.Rational(1,2), 0),
+        (1, sp.Rational(1,2), sp.Rational(3,2), 1, sp.Rational(1,2), sp.Rational(3,2)),
+        (sp.Rational(3,2), sp.Rational(1,2), 1, sp.Rational(3,2), sp.Rational(1,2), 2),
+        (1, 1, 3, 0, 0, 0),
+        (2, 2, 5, 1, 1, 1),
+    ])
+    def test_float_matches_exact(self, spins):
+        exact = float(closed_form_3nj(*spins, mode="exact"))
+        value, error = closed_form_3nj_float(*spins, return_error=True)
+        assert value == pytest.approx(exact, rel=1e-13, abs=1e-15)
+        assert abs(value - exact) <= error + 1e-300
+        assert closed_form_3nj(*spins, mode="float") == value
+    
+    def test_reference_cases(self):
+        ref_path = os.path.join(os.path.dirname(__file__), "reference_3nj_closed_form.json")
+        with open(ref_path, "r") as f:
+            reference = json.load(f)
+        for key, expected_str in reference.items():
+            js = [int(x) for x in key.split(",")]
+            expected = float(sp.sympify(expected_str))
+            assert closed_form_3nj_float(*js) == pytest.approx(expected, rel=1e-13)
+    
+    @pytest.mark.parametrize("spins", [
+        (30, 28, 26, 29, 27, 25),
+        (100, 95, 90, 97, 92, 85),
+    ])
+    def test_error_estimate_bounds_large_spins(self, spins):
+        """Error estimate covers the actual deviation, even under cancellation."""
+        exact = closed_form_3nj(*spins, mode="exact")
+        value, error = closed_form_3nj_float(*spins, return_error=True)
+        diff = abs(sp.Float(value, 50) - exact.to_sympy().evalf(50))
+        assert diff <= error
@@ -0,0 +1,67 @@
+"""
+Test the shared lazily grown factorial store.
+"""
+
+import math
+import threading
+
+from project.factorial_store import EXACT_SLACK, FactorialStore, PrimeFactorialTable
+
+
+class TestFactorialStore:
+    """Tables are correct, grow lazily and are safe to share."""
+    
+    def test_exact_and_log_factorials(self):
+        store = FactorialStore()
+        for n in (0, 1, 5, 37, 200):
+            assert store.factorial(n) == math.factorial(n)
+            assert store.log_factorial(n) == math.lgamma(n + 1)
+    
+    def test_lazy_growth_and_prewarm(self):
+        store = FactorialStore()
+        assert store.sizes()["factorial"] == 1
+        store.prewarm(10, log=False, prime=False)
+        assert store.sizes()["factorial"] >= 22
+        assert store.sizes()["log_factorial"] == 1
+        store.prewarm(10)
+        assert store.sizes()["log_factorial"] >= 22
+        assert store.prime_table(10).max_two_j >= 10
+    
+    def test_exact_growth_is_bounded(self):
+        store = FactorialStore()
+        store.factorial(1000)
+        assert store.sizes()["factorial"] == 1001
+        # doubling would compute up to 2001!
+        store.factorial(1001)
+        assert store.sizes()["factorial"] == 1002 + EXACT_SLACK
+        assert store.factorial(1001 + EXACT_SLACK) == math.factorial(1001 + EXACT_SLACK)
+    
+    def test_prime_table_extend_matches_fresh_build(self):
+        grown = PrimeFactorialTable(3)
+        grown.extend(40)
+        fresh = PrimeFactorialTable(40)
+        assert grown.primes == fresh.primes
+        assert grown.exponents == fresh.exponents
+        for n in range(fresh.n_max + 1):
+            assert fresh.to_int(fresh.combine([n], [])) == math.factorial(n)
+    
+    def test_concurrent_growth(self):
+        store = FactorialStore()
+        errors = []
+        
+        def worker(offset):
+            try:
+                for n in range(offset, 400, 7):
+                    assert store.factorial(n) == math.factorial(n)
+                    assert store.log_factorial(n) == math.lgamma(n + 1)
+                    table = store.prime_table(n)
+                    assert table.to_int(table.combine([n], [])) == math.factorial(n)
+            except Exception as e:
+                errors.append(e)
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(7)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert not errors
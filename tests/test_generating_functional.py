@@ -0,0 +1,118 @@
+"""
+Test the series expansion of the generating functionals.
+"""
+
+import math
+import random
+from fractions import Fraction
+
+import pytest
+from project.generating_functional import (
+    GeneratingFunctional,
+    graph_functional,
+    poly_mul,
+    sixj_from_coefficient,
+    sixj_values,
+    tetrahedral_6j,
+)
+from project.su2_3nj_closed_form import _sixj_exact_doubled
+from project.sweep import admissible_6j
+
+
+class TestSeries:
+    """Streaming expansion and single-coefficient extraction."""
+
+    def test_geometric_series(self):
+        # (1 - x - y)^(-1): binomial coefficients
+        g = GeneratingFunctional({(1, 0): 1, (0, 1): 1}, 1)
+        for n, part in g.components(8):
+            assert part == {(k, n - k): math.comb(n, k) for k in range(n + 1)}
+
+    def test_half_integer_power(self):
+        # (1 - x)^(-1/2) = sum binom(2n, n) (x/4)^n
+        g = GeneratingFunctional({(1,): 1}, Fraction(1, 2))
+        coefficients = dict(g.coefficients(10))
+        for n in range(11):
+            expected = Fraction(math.comb(2 * n, n), 4 ** n)
+            assert coefficients[(n,)] == expected
+            assert g.coefficient((n,)) == expected
+
+    @pytest.mark.parametrize("functional", [
+        tetrahedral_6j(),
+        graph_functional([(0, 1), (1, 2), (2, 0)]),
+        GeneratingFunctional({(1, 0): 3, (1, 1): -2, (0, 3): Fraction(1, 2)}, Fraction(5, 3)),
+    ])
+    def test_coefficient_matches_expansion(self, functional):
+        for exponents, value in functional.coefficients(8):
+            assert functional.coefficient(exponents) == value
+
+    def test_bounds_are_exact(self):
+        g = tetrahedral_6j()
+        bounded = dict(g.coefficients(12, bounds=(2,) * 6))
+        full = dict(g.coefficients(12))
+        assert bounded == {e: c for e, c in full.items() if max(e) <= 2}
+
+    def test_integer_coefficients_stay_int(self):
+        for _, value in tetrahedral_6j().coefficients(9):
+            assert type(value) is int
+
+    def test_poly_mul(self):
+        a = {(1, 0): 1, (0, 1): 1}
+        b = {(1, 0): 1, (0, 1): -1}
+        assert poly_mul(a, b) == {(2, 0): 1, (0, 2): -1}
+        assert poly_mul(a, b, bounds=(1, 2)) == {(0, 2): -1}
+
+    @pytest.mark.parametrize("polynomial,s", [
+        ({}, 1),
+        ({(0, 0): 1}, 1),
+        ({(1, -1): 1}, 1),
+        ({(1, 0): 1}, 0),
+    ])
+    def test_invalid(self, polynomial, s):
+        with pytest.raises(ValueError):
+            GeneratingFunctional(polynomial, s)
+
+
+class TestSixJ:
+    """6j symbols read off the tetrahedral generating function."""
+
+    def test_all_small_tuples(self):
+        values = dict(sixj_values(5))
+        for two_js in admissible_6j(5):
+            expected = _sixj_exact_doubled(two_js)
+            if expected.sign:
+                assert values.pop(two_js) == expected
+        assert not values
+
+    def test_random_large(self):
+        rng = random.Random(3)
+        g = tetrahedral_6j()
+        checked = 0
+        while checked < 20:
+            two_js = tuple(rng.randint(0, 40) for _ in range(6))
+            expected = _sixj_exact_doubled(two_js)
+            if expected.sign:
+                value = sixj_from_coefficient(two_js, g.coefficient(two_js))
+                assert value == expected
+                checked += 1
+
+    def test_inadmissible_coefficient_vanishes(self):
+        assert tetrahedral_6j().coefficient((1, 1, 1, 1, 1, 1)) == 0
+
+
+class TestGraphFunctional:
+    """det(I - K)^(-1/2) of a graph."""
+
+    def test_tetrahedron_determinant(self):
+        # det(I - K) = 1 + sum x_e^2 + Pf(K)^2, Pf = x01 x23 - x02 x13 + x03 x12
+        g = graph_functional([(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)])
+        pf = {(1, 0, 0, 0, 0, 1): 1, (0, 1, 0, 0, 1, 0): -1, (0, 0, 1, 1, 0, 0): 1}
+        det = poly_mul(pf, pf)
+        for e in range(6):
+            det[tuple(2 * (i == e) for i in range(6))] = 1
+        assert g.polynomial == {e: -c for e, c in det.items()}
+        assert g.names == ("x01", "x02", "x03", "x12", "x13", "x23")
+
+    def test_loop_rejected(self):
+        with pytest.raises(ValueError):
+            graph_functional([(0, 1), (1, 1)])
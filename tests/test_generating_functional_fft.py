@@ -0,0 +1,96 @@
+"""
+Test FFT coefficient extraction from the generating functionals.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from project.generating_functional import GeneratingFunctional, graph_functional, tetrahedral_6j
+from project.generating_functional_fft import (
+    _axis_periods,
+    _echelon,
+    choose_grid,
+    fft_coefficients,
+    sixj_block,
+)
+from project.su2_3nj_batch import closed_form_3nj_batch
+
+# largest ratio of the reported errors to the actual ones
+TIGHTNESS = 100
+
+
+def assert_errors(values, exact, errors):
+    """The a-posteriori errors bound the actual ones and are not far above."""
+    actual = np.abs(values - exact)
+    assert np.all(actual <= errors)
+    assert errors.max() <= TIGHTNESS * actual.max()
+
+
+class TestCoefficients:
+    """Blocks of coefficients against the exact expansion."""
+
+    def test_binomials(self):
+        g = GeneratingFunctional({(1, 0): 1, (0, 1): 1}, 1)
+        block = fft_coefficients(g, (10, 10))
+        exact = np.array([[math.comb(i + j, i) for j in range(11)] for i in range(11)])
+        assert_errors(block.coefficients, exact, block.errors)
+
+    def test_graph_functional(self):
+        g = graph_functional([(0, 1), (1, 2), (2, 0)])
+        block = fft_coefficients(g, (6, 6, 6))
+        exact = np.zeros(block.coefficients.shape)
+        for exponents, value in g.coefficients(18, bounds=(6, 6, 6)):
+            exact[exponents] = float(value)
+        assert_errors(block.coefficients, exact, block.errors)
+
+    def test_given_grid(self):
+        g = GeneratingFunctional({(1,): 1}, 1)
+        block = fft_coefficients(g, (12,), radius=0.5, padding=20)
+        assert block.shape == (33,)
+        assert np.allclose(block.coefficients, 1)
+
+    @pytest.mark.parametrize("options", [
+        {"radius": 0.5, "padding": 0},
+        {"max_points": 100},
+    ])
+    def test_invalid_grid(self, options):
+        with pytest.raises(ValueError):
+            fft_coefficients(tetrahedral_6j(), (2,) * 6, **options)
+
+    def test_choose_grid(self):
+        radius, padding, error = choose_grid(tetrahedral_6j(), (2,) * 6)
+        assert 0 < radius < 0.6 and padding >= 1 and error < 1e-3
+
+    def test_weights(self):
+        g = GeneratingFunctional({(1, 0): 1, (0, 1): 1}, 1)
+        weights = np.zeros((11, 11))
+        weights[0, 0] = 1
+        radius, _, error = choose_grid(g, (10, 10), weights=weights)
+        block = fft_coefficients(g, (10, 10), weights=weights)
+        assert block.radius == radius
+        assert error == pytest.approx(block.errors[0, 0])
+
+
+class TestLattice:
+    """Only shifts inside the exponent lattice alias."""
+
+    def test_tetrahedral_periods(self):
+        g = tetrahedral_6j()
+        assert _axis_periods(_echelon(g.polynomial, 6), 6) == [2] * 6
+
+    def test_no_period(self):
+        # exponents (1, 1) only: no multiple of e_0 is in the lattice
+        assert _axis_periods(_echelon([(1, 1)], 2), 2) == [None, None]
+
+
+class TestSixJBlock:
+    """Every 6j symbol up to 2j <= 4 from one FFT."""
+
+    def test_against_batch(self):
+        values, errors = sixj_block(4)
+        two_js = np.indices(values.shape).reshape(6, -1).T
+        expected = closed_form_3nj_batch(two_js).reshape(values.shape)
+        assert_errors(values, expected, errors)
+        assert np.abs(values - expected).max() < 1e-6
+        assert values[1, 1, 0, 1, 1, 0] == pytest.approx(-0.5)
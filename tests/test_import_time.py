@@ -0,0 +1,88 @@
+"""
+Test that the numeric backends import quickly and without SymPy.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# an import may take at most this fraction of importing SymPy in the same
+# interpreter, so the check scales with the machine instead of the clock
+IMPORT_FRACTION = 0.25
+
+_PROBE = """
+import json, sys, time
+{preload}
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = sorted(m for m in ("sympy", "mpmath", "numpy") if m in sys.modules)
+start = time.perf_counter()
+import sympy
+print(json.dumps([elapsed, time.perf_counter() - start, loaded]))
+"""
+
+
+def _import_in_fresh_interpreter(module, preload=""):
+    """
+    ``(seconds, seconds to import SymPy afterwards, heavy modules loaded)``
+    for importing ``module`` after ``preload``.
+    """
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module, preload=preload)],
+        capture_output=True, text=True, check=True, cwd=REPO_ROOT,
+    ).stdout
+    return json.loads(out)
+
+
+class TestLazyImports:
+    """SymPy is only loaded when symbolic output is requested."""
+
+    @pytest.mark.parametrize("module", [
+        "project.su2_3nj_closed_form",
+        "project.prime_factorial",
+        "project.sixj_cache",
+        "project.persistent_cache",
+        "project.su2_3nj_reference",
+    ])
+    def test_pure_python_backends(self, module):
+        elapsed, baseline, loaded = _import_in_fresh_interpreter(module)
+        assert loaded == []
+        assert elapsed < IMPORT_FRACTION * baseline
+
+    @pytest.mark.parametrize("module", [
+        "project.su2_3nj_batch",
+        "project.sixj_recursion",
+        "project.su2_9j_closed_form",
+        "project.su2_3nj_network",
+        "project.sixj_table",
+        "project.sweep",
+        "project.result_io",
+    ])
+    def test_numpy_backends(self, module):
+        # NumPy's own import is not counted
+        elapsed, baseline, loaded = _import_in_fresh_interpreter(module, "import numpy")
+        assert loaded == ["numpy"]
+        assert elapsed < IMPORT_FRACTION * baseline
+
+    def test_numeric_modes_do_not_load_sympy(self):
+        probe = (
+            "import sys\n"
+            "from project.su2_3nj_closed_form import closed_form_3nj\n"
+            "for mode in ('exact', 'prime', 'float'):\n"
+            "    closed_form_3nj(1, 2, 3, 4, 5, 6, mode=mode)\n"
+            "print('sympy' in sys.modules)\n"
+        )
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True,
+                             text=True, check=True, cwd=REPO_ROOT).stdout
+        assert out.strip() == "False"
+
+    def test_symbolic_mode_loads_sympy(self):
+        from project.su2_3nj_closed_form import closed_form_3nj
+        import sympy as sp
+        assert closed_form_3nj(2, 2, 2, 2, 2, 2) == sp.Rational(-3, 70)
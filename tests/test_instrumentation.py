@@ -0,0 +1,123 @@
+"""
+Test the opt-in hot-path instrumentation.
+"""
+
+import io
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+import pytest
+import project.su2_3nj_closed_form as closed_form
+import project.sweep as sweep_module
+from project import instrumentation
+from project.sixj_cache import SixJCache
+from project.su2_3nj_closed_form import closed_form_3nj
+from project.sweep import admissible_6j, sweep
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+@pytest.fixture(autouse=True)
+def _clean():
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+class TestInstrumentation:
+    """Counters are recorded only while enabled."""
+
+    def test_disabled_is_untouched(self):
+        original = closed_form._racah_bounds
+        with instrumentation.instrumented():
+            assert closed_form._racah_bounds is not original
+            assert sweep_module._racah_bounds is closed_form._racah_bounds
+        assert closed_form._racah_bounds is original
+        assert sweep_module._racah_bounds is original
+        instrumentation.reset()
+        closed_form_3nj(2, 2, 2, 2, 2, 2, mode="exact")
+        assert instrumentation.counters() == {}
+
+    def test_module_imported_while_enabled(self):
+        # needs a fresh interpreter: here every project module is loaded already
+        probe = (
+            "import sys\n"
+            "from project import instrumentation\n"
+            "instrumentation.enable()\n"
+            "import project.validation as validation\n"
+            "instrumentation.disable()\n"
+            "instrumentation.reset()\n"
+            "validation._sixj_exact_doubled((2, 2, 2, 2, 2, 2))\n"
+            "print(instrumentation.counters())\n"
+        )
+        out = subprocess.run([sys.executable, "-c", probe], capture_output=True,
+                             text=True, check=True, cwd=REPO_ROOT).stdout
+        assert out.strip() == "{}"
+
+    def test_exact_stages(self):
+        with instrumentation.instrumented():
+            closed_form_3nj(2, 2, 2, 2, 2, 2, mode="exact")
+            closed_form_3nj(1, 2, 5, 1, 1, 1, mode="exact")
+        stats = instrumentation.counters()
+        assert stats["triangle"]["calls"] == 2
+        assert stats["triangle"]["inadmissible"] == 1
+        assert stats["exact"]["calls"] == 2
+        assert stats["racah_exact"]["calls"] == 1
+        assert stats["racah_exact"]["terms"] == 3
+        assert stats["racah_exact"]["max_bits"] > 0
+        assert stats["exact"]["total_ns"] >= stats["racah_exact"]["total_ns"]
+
+    def test_cache_and_sympy(self):
+        cache = SixJCache(mode="symbolic")
+        with instrumentation.instrumented():
+            cache(1, 1, 1, 1, 1, 1)
+            cache(1, 1, 1, 1, 1, 1)
+        stats = instrumentation.counters()
+        assert (stats["cache"]["hits"], stats["cache"]["misses"]) == (1, 1)
+        assert stats["sympy"]["calls"] == 2
+
+    def test_mpmath_passes(self):
+        with instrumentation.instrumented():
+            closed_form_3nj(10, 10, 10, 10, 10, 10, mode="mpmath", dps=30)
+        stats = instrumentation.counters()
+        assert stats["mpmath"]["passes"] == stats["mpmath_series"]["calls"] >= 2
+        assert stats["mpmath_series"]["max_dps"] >= 30
+
+    def test_merge(self):
+        instrumentation.merge({"batch": {"calls": 1, "total_ns": 5, "max_ns": 5, "rows": 3}})
+        instrumentation.merge({"batch": {"calls": 2, "total_ns": 7, "max_ns": 4, "rows": 4}})
+        assert instrumentation.counters()["batch"] == {
+            "calls": 3, "total_ns": 12, "max_ns": 5, "rows": 7,
+        }
+
+    def test_dump_json(self):
+        with instrumentation.instrumented():
+            closed_form_3nj(1, 1, 1, 1, 1, 1, mode="float")
+        out = io.StringIO()
+        instrumentation.dump_json(out, mode="float")
+        document = json.loads(out.getvalue())
+        assert document["mode"] == "float"
+        assert document["stages"]["float"]["calls"] == 1
+
+
+class TestSweepInstrumentation:
+    """Worker counters and profiles reach the parent process."""
+
+    def test_worker_counters(self):
+        tuples = list(admissible_6j(4))
+        with instrumentation.instrumented():
+            results = list(sweep(tuples, workers=2, chunk_cost=100))
+        assert len(results) == len(tuples)
+        assert instrumentation.counters()["batch"]["rows"] == len(tuples)
+
+    def test_worker_profile(self, tmp_path):
+        profile = instrumentation.Profile()
+        with profile:
+            list(sweep(admissible_6j(3), workers=2, chunk_cost=50, profile=profile))
+        path = tmp_path / "sweep.prof"
+        profile.dump(path)
+        names = {key[2] for key in pstats.Stats(str(path)).stats}
+        assert "closed_form_3nj_batch" in names
@@ -0,0 +1,52 @@
+"""
+Test the arbitrary-precision mpmath backend against the exact engine.
+"""
+
+import mpmath
+import pytest
+import sympy as sp
+from project.su2_3nj_closed_form import closed_form_3nj
+from project.su2_3nj_mpmath import closed_form_3nj_mp
+
+
+def _exact_mpf(spins, dps):
+    """Exact Surd value rounded to an mpf with dps digits."""
+    surd = closed_form_3nj(*spins, mode="exact")
+    with mpmath.workdps(dps):
+        return surd.sign * mpmath.sqrt(mpmath.mpf(surd.p) / surd.q) * (
+            mpmath.mpf(surd.r.numerator) / surd.r.denominator
+        )
+
+
+class TestMpmathBackend:
+    """mpmath values are correct to the requested digits."""
+    
+    @pytest.mark.parametrize("spins", [
+        (1, 1, 1, 1, 1, 1),
+        (1, 2, 3, 4, 5, 6),
+        (sp.Rational(3,2), sp.Rational(1,2), 1, sp.Rational(3,2), sp.Rational(1,2), 2),
+        (100, 95, 90, 97, 92, 85),
+        (300, 295, 290, 297, 292, 285),
+    ])
+    @pytest.mark.parametrize("dps", [15, 50])
+    def test_digits_vs_exact(self, spins, dps):
+        value = closed_form_3nj_mp(*spins, dps=dps)
+        exact = _exact_mpf(spins, dps + 20)
+        with mpmath.workdps(dps + 20):
+            assert abs(value - exact) <= abs(exact) * mpmath.mpf(10) ** (1 - dps)
+    
+    def test_triangle_violation(self):
+        assert closed_form_3nj_mp(1, 1, 3, 0, 0, 0) == 0
+    
+    def test_mode_dispatch(self):
+        value = closed_form_3nj(1, 1, 1, 1, 1, 1, mode="mpmath", dps=40)
+        with mpmath.workdps(40):
+            assert abs(value - mpmath.mpf(1) / 6) < mpmath.mpf(10) ** -39
+    
+    def test_exact_fallback_when_precision_cap_hit(self):
+        """A tiny precision cap forces the exact-engine fallback."""
+        spins = (100, 95, 90, 97, 92, 85)
+        value = closed_form_3nj_mp(*spins, dps=15, max_dps=20)
+        exact = _exact_mpf(spins, 40)
+        with mpmath.workdps(40):
+            assert abs(value - exact) <= abs(exact) * mpmath.mpf(10) ** -14
@@ -0,0 +1,192 @@
+"""
+Test general 3nj evaluation by 6j-network contraction.
+"""
+
+from functools import lru_cache
+from itertools import product
+
+import numpy as np
+import pytest
+import sympy as sp
+from sympy.physics.wigner import wigner_3j
+from project.su2_3nj_network import (
+    NINE_J,
+    SixJNetwork,
+    closed_form_12j,
+    closed_form_15j,
+    closed_form_3nj_network,
+    first_kind_network,
+    internal_ranges,
+    plan_contraction,
+)
+from project.su2_9j_closed_form import closed_form_9j
+
+h = sp.Rational(1, 2)
+
+NINE_J_CASES = [
+    (h, h, 1, h, h, 1, 1, 1, 0),
+    (1, 2, 3, 2, 1, 2, 3, 2, 1),
+    (3*h, 1, 5*h, 2, 3*h, 3*h, 5*h, 3*h, 2),
+]
+
+TWELVE_J_CASES = [
+    (1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1),
+    (2, 1, 5*h, 1, 2, 5*h, 5*h, 3*h, 5*h, 5*h, 2, 5*h),
+    (2, 3*h, 3*h, 3*h, 3*h, 2, 1, h, 1, 3*h, h, 3*h),
+    (2, 3*h, 1, 3*h, h, 5*h, 5*h, 5*h, 2, 5*h, 2, 5*h),
+]
+
+
+@lru_cache(maxsize=None)
+def _three_j(j1, j2, j3, m1, m2, m3):
+    return float(wigner_3j(j1, j2, j3, m1, m2, m3))
+
+
+def _graph_value(triads, spins):
+    """
+    Value of a recoupling graph as the contraction of one 3j symbol per
+    triad (names into ``spins``), up to an orientation phase: every spin
+    enters its first triad with m and its second with -m and (-1)^(j-m).
+    """
+    letters = dict(zip(spins, "abcdefghijklmnopqrstuvwxyz"))
+    seen = set()
+    operands = []
+    for triad in triads:
+        js = [spins[n] for n in triad]
+        tensor = np.zeros([int(2 * j + 1) for j in js])
+        for index in product(*map(range, tensor.shape)):
+            ms = [i - j for i, j in zip(index, js)]
+            sign = 1
+            for k, name in enumerate(triad):
+                if name in seen:
+                    sign *= (-1) ** int(js[k] - ms[k])
+                    ms[k] = -ms[k]
+            if sum(ms) == 0:
+                tensor[index] = sign * _three_j(*js, *ms)
+        seen.update(triad)
+        operands += [tensor, "".join(letters[n] for n in triad)]
+    subscripts = ",".join(operands[1::2]) + "->"
+    tensors = operands[0::2]
+    # allow intermediates larger than the inputs, or einsum sums naively
+    path, _ = np.einsum_path(subscripts, *tensors, optimize=("greedy", 1 << 20))
+    return float(np.einsum(subscripts, *tensors, optimize=path))
+
+
+def _twelve_j_by_3j(*spins):
+    """12j of the first kind from its eight triads, in the Varshalovich phase."""
+    names = [f"{r}{i}" for r in "jlk" for i in range(1, 5)]
+    values = dict(zip(names, spins))
+    triads = [(f"j{i}", f"j{i + 1}", f"l{i}") for i in range(1, 4)]
+    triads += [(f"k{i}", f"k{i + 1}", f"l{i}") for i in range(1, 4)]
+    triads += [("j4", "k1", "l4"), ("j1", "k4", "l4")]
+    j1, k1, k4, l4 = (values[n] for n in ("j1", "k1", "k4", "l4"))
+    # the contraction reverses the twisted triad (j1 k4 l4) and the line k1
+    return (-1) ** int(j1 + k4 + l4 + 2 * k1) * _graph_value(triads, values)
+
+
+def _rename(network, suffix):
+    """Copy of a network with every spin name suffixed."""
+    def r(names):
+        return tuple(n + suffix for n in names)
+    return SixJNetwork(
+        externals=r(network.externals),
+        factors=tuple(r(f) for f in network.factors),
+        weights=r(network.weights),
+        phase=tuple((n + suffix, c) for n, c in network.phase),
+    )
+
+
+class TestNamedNetworks:
+    """Named topologies agree with direct evaluators and their symmetries."""
+
+    @pytest.mark.parametrize("spins", NINE_J_CASES)
+    def test_9j_network(self, spins):
+        assert closed_form_3nj_network("9j", *spins, mode="exact") == \
+            closed_form_9j(*spins, mode="exact")
+
+    @pytest.mark.parametrize("spins", NINE_J_CASES)
+    def test_first_kind_n3_is_9j(self, spins):
+        # {j1 j2 j3; l1 l2 l3; k1 k2 k3} = 9j {j1 l1 j2; k3 k2 l2; l3 k1 j3}
+        j1, l1, j2, k3, k2, l2, l3, k1, j3 = spins
+        value = closed_form_3nj_network(
+            first_kind_network(3), j1, j2, j3, l1, l2, l3, k1, k2, k3, mode="exact"
+        )
+        assert value == closed_form_9j(*spins, mode="exact")
+
+    @pytest.mark.parametrize("spins", TWELVE_J_CASES)
+    def test_12j_cyclic_symmetry(self, spins):
+        j, l, k = spins[0:4], spins[4:8], spins[8:12]
+        shifted = j[1:] + k[:1] + l[1:] + l[:1] + k[1:] + j[:1]
+        value = closed_form_12j(*spins, mode="exact")
+        assert value.sign != 0
+        assert closed_form_12j(*shifted, mode="exact") == value
+
+    @pytest.mark.parametrize("spins", TWELVE_J_CASES)
+    def test_12j_against_3j_contraction(self, spins):
+        # independent of the 6j network: a sum over all magnetic quantum numbers
+        expected = _twelve_j_by_3j(*spins)
+        assert float(closed_form_12j(*spins, mode="exact")) == pytest.approx(expected, abs=1e-14)
+
+    @pytest.mark.parametrize("spins", TWELVE_J_CASES)
+    def test_12j_float_vs_exact(self, spins):
+        exact = float(closed_form_12j(*spins, mode="exact"))
+        assert closed_form_12j(*spins, mode="float") == pytest.approx(exact, abs=1e-14)
+
+    def test_15j_float_vs_exact(self):
+        spins = (1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1)
+        exact = closed_form_15j(*spins, mode="exact")
+        assert exact.sign != 0
+        assert closed_form_15j(*spins, mode="float") == pytest.approx(float(exact), abs=1e-14)
+
+    def test_symbolic_mode(self):
+        assert closed_form_3nj_network("9j", h, h, 1, h, h, 1, 1, 1, 0) == sp.Rational(-1, 18)
+
+    def test_triangle_violation(self):
+        assert closed_form_12j(1, 1, 1, 1, 5, 1, 1, 1, 1, 1, 1, 1) == 0
+        assert closed_form_12j(1, 1, 1, 1, 5, 1, 1, 1, 1, 1, 1, 1, mode="float") == 0.0
+
+    def test_wrong_argument_count(self):
+        with pytest.raises(ValueError):
+            closed_form_3nj_network("12j", 1, 1, 1)
+
+
+class TestContraction:
+    """Multi-spin networks and the contraction planner."""
+
+    def test_two_internal_spins(self):
+        # two independent 9j sums contract to the product of the two 9j
+        a, b = _rename(NINE_J, "a"), _rename(NINE_J, "b")
+        network = SixJNetwork(
+            externals=a.externals + b.externals,
+            factors=a.factors + b.factors,
+            weights=a.weights + b.weights,
+            phase=a.phase + b.phase,
+        )
+        assert len(network.internals) == 2
+        first, second = NINE_J_CASES[0], NINE_J_CASES[1]
+        value = closed_form_3nj_network(network, *first, *second, mode="exact")
+        expected = closed_form_9j(*first) * closed_form_9j(*second)
+        assert sp.simplify(value.to_sympy() - expected) == 0
+
+    def test_plan_avoids_large_intermediates(self):
+        # x - y - z chain: summing y first would build an (x, z) table
+        network = SixJNetwork(
+            externals=("a", "b", "c", "d"),
+            factors=(("x", "y", "a", "b", "c", "d"), ("y", "z", "a", "b", "c", "d")),
+        )
+        plan = plan_contraction(network, {"x": 10, "y": 10, "z": 10})
+        assert plan.order[0] != "y"
+        assert plan.cost == 220
+
+    def test_internal_ranges(self):
+        # x is bounded by the triads (j1, j9, x), (j4, j8, x) and (j2, j6, x)
+        values = dict(zip(NINE_J.externals, (2, 4, 6, 4, 2, 4, 6, 6, 4)))
+        assert internal_ranges(NINE_J, values) == {"x": (2, 6)}
+
+    def test_unbounded_internal_spin(self):
+        network = SixJNetwork(
+            externals=("a", "b", "c"),
+            factors=(("a", "b", "c", "x", "y", "z"),),
+        )
+        with pytest.raises(ValueError):
+            closed_form_3nj_network(network, 1, 1, 1)
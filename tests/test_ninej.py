@@ -0,0 +1,62 @@
+"""
+Test the 9j evaluator against SymPy's reference implementation.
+"""
+
+import numpy as np
+import pytest
+import sympy as sp
+from sympy.physics.wigner import wigner_9j
+from project.su2_9j_closed_form import closed_form_9j, closed_form_9j_batch
+
+h = sp.Rational(1, 2)
+
+CASES = [
+    (h, h, 0, h, h, 0, 0, 0, 0),
+    (h, h, 1, h, h, 1, 1, 1, 0),
+    (1, 2, 3, 2, 1, 2, 3, 2, 1),
+    (1, 1, 1, 1, 1, 1, 1, 1, 1),
+    (2, 2, 2, 2, 2, 2, 2, 2, 2),
+    (3*h, 1, 5*h, 2, 3*h, 3*h, 5*h, 3*h, 2),
+    (3, 2, 1, 2, 3, 2, 1, 2, 3),
+]
+
+
+class TestNineJ:
+    """Exact and float 9j values match sympy.physics.wigner.wigner_9j."""
+
+    @pytest.mark.parametrize("spins", CASES)
+    def test_symbolic_vs_sympy(self, spins):
+        assert sp.simplify(closed_form_9j(*spins) - wigner_9j(*spins)) == 0
+
+    @pytest.mark.parametrize("spins", CASES)
+    def test_float_vs_sympy(self, spins):
+        expected = float(wigner_9j(*spins))
+        assert closed_form_9j(*spins, mode="float") == pytest.approx(expected, abs=1e-14)
+
+    def test_float_vs_exact_large(self):
+        spins = (40, 38, 30, 35, 42, 25, 33, 36, 28)
+        exact = float(closed_form_9j(*spins, mode="exact"))
+        assert closed_form_9j(*spins, mode="float") == pytest.approx(exact, rel=1e-10)
+
+    def test_triangle_violation(self):
+        assert closed_form_9j(1, 1, 3, 1, 1, 1, 1, 1, 1) == 0
+        assert closed_form_9j(1, 1, 3, 1, 1, 1, 1, 1, 1, mode="float") == 0.0
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            closed_form_9j(1, 1, 1, 1, 1, 1, 1, 1, 1, mode="bogus")
+
+
+class TestNineJBatch:
+    """The batch evaluator agrees with the scalar float path."""
+
+    def test_matches_scalar(self):
+        two = np.array([[int(2 * j) for j in spins] for spins in CASES] + [[2, 2, 6, 2, 2, 2, 2, 2, 2]])
+        values = closed_form_9j_batch(two)
+        expected = [closed_form_9j(*(sp.Rational(t, 2) for t in row), mode="float") for row in two]
+        assert np.allclose(values, expected, rtol=1e-12, atol=1e-15)
+        assert values[-1] == 0.0
+
+    def test_bad_shape(self):
+        with pytest.raises(ValueError):
+            closed_form_9j_batch(np.zeros((3, 6), dtype=int))
@@ -0,0 +1,88 @@
+"""
+Test the SQLite-backed persistent 6j cache.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import mpmath
+import pytest
+import sympy as sp
+from project.su2_3nj_closed_form import closed_form_3nj
+from project.persistent_cache import PersistentSixJCache
+from project import sixj_cache
+from project.sixj_cache import SixJCache
+
+
+class TestPersistentCache:
+    """Values survive reopening and are shared between instances."""
+    
+    def test_survives_restart(self, tmp_path):
+        path = tmp_path / "sixj.sqlite"
+        with PersistentSixJCache(path, mode="exact") as cache:
+            value = cache(1, 2, 3, 4, 5, 6)
+            assert cache.misses == 1
+        with PersistentSixJCache(path, mode="exact") as cache:
+            assert cache(2, 1, 3, 5, 4, 6) == value
+            assert (cache.hits, cache.misses) == (1, 0)
+            assert len(cache) == 1
+    
+    def test_two_instances_share_file(self, tmp_path):
+        path = tmp_path / "sixj.sqlite"
+        writer = PersistentSixJCache(path, mode="float", batch_size=1)
+        reader = PersistentSixJCache(path, mode="float")
+        value = writer(2, 2, 2, 2, 2, 2)
+        assert reader(2, 2, 2, 2, 2, 2) == value
+        assert reader.hits == 1
+        writer.close()
+        reader.close()
+    
+    def test_backends_are_separate(self, tmp_path):
+        path = tmp_path / "sixj.sqlite"
+        with PersistentSixJCache(path, mode="float") as cache:
+            cache(1, 1, 1, 1, 1, 1)
+        with PersistentSixJCache(path, mode="symbolic") as cache:
+            assert cache(1, 1, 1, 1, 1, 1) == sp.Rational(1, 6)
+            assert cache.misses == 1
+    
+    def test_mpmath_precision_roundtrip(self, tmp_path):
+        path = tmp_path / "sixj.sqlite"
+        with PersistentSixJCache(path, mode="mpmath", dps=40) as cache:
+            first = cache(1, 2, 3, 4, 5, 6)
+        with PersistentSixJCache(path, mode="mpmath", dps=40) as cache:
+            second = cache(1, 2, 3, 4, 5, 6)
+            assert cache.hits == 1
+        with mpmath.workdps(40):
+            assert abs(first - second) < mpmath.mpf(10) ** -39
+    
+    def test_prepopulate(self, tmp_path):
+        tuples = [(2, 2, 2, 2, 2, 2), (2, 2, 2, 2, 2, 2), (2, 4, 6, 8, 10, 12), (2, 2, 6, 0, 0, 0)]
+        with PersistentSixJCache(tmp_path / "sixj.sqlite", mode="exact") as cache:
+            assert cache.prepopulate(tuples) == 2
+            assert cache.prepopulate(tuples) == 0
+            assert len(cache) == 2
+    
+    def test_counts_from_threads(self, tmp_path):
+        tuples = [(2, 2, 2, 2, 2, 2), (2, 4, 6, 6, 6, 6), (4, 4, 4, 4, 4, 4)] * 200
+        with PersistentSixJCache(tmp_path / "sixj.sqlite", mode="float") as cache:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(cache.lookup_doubled, tuples))
+            assert cache.hits + cache.misses == len(tuples)
+    
+    def test_backing_memory_cache(self, tmp_path):
+        path = tmp_path / "sixj.sqlite"
+        with PersistentSixJCache(path, mode="exact") as disk:
+            memory = SixJCache(mode="exact", backing=disk)
+            assert memory(1, 2, 3, 4, 5, 6) == closed_form_3nj(1, 2, 3, 4, 5, 6, mode="exact")
+            assert memory(1, 2, 3, 4, 5, 6) is not None
+            assert (disk.misses, memory.cache_info().hits) == (1, 1)
+        with pytest.raises(ValueError):
+            SixJCache(mode="float", backing=PersistentSixJCache(path, mode="exact"))
+    
+    def test_default_cache_env(self, tmp_path, monkeypatch):
+        path = tmp_path / "env.sqlite"
+        monkeypatch.setenv(sixj_cache.CACHE_DB_ENV, str(path))
+        monkeypatch.setattr(sixj_cache, "_default_caches", {})
+        assert sixj_cache.closed_form_3nj_cached(1, 1, 1, 1, 1, 1, mode="float") == pytest.approx(1 / 6)
+        backing = sixj_cache.default_cache("float").backing
+        backing.flush()
+        assert len(PersistentSixJCache(path, mode="float")) == 1
@@ -0,0 +1,54 @@
+"""
+Test the prime-factorization backend against the integer Racah engine.
+"""
+
+import pytest
+import sympy as sp
+from sympy.physics.wigner import wigner_6j
+from project.su2_3nj_closed_form import closed_form_3nj
+from project.prime_factorial import PrimeFactorialTable, closed_form_3nj_prime
+
+
+class TestPrimeFactorialTable:
+    """Exponent vectors reproduce the factorials they encode."""
+    
+    def test_exponents_match_factorials(self):
+        table = PrimeFactorialTable(6)
+        for n in range(table.n_max + 1):
+            assert table.to_int(table.exponents[n]) == sp.factorial(n)
+    
+    def test_combine_quotient(self):
+        table = PrimeFactorialTable(4)
+        vec = table.combine([9], [4, 3])
+        assert table.to_int(vec) == sp.factorial(9) / (sp.factorial(4) * sp.factorial(3))
+
+
+class TestPrimeBackend:
+    """Prime backend agrees with the integer engine and SymPy."""
+    
+    @pytest.mark.parametrize("spins", [
+        (0, 0, 0, 0, 0, 0),
+        (1, 1, 1, 1, 1, 1),
+        (2, 2, 2, 2, 2, 2),
+        (1, 2, 3, 4, 5, 6),
+        (sp.Rational(1,2), sp.Rational(1,2), 1, sp.Rational(1,2), sp.Rational(1,2), 0),
+        (sp.Rational(3,2), sp.Rational(1,2), 1, sp.Rational(3,2), sp.Rational(1,2), 2),
+        (1, 1, 3, 0, 0, 0),
+    ])
+    def test_matches_exact_engine(self, spins):
+        assert closed_form_3nj_prime(*spins) == closed_form_3nj(*spins, mode="exact")
+    
+    def test_mode_dispatch(self):
+        value = closed_form_3nj(2, 2, 2, 2, 2, 2, mode="prime")
+        assert value.to_sympy() == wigner_6j(2, 2, 2, 2, 2, 2)
+    
+    def test_large_spins(self):
+        """Spins in the tens agree with the integer engine exactly."""
+        spins = (40, 35, 30, 38, 33, 36)
+        assert closed_form_3nj_prime(*spins) == closed_form_3nj(*spins, mode="exact")
+    
+    def test_explicit_table_range(self):
+        table = PrimeFactorialTable(4)
+        assert closed_form_3nj_prime(1, 1, 1, 1, 1, 1, table=table).to_sympy() == sp.Rational(1, 6)
+        with pytest.raises(ValueError):
+            closed_form_3nj_prime(3, 3, 3, 3, 3, 3, table=table)
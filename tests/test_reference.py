@@ -0,0 +1,97 @@
+"""
+Test the independent recursion reference against the closed form.
+"""
+
+import random
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+from project.spin6 import Spin6
+from project.su2_3nj_closed_form import Surd, closed_form_3nj
+from project.su2_3nj_reference import (
+    _primes_upto,
+    _square_root_parts,
+    reference_3nj,
+    reference_6j_family,
+)
+
+
+class TestReference:
+    """Reference values agree exactly with the Racah closed form."""
+
+    @pytest.mark.parametrize("spins,expected", [
+        ((1, 1, 1, 1, 1, 1), sp.Rational(1, 6)),
+        ((2, 2, 2, 2, 2, 2), sp.Rational(-3, 70)),
+        ((1, 2, 3, 4, 5, 6), sp.sqrt(1430) / 2145),
+    ])
+    def test_known_values(self, spins, expected):
+        assert sp.simplify(reference_3nj(*spins) - expected) == 0
+
+    def test_random_small(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            spins = [Fraction(rng.randint(0, 10), 2) for _ in range(6)]
+            got = reference_3nj(*spins, mode="exact")
+            assert got == closed_form_3nj(*spins, mode="exact")
+
+    def test_random_admissible(self):
+        rng = random.Random(11)
+        checked = 0
+        while checked < 500:
+            two_js = Spin6(*(rng.randint(0, 12) for _ in range(6)))
+            if not two_js.admissible:
+                continue
+            checked += 1
+            assert reference_3nj(two_js, mode="exact") == closed_form_3nj(two_js, mode="exact")
+
+    def test_split_radicand(self):
+        """sqrt(7/2)/10, whose square splits as 7/2 times a square."""
+        two_js = Spin6(3, 1, 4, 4, 4, 3)
+        value = reference_3nj(two_js, mode="exact")
+        assert value == closed_form_3nj(two_js, mode="exact")
+        assert value == Surd(1, 14, 1, Fraction(1, 20))
+
+    @pytest.mark.parametrize("spins", [
+        (5, 5, 7, 7, 3),                                   # x_min = 0
+        (Fraction(3, 2), Fraction(1, 2), Fraction(3, 2), Fraction(1, 2), 2),
+        (20, 25, 22, 18, 15),
+        (Fraction(81, 2), 39, Fraction(79, 2), 41, 35),
+    ])
+    def test_family(self, spins):
+        j1, j2, j4, j5, j6 = spins
+        family = reference_6j_family(*spins)
+        assert family
+        for x, value in family:
+            expected = closed_form_3nj(j1, j2, x, j4, j5, j6, mode="exact")
+            assert value == expected
+
+    def test_inadmissible(self):
+        assert reference_3nj(1, 2, 5, 1, 1, 1) == 0
+        assert reference_3nj(1, 2, 2, 1, 3, 1, mode="float") == 0.0
+        assert all(v == 0 for _, v in reference_6j_family(1, 2, 2, 1, 3, mode="float"))
+
+    def test_float_mode(self):
+        assert reference_3nj(2, 2, 2, 2, 2, 2, mode="float") == pytest.approx(-3 / 70)
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            reference_3nj(1, 1, 1, 1, 1, 1, mode="bogus")
+
+
+class TestSquareRoot:
+    """Splitting exact squares into outside**2 * squarefree kernel."""
+
+    def test_primes(self):
+        assert _primes_upto(20) == [2, 3, 5, 7, 11, 13, 17, 19]
+        assert _primes_upto(1) == []
+
+    def test_split(self):
+        assert _square_root_parts(2 ** 5 * 3 ** 2 * 7, _primes_upto(10)) == (12, 14)
+
+    def test_large_prime_square(self):
+        assert _square_root_parts(101 ** 2 * 3, _primes_upto(10)) == (101, 3)
+
+    def test_unexpected_kernel(self):
+        with pytest.raises(ArithmeticError):
+            _square_root_parts(101 * 3, _primes_upto(10))
@@ -0,0 +1,118 @@
+"""
+Test the streaming result writers and the columnar reader.
+"""
+
+import json
+from fractions import Fraction
+
+import numpy as np
+import pytest
+from project.result_io import (
+    format_value,
+    open_writer,
+    read_columnar,
+    result_format,
+    write_results,
+)
+from project.su2_3nj_closed_form import Surd
+from project.sweep import admissible_6j, sweep
+
+
+def _results(max_two_j=3):
+    return list(sweep(admissible_6j(max_two_j), workers=1))
+
+
+class TestTextFormats:
+    """CSV and NDJSON output."""
+
+    def test_csv(self, tmp_path):
+        path = tmp_path / "out.csv"
+        results = _results()
+        assert write_results(iter(results), path) == len(results)
+        lines = path.read_text().splitlines()
+        assert lines[0] == "j1,j2,j3,j4,j5,j6,value"
+        assert lines[2] == "0,0,0,1/2,1/2,1/2," + repr(results[1][1])
+        assert len(lines) == len(results) + 1
+
+    def test_csv_append_keeps_one_header(self, tmp_path):
+        path = tmp_path / "out.csv"
+        results = _results(1)
+        write_results(results, path)
+        write_results(results, path, append=True)
+        lines = path.read_text().splitlines()
+        assert lines.count("j1,j2,j3,j4,j5,j6,value") == 1
+        assert len(lines) == 2 * len(results) + 1
+
+    def test_ndjson(self, tmp_path):
+        path = tmp_path / "out.ndjson"
+        results = _results(2)
+        write_results(results, path)
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == len(results)
+        assert records[1]["j4"] == "1/2"
+        assert records[1]["value"] == results[1][1]
+
+    def test_exact_values(self):
+        assert format_value(Surd(-1, 6, 1, Fraction(1, 18))) == "-1/18*sqrt(6)"
+        assert format_value(Surd(1, 2, 3, Fraction(1))) == "sqrt(2/3)"
+        assert format_value(Surd(1, 1, 1, Fraction(1, 6))) == "1/6"
+        assert format_value(Surd(0, 0, 1, Fraction(0))) == "0"
+
+
+class TestColumnar:
+    """Columnar binary files round-trip through memory mapping."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "out.s6j"
+        results = _results()
+        write_results(results, path, row_group_size=100)
+        table = read_columnar(path)
+        assert len(table) == len(results)
+        assert len(table.groups) == -(-len(results) // 100)
+        assert isinstance(table.groups[0][1], np.memmap)
+        assert table.spins.tolist() == [list(t) for t, _ in results]
+        assert table.values.tolist() == [v for _, v in results]
+        assert list(table)[5] == results[5]
+
+    def test_append(self, tmp_path):
+        path = tmp_path / "out.s6j"
+        first, second = _results(1), _results(2)
+        write_results(first, path)
+        write_results(second, path, append=True)
+        table = read_columnar(path)
+        assert len(table) == len(first) + len(second)
+        assert table.values.tolist() == [v for _, v in first + second]
+
+    def test_truncated_group_is_ignored(self, tmp_path):
+        path = tmp_path / "out.s6j"
+        results = _results()
+        write_results(results, path, row_group_size=100)
+        with open(path, "r+b") as f:
+            f.truncate(path.stat().st_size - 8)
+        table = read_columnar(path)
+        assert len(table) == len(results) // 100 * 100
+
+    def test_spin_range(self, tmp_path):
+        writer = open_writer(tmp_path / "out.s6j")
+        with pytest.raises(ValueError):
+            writer.write((40000, 0, 0, 0, 0, 0), 0.0)
+        writer.close()
+
+    def test_not_a_result_file(self, tmp_path):
+        path = tmp_path / "bad.s6j"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            read_columnar(path)
+
+
+class TestFormatSelection:
+
+    @pytest.mark.parametrize("name, fmt", [
+        ("a.csv", "csv"), ("a.ndjson", "ndjson"), ("a.jsonl", "ndjson"), ("a.s6j", "columnar"),
+    ])
+    def test_by_extension(self, name, fmt):
+        assert result_format(name) == fmt
+
+    def test_unknown_extension(self):
+        with pytest.raises(ValueError):
+            result_format("a.txt")
@@ -0,0 +1,90 @@
+"""
+Test symmetry canonicalization and the memoization cache for 6j symbols.
+"""
+
+import pytest
+import sympy as sp
+from sympy.physics.wigner import wigner_6j
+from project.su2_3nj_closed_form import closed_form_3nj
+from project.sixj_cache import (
+    SixJCache,
+    canonical_6j,
+    closed_form_3nj_cached,
+    symmetry_images,
+)
+
+
+class TestCanonicalForm:
+    """All 144 arrangements of a symbol map to one representative."""
+    
+    def test_generic_symbol_has_144_images(self):
+        # {1 2 3; 3 3 3}: all triad and quadrilateral sums distinct
+        images = symmetry_images((2, 4, 6, 6, 6, 6))
+        assert len(images) == 144
+        canon = canonical_6j((2, 4, 6, 6, 6, 6))
+        assert {canonical_6j(im) for im in images} == {canon}
+    
+    @pytest.mark.parametrize("two_js", [
+        (2, 4, 6, 8, 10, 12),
+        (3, 1, 2, 3, 1, 4),
+        (2, 4, 6, 6, 6, 6),
+    ])
+    def test_images_share_value(self, two_js):
+        value = closed_form_3nj(*[sp.Rational(t, 2) for t in two_js], mode="exact")
+        for image in symmetry_images(two_js):
+            assert closed_form_3nj(*[sp.Rational(t, 2) for t in image], mode="exact") == value
+    
+    def test_inadmissible_has_no_representative(self):
+        assert canonical_6j((2, 2, 6, 0, 0, 0)) is None
+        with pytest.raises(ValueError):
+            symmetry_images((2, 2, 6, 0, 0, 0))
+
+
+class TestSixJCache:
+    """LRU cache keyed on the canonical form."""
+    
+    def test_equivalent_calls_hit_one_entry(self):
+        cache = SixJCache(mode="exact")
+        images = sorted(symmetry_images((2, 4, 6, 6, 6, 6)))
+        values = {cache.lookup_doubled(im) for im in images}
+        assert len(values) == 1
+        info = cache.cache_info()
+        assert (info.misses, info.hits, info.currsize) == (1, 143, 1)
+    
+    def test_symbolic_mode_matches_sympy(self):
+        cache = SixJCache(mode="symbolic")
+        assert cache(1, 2, 3, 4, 5, 6) == wigner_6j(1, 2, 3, 4, 5, 6)
+        assert cache(2, 1, 3, 5, 4, 6) == wigner_6j(1, 2, 3, 4, 5, 6)
+        assert cache.cache_info().hits == 1
+    
+    def test_float_mode_and_zero(self):
+        cache = SixJCache(mode="float")
+        assert cache(1, 1, 1, 1, 1, 1) == pytest.approx(1 / 6)
+        assert cache(1, 1, 3, 0, 0, 0) == 0.0
+        assert cache.cache_info().currsize == 1
+    
+    def test_mpmath_mode(self):
+        mpmath = pytest.importorskip("mpmath")
+        cache = SixJCache(mode="mpmath", dps=30)
+        value = cache(1, 2, 3, 4, 5, 6)
+        assert value == closed_form_3nj(1, 2, 3, 4, 5, 6, mode="mpmath", dps=30)
+        assert cache(2, 1, 3, 5, 4, 6) == value and cache.cache_info().hits == 1
+        assert cache(1, 1, 3, 0, 0, 0) == 0 and isinstance(value, mpmath.mpf)
+    
+    def test_lru_eviction(self):
+        cache = SixJCache(maxsize=2, mode="float")
+        cache(1, 1, 1, 1, 1, 1)
+        cache(2, 2, 2, 2, 2, 2)
+        cache(1, 1, 1, 1, 1, 1)
+        cache(3, 3, 3, 3, 3, 3)        # evicts {2 2 2; 2 2 2}
+        info = cache.cache_info()
+        assert (info.evictions, info.currsize) == (1, 2)
+        cache(2, 2, 2, 2, 2, 2)
+        assert cache.cache_info().misses == 4
+        cache.cache_clear()
+        assert cache.cache_info() == (0, 0, 0, 2, 0)
+    
+    def test_module_level_cached_function(self):
+        assert closed_form_3nj_cached(1, 1, 1, 1, 1, 1) == sp.Rational(1, 6)
+        with pytest.raises(ValueError):
+            SixJCache(mode="bogus")
@@ -0,0 +1,99 @@
+"""
+Test the rejection-free enumeration of admissible and canonical 6j tuples.
+"""
+
+from itertools import product
+
+import numpy as np
+import pytest
+from project.sixj_cache import canonical_6j
+from project.sixj_enumeration import AdmissibleSixJ, _racah_cost
+from project.spin6 import Spin6
+from project.su2_3nj_closed_form import _racah_bounds
+from project.sweep import racah_terms
+
+
+def _brute_force(max_two_j):
+    return [t for t in product(range(max_two_j + 1), repeat=6) if _racah_bounds(t)]
+
+
+class TestLexicographic:
+    """All admissible tuples in lexicographic order."""
+
+    @pytest.mark.parametrize("max_two_j", [0, 1, 2, 5])
+    def test_matches_brute_force(self, max_two_j):
+        expected = _brute_force(max_two_j)
+        tuples = AdmissibleSixJ(max_two_j)
+        assert list(tuples) == expected
+        assert len(tuples) == len(expected)
+        assert tuples.array().tolist() == [list(t) for t in expected]
+
+    def test_ranks(self):
+        expected = _brute_force(4)
+        tuples = AdmissibleSixJ(4)
+        for rank in range(0, len(expected), 11):
+            assert tuples[rank] == expected[rank]
+            assert tuples.rank(expected[rank]) == rank
+        assert tuples[-1] == expected[-1]
+        assert tuples[100:140].tolist() == [list(t) for t in expected[100:140]]
+        assert type(tuples[3]) is Spin6
+
+    @pytest.mark.parametrize("two_js", [(1, 1, 1, 1, 1, 1), (6, 0, 6, 0, 0, 0)])
+    def test_rank_of_absent_tuple(self, two_js):
+        with pytest.raises(ValueError):
+            AdmissibleSixJ(4).rank(two_js)
+
+    def test_index_out_of_range(self):
+        with pytest.raises(IndexError):
+            AdmissibleSixJ(2)[47]
+
+    def test_known_counts(self):
+        # against the brute-force counts of the earlier enumeration
+        assert [len(AdmissibleSixJ(m)) for m in (3, 6, 20)] == [181, 3418, 1766270]
+
+
+class TestCanonical:
+    """One canonical representative per reachable symmetry class."""
+
+    @pytest.mark.parametrize("max_two_j", [0, 1, 3, 6])
+    def test_one_per_class(self, max_two_j):
+        expected = {canonical_6j(t) for t in _brute_force(max_two_j)}
+        tuples = AdmissibleSixJ(max_two_j, canonical=True)
+        listed = list(tuples)
+        assert len(tuples) == len(listed) == len(expected)
+        assert set(listed) == expected
+        for rank, two_js in enumerate(listed):
+            assert tuples.rank(two_js) == rank
+
+    def test_representative_may_exceed_bound(self):
+        # {1/2 1/2 1; 3/2 1/2 1} is the canonical form of a class with 2j <= 2
+        assert (1, 1, 2, 3, 1, 2) in set(AdmissibleSixJ(2, canonical=True))
+
+    def test_non_canonical_rejected(self):
+        two_js = (2, 4, 6, 6, 6, 6)
+        assert canonical_6j(two_js) != two_js
+        with pytest.raises(ValueError):
+            AdmissibleSixJ(6, canonical=True).rank(two_js)
+
+
+class TestBlocks:
+    """Chunks and equal-cost shards."""
+
+    def test_chunks_cover_sequence(self):
+        tuples = AdmissibleSixJ(6)
+        blocks = list(tuples.chunks(chunk_size=500, start=10, stop=2000))
+        assert [len(b) for b in blocks] == [500, 500, 500, 490]
+        assert np.array_equal(np.concatenate(blocks), tuples.array(10, 2000))
+
+    def test_racah_cost(self):
+        rows = AdmissibleSixJ(5).array()
+        assert _racah_cost(rows).tolist() == [racah_terms(tuple(r)) + 1 for r in rows.tolist()]
+
+    @pytest.mark.parametrize("canonical", [False, True])
+    def test_shards_balance_cost(self, canonical):
+        tuples = AdmissibleSixJ(12, canonical=canonical)
+        shards = tuples.shards(5, chunk_size=1000)
+        assert shards[0][0] == 0 and shards[-1][1] == len(tuples)
+        assert all(a[1] == b[0] for a, b in zip(shards, shards[1:]))
+        costs = [_racah_cost(tuples.array(a, b)).sum() for a, b in shards]
+        assert max(costs) - min(costs) <= 2 * _racah_cost(tuples.array()).max()
@@ -0,0 +1,62 @@
+"""
+Test the Schulten-Gordon family recursion against the closed form.
+"""
+
+import numpy as np
+import pytest
+import sympy as sp
+from project.su2_3nj_closed_form import closed_form_3nj
+from project.sixj_recursion import closed_form_3nj_family
+
+
+def _closed_form_family(j1, j2, j4, j5, j6, two_x):
+    return np.array([
+        float(closed_form_3nj(j1, j2, sp.Rational(int(t), 2), j4, j5, j6, mode="exact"))
+        for t in two_x
+    ])
+
+
+class TestSixJFamily:
+    """Every member of a j3 family matches the exact closed form."""
+
+    @pytest.mark.parametrize("spins", [
+        (1, 1, 1, 1, 1),
+        (2, 3, 4, 2, 3),
+        (sp.Rational(3,2), sp.Rational(1,2), sp.Rational(3,2), sp.Rational(1,2), 2),
+        (5, 5, 7, 7, 3),              # x_min = 0
+        (20, 25, 22, 18, 15),
+        (40, 37, 45, 44, 30),
+        (sp.Rational(81,2), 39, sp.Rational(79,2), 41, 35),
+    ])
+    def test_vs_closed_form(self, spins):
+        two_x, values = closed_form_3nj_family(*spins)
+        assert len(two_x) > 0
+        expected = _closed_form_family(*spins, two_x)
+        assert np.allclose(values, expected, rtol=1e-10, atol=1e-14)
+
+    def test_range(self):
+        two_x, _ = closed_form_3nj_family(3, 2, 4, 6, 5)
+        assert two_x.tolist() == list(range(4, 11, 2))
+
+    def test_orthonormal(self):
+        two_x, values = closed_form_3nj_family(30, 28, 25, 33, 20)
+        assert np.sum((two_x + 1) * 41 * values ** 2) == pytest.approx(1.0)
+
+    def test_fixed_triad_violation(self):
+        # (j1, j5, j6) is not a triangle: the whole family vanishes
+        two_x, values = closed_form_3nj_family(1, 2, 2, 1, 3)
+        assert len(two_x) > 0
+        assert not values.any()
+
+    def test_parity_mismatch(self):
+        two_x, values = closed_form_3nj_family(1, sp.Rational(1,2), 1, 1, 1)
+        assert len(two_x) == 0 and len(values) == 0
+
+    def test_large_spins(self):
+        two_x, values = closed_form_3nj_family(500, 520, 480, 510, 450)
+        assert len(two_x) == 961
+        assert np.all(np.isfinite(values))
+        for i in (0, 300, 600, 960):
+            t = int(two_x[i])
+            exact = closed_form_3nj(500, 520, sp.Rational(t, 2), 480, 510, 450, mode="exact")
+            assert values[i] == pytest.approx(float(exact), rel=1e-9)
@@ -0,0 +1,197 @@
+"""
+Test the asyncio evaluation server and its client.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from project import sixj_server
+from project.sixj_cache import SixJCache, canonical_6j, symmetry_images
+from project.sixj_server import SixJClient, SixJServer
+from project.su2_3nj_closed_form import _sixj_exact_doubled, _sixj_float_doubled
+from project.sweep import admissible_6j
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestEvaluate:
+    """Coalescing and deduplication without a connection."""
+
+    def test_concurrent_arrangements_coalesce(self):
+        images = sorted(symmetry_images((2, 4, 6, 6, 6, 6)))
+
+        async def main():
+            server = await SixJServer(workers=1).start(port=0)
+            async with server:
+                results = await asyncio.gather(*(server.evaluate([t]) for t in images))
+                return results, server.stats()
+        results, stats = _run(main())
+        expected = _sixj_float_doubled((2, 4, 6, 6, 6, 6))[0]
+        assert all(values == [pytest.approx(expected, abs=1e-14)] for values in results)
+        assert stats["evaluated"] == 1
+        assert stats["coalesced"] == len(images) - 1
+        assert stats["batches"] == 1
+        assert stats["max_queue_depth"] == 1 and stats["queue_depth"] == 0
+
+    def test_batches_and_cache(self):
+        tuples = list(admissible_6j(4))
+        classes = {canonical_6j(t) for t in tuples}
+
+        async def main():
+            server = await SixJServer(workers=1, max_batch=64).start(port=0)
+            async with server:
+                first = await server.evaluate(tuples)
+                second = await server.evaluate(tuples + [(1, 1, 1, 1, 1, 1)])
+                return first, second, server.stats()
+        first, second, stats = _run(main())
+        assert second == first + [0.0]
+        for t, value in zip(tuples[::23], first[::23]):
+            assert value == pytest.approx(_sixj_float_doubled(t)[0], abs=1e-14)
+        assert stats["evaluated"] == len(classes)
+        assert stats["batches"] == -(-len(classes) // 64)
+        assert stats["cache_hits"] == len(tuples)
+        assert stats["requests"] == 2 and stats["symbols"] == 2 * len(tuples) + 1
+        assert stats["latency_ns"]["n"] == 2
+
+    def test_shared_cache(self):
+        cache = SixJCache(mode="float")
+        cache.lookup_doubled((2, 2, 2, 2, 2, 2))
+
+        async def main():
+            server = await SixJServer(workers=1, cache=cache).start(port=0)
+            async with server:
+                await server.evaluate([(2, 2, 2, 2, 2, 2)])
+                return server.stats()
+        assert _run(main())["cache_hits"] == 1
+
+    @pytest.mark.parametrize("options", [{"mode": "mpmath"}, {"cache": SixJCache(mode="exact")}])
+    def test_invalid_options(self, options):
+        with pytest.raises(ValueError):
+            SixJServer(**options)
+
+
+class TestClient:
+    """Requests over the Unix socket and TCP."""
+
+    def test_unix_socket_exact(self, tmp_path):
+        path = str(tmp_path / "sixj.sock")
+
+        async def main():
+            async with await SixJServer(mode="exact", workers=1).start(path=path):
+                async with await SixJClient.connect(path) as client:
+                    single = await client.sixj((2, 2, 2, 2, 2, 2))
+                    values = await client.batch([(1, 1, 2, 1, 1, 2), (0, 0, 1, 0, 0, 1)])
+                    return single, values
+        single, values = _run(main())
+        assert single == _sixj_exact_doubled((2, 2, 2, 2, 2, 2))
+        assert values[0] == _sixj_exact_doubled((1, 1, 2, 1, 1, 2))
+        assert values[1].sign == 0
+
+    def test_tcp_process_pool(self):
+        tuples = list(admissible_6j(3))
+
+        async def main():
+            async with await SixJServer(workers=2).start(port=0) as server:
+                host, port = server.address[:2]
+                async with await SixJClient.connect(host=host, port=port) as client:
+                    results = await asyncio.gather(*(client.sixj(t) for t in tuples))
+                    return results, await client.stats()
+        results, stats = _run(main())
+        for t, value in zip(tuples, results):
+            assert value == pytest.approx(_sixj_float_doubled(t)[0], abs=1e-14)
+        assert stats["requests"] == len(tuples)
+        assert stats["evaluated"] == len({canonical_6j(t) for t in tuples})
+        assert set(stats["latency_ns"]) >= {"median", "p90", "p99"}
+
+    def test_errors(self, tmp_path):
+        path = str(tmp_path / "sixj.sock")
+
+        async def main():
+            async with await SixJServer(workers=1).start(path=path):
+                async with await SixJClient.connect(path) as client:
+                    with pytest.raises(ValueError, match="doubled spins"):
+                        await client.sixj((1, 2, 3))
+                    with pytest.raises(ValueError, match="unknown op"):
+                        await client._request(op="shutdown")
+                    # the connection survives bad requests
+                    value = await client.sixj((0, 0, 0, 0, 0, 0))
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(b"not json\n")
+                reply = json.loads(await reader.readline())
+                writer.close()
+                return value, reply
+        value, reply = _run(main())
+        assert value == pytest.approx(1.0)
+        assert reply["id"] is None and "JSONDecodeError" in reply["error"]
+
+
+class TestFailures:
+    """Evaluation errors reach only their own requests, and nothing hangs."""
+
+    def test_failing_symbol_in_coalesced_batch(self, tmp_path, monkeypatch):
+        evaluate = sixj_server._evaluate_chunk
+        bad = canonical_6j((4, 4, 4, 4, 4, 4))
+
+        def failing(mode, dps, tuples):
+            if bad in tuples:
+                raise OverflowError("bad symbol")
+            return evaluate(mode, dps, tuples)
+        monkeypatch.setattr(sixj_server, "_evaluate_chunk", failing)
+        path = str(tmp_path / "sixj.sock")
+
+        async def main():
+            async with await SixJServer(workers=1, max_delay=0.05).start(path=path) as server:
+                async with await SixJClient.connect(path) as first, \
+                        await SixJClient.connect(path) as second:
+                    results = await asyncio.gather(
+                        first.batch([(2, 2, 2, 2, 2, 2), (4, 4, 4, 4, 4, 4)]),
+                        second.sixj((2, 2, 2, 2, 2, 2)),
+                        second.sixj((1, 1, 2, 1, 1, 2)),
+                        return_exceptions=True,
+                    )
+                    return results, server.stats()
+        (failed, same, other), stats = _run(main())
+        assert isinstance(failed, ValueError) and "OverflowError: bad symbol" in str(failed)
+        assert same == pytest.approx(1 / 6)
+        assert other == pytest.approx(_sixj_float_doubled((1, 1, 2, 1, 1, 2))[0])
+        assert stats["batches"] == 1 and stats["errors"] == 1
+
+    @pytest.mark.parametrize("two_js", [(2 ** 63,) * 6, (1 << 15, 1 << 15, 0, 0, 0, 0)])
+    def test_oversized_spins_rejected(self, tmp_path, two_js):
+        path = str(tmp_path / "sixj.sock")
+
+        async def main():
+            async with await SixJServer(workers=1).start(path=path):
+                async with await SixJClient.connect(path) as client:
+                    with pytest.raises(ValueError, match="not served"):
+                        await asyncio.wait_for(client.sixj(two_js), 5)
+                    return await client.sixj((0, 0, 0, 0, 0, 0))
+        assert _run(main()) == pytest.approx(1.0)
+
+    def test_close_fails_unfinished_symbols(self, monkeypatch):
+        evaluate = sixj_server._evaluate_chunk
+
+        def slow(mode, dps, tuples):
+            time.sleep(0.1)
+            return evaluate(mode, dps, tuples)
+        monkeypatch.setattr(sixj_server, "_evaluate_chunk", slow)
+
+        async def main():
+            server = await SixJServer(workers=1, max_batch=1).start(port=0)
+            running = asyncio.create_task(server.evaluate([(2, 2, 2, 2, 2, 2)]))
+            queued = asyncio.create_task(server.evaluate([(1, 1, 2, 1, 1, 2)]))
+            await asyncio.sleep(0.02)
+            server.max_delay = 10
+            pending = asyncio.create_task(server.evaluate([(2, 2, 4, 2, 2, 4)]))
+            await asyncio.sleep(0)
+            await asyncio.wait_for(server.close(), 5)
+            results = await asyncio.gather(running, queued, pending, return_exceptions=True)
+            return results, server.queue_depth
+        (running, queued, pending), depth = _run(main())
+        assert running == [pytest.approx(1 / 6)]
+        assert isinstance(queued, RuntimeError) and isinstance(pending, RuntimeError)
+        assert depth == 0
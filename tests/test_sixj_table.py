@@ -0,0 +1,78 @@
+"""
+Test the precomputed memory-mapped 6j table.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+from project import sixj_table
+from project.sixj_cache import canonical_6j
+from project.su2_3nj_closed_form import _sixj_exact_doubled, closed_form_3nj
+from project.sixj_table import (
+    SixJTable,
+    build_table,
+    table_entries,
+    table_index,
+    table_size,
+)
+
+
+class TestTableIndex:
+    """The index is a bijection between table slots and canonical symbols."""
+    
+    def test_entries_roundtrip(self):
+        entries = table_entries(0, table_size(6), 6)
+        for i, row in enumerate(entries.tolist()):
+            assert canonical_6j(tuple(row)) == tuple(row)
+            assert table_index(tuple(row)) == i
+    
+    def test_all_small_symbols_covered(self):
+        m = 5
+        for two_js in itertools.product(range(m + 1), repeat=6):
+            index = table_index(two_js)
+            if index is not None:
+                assert index < table_size(m)
+    
+    def test_inadmissible(self):
+        assert table_index((2, 2, 6, 0, 0, 0)) is None
+
+
+class TestSixJTable:
+    """Built tables serve the same values as direct evaluation."""
+    
+    @pytest.fixture
+    def table_path(self, tmp_path):
+        path = tmp_path / "sixj_6.bin"
+        build_table(path, 6, exact=True, chunk_size=500)
+        return path
+    
+    def test_lookup_matches_exact(self, table_path):
+        table = SixJTable(table_path)
+        assert len(table) == table_size(6)
+        assert isinstance(table.values, np.memmap)
+        for two_js in [(2, 2, 2, 2, 2, 2), (2, 4, 6, 6, 6, 6), (3, 1, 2, 3, 1, 4), (6, 6, 6, 6, 6, 6)]:
+            exact = _sixj_exact_doubled(two_js)
+            assert table.lookup_doubled(two_js) == pytest.approx(float(exact), rel=1e-14)
+            assert table.exact_doubled(two_js) == exact
+        assert table(1, 1, 1, 1, 1, 1) == pytest.approx(1 / 6)
+        assert table(1, 1, 3, 0, 0, 0) == 0.0
+    
+    def test_out_of_range_falls_back(self, table_path):
+        table = SixJTable(table_path)
+        two_js = (20, 20, 20, 20, 20, 20)
+        assert table_index(two_js) >= len(table)
+        assert table.lookup_doubled(two_js) == pytest.approx(float(_sixj_exact_doubled(two_js)))
+    
+    def test_mode_table(self, table_path, monkeypatch):
+        monkeypatch.setenv(sixj_table.TABLE_ENV, str(table_path))
+        monkeypatch.setattr(sixj_table, "_default_table", None)
+        assert closed_form_3nj(1, 2, 3, 3, 3, 3, mode="table") == pytest.approx(
+            float(closed_form_3nj(1, 2, 3, 3, 3, 3, mode="exact"))
+        )
+    
+    def test_not_a_table(self, tmp_path):
+        path = tmp_path / "junk.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            SixJTable(path)
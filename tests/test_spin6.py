@@ -0,0 +1,142 @@
+"""
+Test the compact doubled-spin tuple and its use across the backends.
+"""
+
+from fractions import Fraction
+from itertools import product
+
+import numpy as np
+import pytest
+from project.sixj_cache import SixJCache, canonical_6j
+from project.spin6 import (
+    MAX_KEY_TWO_J,
+    Spin6,
+    doubled_view,
+    iter_spin6,
+    spin6_dtype,
+    to_structured,
+)
+from project.su2_3nj_batch import closed_form_3nj_batch
+from project.su2_3nj_closed_form import (
+    _racah_bounds,
+    closed_form_3nj,
+    closed_form_3nj_float,
+    triangle_coefficient,
+)
+from project.sweep import admissible_6j, sweep
+
+
+class TestSpin6:
+    """Construction, validation and packing."""
+
+    def test_is_a_tuple(self):
+        s = Spin6(2, 2, 2, 2, 2, 2)
+        assert s == (2, 2, 2, 2, 2, 2) and hash(s) == hash((2, 2, 2, 2, 2, 2))
+        assert {(2, 2, 2, 2, 2, 2): 1}[s] == 1
+        assert not hasattr(s, "__dict__")
+        assert s.two_j3 == 2
+
+    def test_from_spins(self):
+        s = Spin6.from_spins(1, "1/2", Fraction(3, 2), 0, 2, 1.5)
+        assert s == (2, 1, 3, 0, 4, 3)
+        assert s.spins() == (1, Fraction(1, 2), Fraction(3, 2), 0, 2, Fraction(3, 2))
+        with pytest.raises(ValueError):
+            Spin6.from_spins(1, 1, 1, 1, 1, Fraction(1, 3))
+
+    def test_admissible_matches_racah_bounds(self):
+        for two_js in product(range(4), repeat=6):
+            assert Spin6(*two_js).admissible == (_racah_bounds(two_js) is not None)
+
+    @pytest.mark.parametrize("two_js", [
+        (0, 0, 0, 0, 0, 0),
+        (1, 2, 3, 4, 5, 6),
+        (MAX_KEY_TWO_J,) * 6,
+    ])
+    def test_key_round_trip(self, two_js):
+        key = Spin6(*two_js).key
+        assert 0 <= key < 2 ** 63
+        assert Spin6.from_key(key) == two_js
+
+    def test_key_order(self):
+        tuples = sorted(product(range(3), repeat=6))
+        keys = [Spin6(*t).key for t in tuples]
+        assert keys == sorted(keys)
+
+    def test_key_out_of_range(self):
+        with pytest.raises(ValueError):
+            Spin6(MAX_KEY_TWO_J + 1, 0, 0, 0, 0, 0).key
+
+    def test_canonical(self):
+        s = Spin6(4, 2, 6, 6, 6, 6)
+        assert s.canonical() == canonical_6j(s) and type(s.canonical()) is Spin6
+        assert Spin6(1, 1, 1, 1, 1, 1).canonical() is None
+
+
+class TestArrays:
+    """Structured-array conversion without copies."""
+
+    def test_round_trip_is_a_view(self):
+        two = np.array(list(admissible_6j(3)), dtype=np.int32)
+        records = to_structured(two)
+        assert records.dtype == spin6_dtype() and records.shape == (len(two),)
+        assert np.shares_memory(records, two)
+        view = doubled_view(records)
+        assert np.shares_memory(view, two) and np.array_equal(view, two)
+        assert records[5]["two_j6"] == two[5, 5]
+
+    def test_iter_spin6(self):
+        tuples = list(admissible_6j(2))
+        rows = list(iter_spin6(to_structured(tuples), chunk_size=7))
+        assert rows == tuples
+        assert all(type(s) is Spin6 and type(s.two_j1) is int for s in rows)
+
+    def test_wrong_dtype(self):
+        with pytest.raises(ValueError):
+            doubled_view(np.zeros(3, dtype=[("a", "<i4")]))
+
+
+class TestBackends:
+    """Every evaluator takes a Spin6 directly."""
+
+    @pytest.mark.parametrize("mode", ["symbolic", "exact", "prime", "float", "mpmath"])
+    def test_closed_form_modes(self, mode):
+        if mode == "mpmath":
+            pytest.importorskip("mpmath")
+        s = Spin6(2, 4, 6, 6, 6, 6)
+        assert closed_form_3nj(s, mode=mode) == closed_form_3nj(1, 2, 3, 3, 3, 3, mode=mode)
+
+    def test_cache(self):
+        cache = SixJCache(mode="float")
+        assert cache(Spin6(2, 2, 2, 2, 2, 2)) == cache(1, 1, 1, 1, 1, 1)
+        assert cache.cache_info().hits == 1
+
+    def test_batch_and_sweep(self):
+        tuples = list(admissible_6j(4))
+        records = to_structured(tuples)
+        values = closed_form_3nj_batch(records)
+        assert np.array_equal(values, closed_form_3nj_batch(np.array(tuples)))
+        swept = list(sweep(records, workers=1))
+        assert [t for t, _ in swept] == tuples
+        assert [v for _, v in swept] == values.tolist()
+        s = Spin6(*tuples[40])
+        assert values[40] == pytest.approx(closed_form_3nj_float(s), abs=1e-14)
+
+    def test_batch_of_int32_chunks(self):
+        two = np.array(list(admissible_6j(4)), dtype=np.int32)
+        values = closed_form_3nj_batch(two, chunk_size=50)
+        assert np.array_equal(values, closed_form_3nj_batch(two.astype(np.int64)))
+
+    def test_partial_arguments_rejected(self):
+        with pytest.raises(TypeError):
+            closed_form_3nj(Spin6(2, 2, 2, 2, 2, 2), 1)
+
+
+class TestTriangleCoefficient:
+    """Exact triangle coefficients without SymPy arithmetic."""
+
+    def test_values(self):
+        import sympy as sp
+        assert triangle_coefficient(1, 1, 1) == sp.sqrt(sp.Rational(1, 24))
+        assert triangle_coefficient(sp.Rational(1, 2), sp.Rational(1, 2), 1) == sp.sqrt(sp.Rational(1, 6))
+        assert triangle_coefficient(1, 1, 3) == 0
+        assert triangle_coefficient("1/2", 1, 1) == 0
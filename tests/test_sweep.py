@@ -0,0 +1,72 @@
+"""
+Test the parallel sweep engine.
+"""
+
+from itertools import product
+
+import pytest
+from project.su2_3nj_closed_form import _racah_bounds, closed_form_3nj_float
+from project.sweep import admissible_6j, racah_terms, read_tuples, sweep
+
+
+class TestEnumeration:
+    """Admissible tuples and input files."""
+
+    @pytest.mark.parametrize("max_two_j", [0, 1, 4])
+    def test_admissible_matches_brute_force(self, max_two_j):
+        expected = [
+            t for t in product(range(max_two_j + 1), repeat=6) if _racah_bounds(t)
+        ]
+        assert list(admissible_6j(max_two_j)) == expected
+
+    def test_read_tuples(self, tmp_path):
+        path = tmp_path / "tuples.txt"
+        path.write_text("# spins\n1 1 1 1 1 1\n\n1/2, 1/2, 1, 1/2, 1/2, 1\n")
+        assert list(read_tuples(path)) == [(2, 2, 2, 2, 2, 2), (1, 1, 2, 1, 1, 2)]
+
+    def test_read_doubled(self, tmp_path):
+        path = tmp_path / "tuples.txt"
+        path.write_text("2 2 2 2 2 2\n")
+        assert list(read_tuples(path, doubled=True)) == [(2, 2, 2, 2, 2, 2)]
+
+    def test_read_bad_line(self, tmp_path):
+        path = tmp_path / "tuples.txt"
+        path.write_text("1 1 1\n")
+        with pytest.raises(ValueError):
+            list(read_tuples(path))
+
+    def test_racah_terms(self):
+        assert racah_terms((2, 2, 2, 2, 2, 2)) == 2
+        assert racah_terms((2, 2, 6, 2, 2, 2)) == 0
+
+
+class TestSweep:
+    """Sweep results match direct evaluation, in and out of order."""
+
+    def test_serial_values(self):
+        tuples = list(admissible_6j(3))
+        results = list(sweep(tuples, workers=1, chunk_cost=50))
+        assert [t for t, _ in results] == tuples
+        for t, value in results[::17]:
+            spins = [x / 2 for x in t]
+            assert value == pytest.approx(closed_form_3nj_float(*spins), abs=1e-14)
+
+    def test_pool_ordered(self):
+        tuples = list(admissible_6j(4))
+        serial = list(sweep(tuples, workers=1))
+        assert list(sweep(tuples, workers=2, chunk_cost=100)) == serial
+
+    def test_pool_unordered(self):
+        tuples = list(admissible_6j(4))
+        serial = dict(sweep(tuples, workers=1))
+        results = list(sweep(tuples, workers=2, chunk_cost=100, ordered=False))
+        assert len(results) == len(tuples)
+        assert dict(results) == serial
+
+    def test_exact_mode(self):
+        results = dict(sweep(iter([(2, 2, 2, 2, 2, 2)]), mode="exact", workers=2))
+        assert float(results[(2, 2, 2, 2, 2, 2)]) == pytest.approx(1 / 6)
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            list(sweep([(0, 0, 0, 0, 0, 0)], mode="bogus"))
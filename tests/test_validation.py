@@ -0,0 +1,76 @@
+"""
+Test the exhaustive identity validation harness.
+"""
+
+import io
+import json
+
+import numpy as np
+import pytest
+from project import validation
+from project.sixj_cache import symmetry_images
+from project.validation import symmetry_maps, validate
+
+
+class TestSymmetryMaps:
+    """The generated group is the 144-element symmetry group of the 6j."""
+
+    def test_order_and_identity(self):
+        maps = symmetry_maps()
+        assert maps.shape == (144, 6, 6)
+        assert (maps[0] == 2 * np.eye(6, dtype=int)).all()
+
+    @pytest.mark.parametrize("two_js", [(2, 4, 6, 8, 6, 4), (1, 3, 4, 3, 1, 2)])
+    def test_images_match_regge_array(self, two_js):
+        images = {tuple(row) for row in (symmetry_maps() @ np.array(two_js) // 2).tolist()}
+        assert images == symmetry_images(two_js)
+
+
+class TestValidate:
+    """All identities hold for the fast backends, and failures are reported."""
+
+    @pytest.mark.parametrize("mode", ["float", "exact", "prime"])
+    def test_small_bound_passes(self, mode):
+        summary = validate(4, mode=mode, workers=1, be_max_two_j=3)
+        assert set(summary) == set(validation.CHECKS)
+        for entry in summary.values():
+            assert entry["checked"] > 0
+            assert entry["failures"] == 0
+
+    def test_pool_matches_serial(self):
+        serial = validate(5, workers=1, be_max_two_j=3)
+        pooled = validate(5, workers=2, be_max_two_j=3)
+        for check in serial:
+            assert pooled[check]["checked"] == serial[check]["checked"]
+            assert pooled[check]["failures"] == 0
+
+    def test_symmetry_counts_classes(self):
+        # the eight admissible tuples with 2j <= 1 fall into three classes:
+        # {0 0 0; 0 0 0}, {0 0 0; 1/2 1/2 1/2} and {0 1/2 1/2; 0 1/2 1/2}
+        summary = validate(1, checks=("symmetry",), workers=1)
+        assert summary["symmetry"]["checked"] == 3
+
+    def test_failures_are_logged(self, monkeypatch):
+        exact_values = validation._values
+
+        def broken(mode, two_js):
+            values = exact_values(mode, two_js)
+            # corrupt {1 1 1; 1 1 0} but none of its symmetry images
+            rows = np.asarray(two_js).reshape(-1, 6)
+            values[(rows == (2, 2, 2, 2, 2, 0)).all(axis=1)] *= 1.01
+            return values
+
+        monkeypatch.setattr(validation, "_values", broken)
+        log = io.StringIO()
+        summary = validate(2, workers=1, be_max_two_j=2, log=log)
+        lines = [json.loads(line) for line in log.getvalue().splitlines()]
+        failures = [line for line in lines if "check" in line]
+        assert {f["check"] for f in failures} == set(validation.CHECKS)
+        assert sum(entry["failures"] for entry in summary.values()) == len(failures)
+        assert [line["summary"] for line in lines if "summary" in line] == list(validation.CHECKS)
+
+    def test_bad_arguments(self):
+        with pytest.raises(ValueError):
+            validate(2, checks=("bogus",))
+        with pytest.raises(ValueError):
+            validate(2, mode="mpmath")